@@ -49,5 +49,6 @@ if __name__ == "__main__":
 
     if "{{ cookiecutter.add_example_app }}" != "y":
         remove_file("example_app")
+        remove_file("benchmarks/views.py")
 
     replace_secret_key()
@@ -21,3 +21,13 @@ pip install -r requirements.txt
 
 # Make sure the check doesn't raise any warnings
 python manage.py check --fail-level WARNING
+
+# Shipped migrations must match the models
+python manage.py makemigrations --check --dry-run
+
+# Run the tests and benchmark the generated views on a test database, skip
+# the benchmark with RUN_BENCHMARKS=0
+python manage.py test
+if [ "${RUN_BENCHMARKS:-1}" = "1" ]; then
+  python -m benchmarks.views --rows 1000 --requests 200 --output benchmark-results.json
+fi
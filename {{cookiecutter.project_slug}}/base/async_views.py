@@ -0,0 +1,161 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Model
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.views import View
+
+from .filter_backends import BodyParamsFilterBackend
+from .pagination import ExactCount
+from .response import PaginatedResponse, Response
+from .views import (
+    CachedObjectMixin,
+    DetailView,
+    ListView,
+    ObjectMixin,
+    ValidateObjectMixin,
+)
+
+
+class AsyncListView(ListView):
+    """`ListView` served natively under ASGI with the async ORM API."""
+
+    async def get(self, request: HttpRequest, *args, **kwargs):
+        self.object_list = self.filter_queryset(self.get_queryset())
+        if self.use_conditional_get():
+            aggregates = await self.object_list.aaggregate(
+                **self.get_validator_aggregates()
+            )
+            not_modified = self.get_list_conditional_response(aggregates)
+            if not_modified is not None:
+                return not_modified
+        return self.set_conditional_headers(await self.alist_response())
+
+    async def aget_count(self) -> int | None:
+        strategy = self.get_count_strategy()
+        if self.validator_count is not None and isinstance(strategy, ExactCount):
+            return self.validator_count
+        return await strategy.acount(self.object_list, self.get_count_params())
+
+    async def alist_response(self) -> Response:
+        page_size = self.get_paginate_by(self.object_list)
+        values = self.get_values_queryset(self.object_list)
+        if page_size is None:
+            return Response(data=[row async for row in values])
+
+        if self.pagination_mode == "cursor":
+            paginator = self.get_cursor_paginator(values, page_size)
+            page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+            return PaginatedResponse(
+                data=page.object_list,
+                count=await self.aget_count(),
+                next=page.next_cursor,
+            )
+
+        paginator = self.get_paginator(
+            values,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # Resolve the count before `page()`, which needs it synchronously
+        count = await paginator.acount()
+        page = self.get_page(paginator)
+        if count is None:
+            has_next = await page.ahas_next()
+            return PaginatedResponse(
+                data=page.object_list,
+                count=None,
+                next=page.number + 1 if has_next else None,
+            )
+        return PaginatedResponse(
+            data=[row async for row in page.object_list], count=count
+        )
+
+
+class AsyncListViewWithPost(AsyncListView):
+    filter_backend_class = BodyParamsFilterBackend
+
+    async def post(self, request, *args, **kwargs):
+        """Post query"""
+        return await self.get(request, *args, **kwargs)
+
+
+class AsyncSingleObjectMixin(CachedObjectMixin):
+    async def aget_object(self, queryset: QuerySet | None = None) -> Model:
+        """Async counterpart of `SingleObjectMixin.get_object`."""
+        if queryset is None:
+            queryset = self.get_queryset()
+        try:
+            return await queryset.aget(**self.get_object_lookup())
+        except queryset.model.DoesNotExist:
+            raise self.not_found()
+
+    async def aget_cached_object(self) -> Model:
+        try:
+            return await self.object_cache.aget(
+                self.model,
+                self.apply_related(self.get_queryset()),
+                **self.get_object_lookup(),
+            )
+        except self.model.DoesNotExist:
+            raise self.not_found()
+
+
+class AsyncDetailView(AsyncSingleObjectMixin, DetailView):
+    async def get(self, request, *args, **kwargs):
+        if self.object_cache is not None:
+            self.object = await self.aget_cached_object()
+        else:
+            self.object = await self.aget_object(self.get_detail_queryset())
+        if self.use_conditional_get():
+            not_modified = self.get_detail_conditional_response()
+            if not_modified is not None:
+                return not_modified
+        return self.set_conditional_headers(self.return_inst())
+
+
+class AsyncCreateView(ValidateObjectMixin, View):
+    """Using pydantic as data validation"""
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.perform_create(self.validate(request))
+        return self.return_inst()
+
+    async def perform_create(self, data: dict) -> Model:
+        return await self.model.objects.acreate(**data)
+
+
+class AsyncUpdateMixinView(AsyncSingleObjectMixin, ValidateObjectMixin, View):
+    async def perform_update(self, instance: Model, partial: bool = False) -> Model:
+        update_fields = self.apply_changes(
+            instance, self.validate(self.request, partial=partial)
+        )
+        if update_fields:
+            await instance.asave(update_fields=update_fields)
+            await sync_to_async(self.invalidate_object_cache)()
+        return instance
+
+
+class AsyncUpdateView(AsyncUpdateMixinView):
+    async def put(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        await self.perform_update(self.object)
+        return self.return_inst()
+
+
+class AsyncPartialUpdateView(AsyncUpdateMixinView):
+    async def patch(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        await self.perform_update(self.object, partial=True)
+        return self.return_inst()
+
+
+class AsyncDeleteView(AsyncSingleObjectMixin, ObjectMixin, View):
+    async def delete(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        await self.perform_delete()
+        return Response(data="success")
+
+    async def perform_delete(self):
+        await self.object.adelete()
+        await sync_to_async(self.invalidate_object_cache)()
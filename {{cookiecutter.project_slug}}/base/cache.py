@@ -0,0 +1,399 @@
+import contextlib
+import copy
+import hashlib
+import json
+import threading
+import time
+import typing
+import weakref
+from collections import OrderedDict
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
+from django.http import HttpResponse
+
+MODEL_VERSION_KEY = "model_version:%s"
+
+UNSHARED_CACHES = (LocMemCache, FileBasedCache, DatabaseCache)
+
+# In-process tiers to clear when a model is written in this process
+_local_caches: "weakref.WeakSet[LocalLRUCache]" = weakref.WeakSet()
+
+
+def model_version_key(model: typing.Type[models.Model]) -> str:
+    return MODEL_VERSION_KEY % model._meta.label_lower
+
+
+def get_model_version(model: typing.Type[models.Model]) -> int:
+    """Version of a model's data, bumped on every write.
+
+    Cache entries derived from a model embed its version in their key, so a
+    write invalidates all of them at once without tracking individual keys.
+    """
+    return caches[DEFAULT_CACHE_ALIAS].get_or_set(
+        model_version_key(model), 1, timeout=None
+    )
+
+
+def bump_model_version(model: typing.Type[models.Model]) -> None:
+    for local_cache in list(_local_caches):
+        local_cache.clear_model(model)
+    cache = caches[DEFAULT_CACHE_ALIAS]
+    key = model_version_key(model)
+    cache.add(key, 1, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between `add` and `incr`
+        cache.set(key, 1, timeout=None)
+
+
+def bump_model_version_on_commit(
+    model: typing.Type[models.Model], using: str | None = None
+) -> None:
+    """Bump once the current transaction commits, right away outside of one.
+
+    Bumping earlier lets readers cache the old row under the new version.
+    """
+    transaction.on_commit(partial(bump_model_version, model), using=using)
+
+
+def check_shared_cache(owner: str, *aliases: str) -> None:
+    """Refuse caches that are process-local or have a non-atomic `incr`, unless
+    `CACHE_ALLOW_LOCAL`. Writes of other workers or `run_jobs` would never
+    invalidate their entries, or concurrent bumps would be lost."""
+    if settings.DJANGO_REST.get("CACHE_ALLOW_LOCAL", settings.DEBUG):
+        return
+    for alias in {DEFAULT_CACHE_ALIAS, *aliases}:
+        if isinstance(caches[alias], UNSHARED_CACHES):
+            raise ImproperlyConfigured(
+                f"{owner} needs a shared cache with an atomic incr such as "
+                f"Redis or Memcached, CACHES[{alias!r}] is a "
+                f"{type(caches[alias]).__name__}"
+            )
+
+
+def get_many_with_versions(
+    cache_alias: str, keys: list[str], version_keys: list[str]
+) -> dict[str, typing.Any]:
+    """`get_many` of entries in `cache_alias` and of model versions, which
+    always live in the default cache, in one round trip when they share it."""
+    if cache_alias == DEFAULT_CACHE_ALIAS:
+        return caches[cache_alias].get_many([*keys, *version_keys])
+    return {
+        **caches[cache_alias].get_many(keys),
+        **caches[DEFAULT_CACHE_ALIAS].get_many(version_keys),
+    }
+
+
+def normalize_params(params: dict[str, typing.Any]) -> str:
+    """Stable digest of request params, independent of their order."""
+    raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+class LocalLRUCache:
+    """Bounded in-process LRU with a short per-entry timeout.
+
+    Entries are cleared when their model is written in this process; writes
+    made by other processes are picked up once `timeout` expires.
+    """
+
+    def __init__(self, maxsize: int = 1024, timeout: float = 5):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data: OrderedDict[tuple[str, str], tuple[float, typing.Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        _local_caches.add(self)
+
+    def get(self, model: typing.Type[models.Model], key: str, default=None):
+        with self._lock:
+            item = self._data.get((model._meta.label_lower, key))
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[(model._meta.label_lower, key)]
+                return default
+            self._data.move_to_end((model._meta.label_lower, key))
+            return value
+
+    def set(self, model: typing.Type[models.Model], key: str, value: typing.Any):
+        with self._lock:
+            self._data[(model._meta.label_lower, key)] = (
+                time.monotonic() + self.timeout,
+                value,
+            )
+            self._data.move_to_end((model._meta.label_lower, key))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear_model(self, model: typing.Type[models.Model]):
+        label = model._meta.label_lower
+        with self._lock:
+            for key in [key for key in self._data if key[0] == label]:
+                del self._data[key]
+
+
+_MISSING = "__object_cache_missing__"
+
+
+class ObjectCache:
+    """Read-through cache of model instances keyed by model and lookup.
+
+    An in-process `LocalLRUCache` sits in front of the shared Django cache.
+    Shared entries store the model version they were read at, so writes to
+    `BaseDatabaseModel` subclasses (signals, or `invalidate`) invalidate them.
+    Misses are cached for `negative_timeout` seconds.
+
+    The lookup is the only part of the key, only use it where the queryset
+    does not depend on the request.
+    """
+
+    key_prefix: str = "object"
+
+    def __init__(
+        self,
+        timeout: int = 300,
+        negative_timeout: int = 30,
+        local_maxsize: int = 1024,
+        local_timeout: float = 5,
+        cache_alias: str = DEFAULT_CACHE_ALIAS,
+    ):
+        self.timeout = timeout
+        self.negative_timeout = negative_timeout
+        self.cache_alias = cache_alias
+        self.local = (
+            LocalLRUCache(local_maxsize, local_timeout) if local_maxsize else None
+        )
+        check_shared_cache(type(self).__name__, cache_alias)
+
+    def get_cache_key(
+        self, model: typing.Type[models.Model], lookup: dict[str, typing.Any]
+    ) -> str:
+        return ":".join(
+            [self.key_prefix, model._meta.label_lower, normalize_params(lookup)]
+        )
+
+    @staticmethod
+    def does_not_exist(model: typing.Type[models.Model]) -> Exception:
+        return model.DoesNotExist(
+            "%s matching query does not exist." % model._meta.object_name
+        )
+
+    def _get_cached(self, model, key: str) -> tuple[typing.Any, int | None]:
+        """Return `(value, version)`, `value` is None on a miss.
+
+        The version is read before the database so that a write racing with
+        the read invalidates the entry stored afterwards.
+        """
+        if self.local is not None:
+            value = self.local.get(model, key)
+            if value is not None:
+                # Instances in the local tier are shared between threads
+                return copy.copy(value), None
+
+        version_key = model_version_key(model)
+        cached = get_many_with_versions(self.cache_alias, [key], [version_key])
+        version = cached.get(version_key)
+        if version is None:
+            version = get_model_version(model)
+        elif key in cached and cached[key][0] == version:
+            value = cached[key][1]
+            if self.local is not None:
+                self.local.set(model, key, value)
+            return value, version
+        return None, version
+
+    def _set_cached(self, model, key: str, value: typing.Any, version: int) -> None:
+        timeout = self.negative_timeout if value == _MISSING else self.timeout
+        caches[self.cache_alias].set(key, (version, value), timeout)
+        if self.local is not None:
+            self.local.set(model, key, value)
+
+    def get(
+        self,
+        model: typing.Type[models.Model],
+        queryset: models.QuerySet | None = None,
+        **lookup,
+    ) -> models.Model:
+        """`queryset.get(**lookup)` through the cache, raising `DoesNotExist`."""
+        if not lookup:
+            raise ValueError("Query kwargs must be provided")
+        key = self.get_cache_key(model, lookup)
+        value, version = self._get_cached(model, key)
+        if value is None:
+            queryset = queryset if queryset is not None else model._default_manager
+            try:
+                value = queryset.get(**lookup)
+            except model.DoesNotExist:
+                value = _MISSING
+            self._set_cached(model, key, value, version)
+        if value == _MISSING:
+            raise self.does_not_exist(model)
+        return value
+
+    async def aget(
+        self,
+        model: typing.Type[models.Model],
+        queryset: models.QuerySet | None = None,
+        **lookup,
+    ) -> models.Model:
+        if not lookup:
+            raise ValueError("Query kwargs must be provided")
+        key = self.get_cache_key(model, lookup)
+        value, version = await sync_to_async(self._get_cached)(model, key)
+        if value is None:
+            queryset = queryset if queryset is not None else model._default_manager
+            try:
+                value = await queryset.aget(**lookup)
+            except model.DoesNotExist:
+                value = _MISSING
+            await sync_to_async(self._set_cached)(model, key, value, version)
+        if value == _MISSING:
+            raise self.does_not_exist(model)
+        return value
+
+    def invalidate(self, model: typing.Type[models.Model]) -> None:
+        bump_model_version_on_commit(model)
+
+
+class ResponseCache:
+    """Encoded responses of read-only views, keyed by the caller.
+
+    Entries store the versions of the models they were rendered from, the
+    view's model and `depends_on`, so any write to them invalidates every
+    cached page at once. Concurrent misses of a key render it once: within a
+    process through an event, across processes through a lock entry in the
+    shared cache. Waiters render themselves after `lock_timeout` seconds.
+
+    Only 200 responses without cookies are stored, streaming ones never.
+
+    Versions are bumped by the `post_save`/`post_delete` signals of
+    `BaseDatabaseModel`. `QuerySet.update()`, `bulk_create()` and raw SQL send
+    none, call `bump_model_version` for the models they write. Both caches
+    must be shared by all processes, e.g. Redis or Memcached, see
+    `check_shared_cache`.
+    """
+
+    key_prefix: str = "response"
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        depends_on: typing.Iterable[typing.Type[models.Model]] = (),
+        lock_timeout: int = 10,
+        poll_interval: float = 0.05,
+        cache_alias: str = DEFAULT_CACHE_ALIAS,
+    ):
+        self.timeout = timeout
+        self.depends_on = list(depends_on)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.cache_alias = cache_alias
+        self._inflight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        check_shared_cache(type(self).__name__, cache_alias)
+
+    def get_cache_key(self, view: str, scope: str, params: dict[str, typing.Any]):
+        return ":".join([self.key_prefix, view, scope, normalize_params(params)])
+
+    def _get_cached(
+        self, key: str, model_classes: list[typing.Type[models.Model]]
+    ) -> tuple[typing.Any, list[int]]:
+        """Return `(entry, versions)`, `entry` is None on a miss.
+
+        Versions are read before rendering, same as `ObjectCache._get_cached`.
+        """
+        version_keys = [model_version_key(model) for model in model_classes]
+        cached = get_many_with_versions(self.cache_alias, [key], version_keys)
+        versions = [
+            cached.get(version_key) or get_model_version(model)
+            for version_key, model in zip(version_keys, model_classes)
+        ]
+        if key in cached and cached[key][0] == versions:
+            return cached[key][1], versions
+        return None, versions
+
+    @staticmethod
+    def is_cacheable(response: HttpResponse) -> bool:
+        return (
+            not response.streaming
+            and response.status_code == 200
+            and not response.cookies
+        )
+
+    @staticmethod
+    def to_entry(response: HttpResponse) -> tuple[int, bytes, list]:
+        return response.status_code, response.content, list(response.items())
+
+    @staticmethod
+    def from_entry(entry: tuple[int, bytes, list]) -> HttpResponse:
+        status, content, headers = entry
+        return HttpResponse(content, status=status, headers=dict(headers))
+
+    def wait_for_lock(self, lock_key: str) -> None:
+        deadline = time.monotonic() + self.lock_timeout
+        cache = caches[self.cache_alias]
+        while time.monotonic() < deadline and cache.get(lock_key) is not None:
+            time.sleep(self.poll_interval)
+
+    @contextlib.contextmanager
+    def single_flight(self, key: str) -> typing.Iterator[bool]:
+        """Yield True to the caller that should render `key`, False to the
+        others once it is done or `lock_timeout` passed."""
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            event.wait(self.lock_timeout)
+            yield False
+            return
+
+        lock_key = f"{key}:lock"
+        cache = caches[self.cache_alias]
+        try:
+            if cache.add(lock_key, 1, self.lock_timeout):
+                try:
+                    yield True
+                finally:
+                    cache.delete(lock_key)
+            else:
+                self.wait_for_lock(lock_key)
+                yield False
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def get_or_render(
+        self,
+        key: str,
+        model_classes: list[typing.Type[models.Model]],
+        render: typing.Callable[[], HttpResponse],
+    ) -> HttpResponse:
+        entry, versions = self._get_cached(key, model_classes)
+        if entry is not None:
+            return self.from_entry(entry)
+        with self.single_flight(key) as leader:
+            if not leader:
+                entry, versions = self._get_cached(key, model_classes)
+                if entry is not None:
+                    return self.from_entry(entry)
+            response = render()
+            if self.is_cacheable(response):
+                caches[self.cache_alias].set(
+                    key, (versions, self.to_entry(response)), self.timeout
+                )
+            return response
@@ -1,4 +1,3 @@
-import json
 from functools import wraps
 
 from django.conf import settings
@@ -7,6 +6,7 @@ from django.core.exceptions import PermissionDenied
 from django.http.request import HttpRequest
 
 from .exceptions import BodyParameterMissing, QueryParameterMissing
+from .request_body import get_request_data
 
 
 def _get_request(*args) -> HttpRequest:
@@ -37,12 +37,7 @@ def body_params(*body: str):
     def wrapper(func):
         @wraps(func)
         def inner(*args, **kwargs):
-            request = _get_request(*args)
-
-            if request.method != "POST":
-                loc = json.loads(request.body)
-            else:
-                loc = request.POST
+            loc = get_request_data(_get_request(*args))
             for parameter in body:
                 if parameter not in loc:
                     raise BodyParameterMissing(context={"param": parameter})
@@ -0,0 +1,52 @@
+import decimal
+import json
+import typing
+
+from django.conf import settings
+from django.utils.functional import Promise
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+RESPONSE_CONFIG = settings.DJANGO_REST
+
+DATA_FIELD = RESPONSE_CONFIG["RESPONSE_DATA_FIELD"]
+MESSAGE_FIELD = RESPONSE_CONFIG["RESPONSE_MESSAGE_FIELD"]
+CODE_FIELD = RESPONSE_CONFIG["RESPONSE_CODE_FIELD"]
+
+
+def _orjson_default(obj: typing.Any) -> typing.Any:
+    # Types orjson does not serialize natively, rendered like pydantic-core does
+    if isinstance(obj, (decimal.Decimal, Promise)):
+        return str(obj)
+    raise TypeError
+
+
+def dumps(obj: typing.Any) -> bytes:
+    """Encode `obj` to JSON bytes in a single pass.
+
+    Uses `orjson` when installed, `pydantic_core.to_json` otherwise. Both handle
+    the datetimes, Decimals and UUIDs produced by `model_to_dict`.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_orjson_default)
+        except TypeError:
+            # e.g. integers over 64 bits
+            pass
+    return to_json(obj, serialize_unknown=True)
+
+
+def render_envelope(data: typing.Any, msg: str | None, code: int) -> bytes:
+    """Encode the `ResponseStructure` envelope without building the model."""
+    return dumps({DATA_FIELD: data, MESSAGE_FIELD: msg, CODE_FIELD: code})
+
+
+def loads(data: bytes | str) -> typing.Any:
+    """Decode JSON, with `orjson` when installed. Raises `ValueError`."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,10 +1,14 @@
 from typing import Any
 
 from .status_codes import (
+    BODY_INVALID,
     BODY_PARAM_MISSING,
     PATH_PARAM_MISSING,
+    QUERY_PARAM_INVALID,
     QUERY_PARAM_MISSING,
+    REMOTE_FETCH_FAILED,
     UNCAUGHT_EXCEPTION,
+    UPLOAD_TOO_LARGE,
     Code,
 )
 
@@ -30,3 +34,19 @@ class PathParameterMissing(CustomException):
 
 class BodyParameterMissing(CustomException):
     code = BODY_PARAM_MISSING
+
+
+class QueryParameterInvalid(CustomException):
+    code = QUERY_PARAM_INVALID
+
+
+class BodyInvalid(CustomException):
+    code = BODY_INVALID
+
+
+class UploadTooLarge(CustomException):
+    code = UPLOAD_TOO_LARGE
+
+
+class RemoteFetchFailed(CustomException):
+    code = REMOTE_FETCH_FAILED
@@ -0,0 +1,100 @@
+import abc
+import csv
+import typing
+from itertools import islice
+
+from .encoders import dumps
+
+
+class _Echo:
+    """File-like object whose `write` returns the value instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class BaseExporter(abc.ABC):
+    """Render an iterable of rows into an iterable of byte chunks.
+
+    Rows are grouped `rows_per_chunk` at a time, so only one chunk is held in
+    memory no matter how many rows are exported.
+    """
+
+    content_type: str
+    extension: str
+    rows_per_chunk: int = 500
+
+    def __init__(self, fields: list[str]):
+        self.fields = fields
+
+    def header(self) -> bytes:
+        return b""
+
+    def footer(self) -> bytes:
+        return b""
+
+    @abc.abstractmethod
+    def render_rows(self, rows: list[dict[str, typing.Any]]) -> bytes: ...
+
+    def export(
+        self, rows: typing.Iterable[dict[str, typing.Any]]
+    ) -> typing.Iterator[bytes]:
+        rows = iter(rows)
+        if header := self.header():
+            yield header
+        while batch := list(islice(rows, self.rows_per_chunk)):
+            yield self.render_rows(batch)
+        if footer := self.footer():
+            yield footer
+
+
+class NdjsonExporter(BaseExporter):
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def render_rows(self, rows: list[dict[str, typing.Any]]) -> bytes:
+        return b"".join(dumps(row) + b"\n" for row in rows)
+
+
+class JsonArrayExporter(BaseExporter):
+    content_type = "application/json"
+    extension = "json"
+
+    def __init__(self, fields: list[str]):
+        super().__init__(fields)
+        self._first = True
+
+    def header(self) -> bytes:
+        return b"["
+
+    def footer(self) -> bytes:
+        return b"]"
+
+    def render_rows(self, rows: list[dict[str, typing.Any]]) -> bytes:
+        chunk = b",".join(dumps(row) for row in rows)
+        if self._first:
+            self._first = False
+            return chunk
+        return b"," + chunk
+
+
+class CsvExporter(BaseExporter):
+    content_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, fields: list[str]):
+        super().__init__(fields)
+        self.writer = csv.DictWriter(_Echo(), fieldnames=fields)
+
+    def header(self) -> bytes:
+        return self.writer.writeheader().encode()
+
+    def render_rows(self, rows: list[dict[str, typing.Any]]) -> bytes:
+        return "".join(self.writer.writerow(row) for row in rows).encode()
+
+
+EXPORTERS: dict[str, typing.Type[BaseExporter]] = {
+    "ndjson": NdjsonExporter,
+    "csv": CsvExporter,
+    "json": JsonArrayExporter,
+}
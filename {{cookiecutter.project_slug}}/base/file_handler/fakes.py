@@ -0,0 +1,248 @@
+import hashlib
+import itertools
+import re
+import threading
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeClientError(Exception):
+    """Shaped like botocore's `ClientError`."""
+
+    def __init__(self, code: str, operation: str):
+        self.response = {"Error": {"Code": code}}
+        super().__init__(f"An error occurred ({code}) when calling {operation}")
+
+
+class FakeS3Client:
+    """In-process stand-in for the boto3 S3 client methods `AWSUploader` uses.
+
+    Objects are kept in `objects`, keyed by `(bucket, key)`. S3's part rules
+    are enforced with `min_part_size`, lower it to test with small parts.
+    `fail_uploads` makes that many following `upload_part` calls fail.
+    """
+
+    min_part_size: int = 5 * 2**20
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.fail_uploads = 0
+        self.calls: list[str] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    def _get(self, bucket: str, key: str, operation: str) -> bytes:
+        try:
+            return self.objects[(bucket, key)]
+        except KeyError:
+            raise FakeClientError("404", operation) from None
+
+    def _upload(self, upload_id: str, operation: str) -> dict[int, bytes]:
+        try:
+            return self.uploads[upload_id]
+        except KeyError:
+            raise FakeClientError("NoSuchUpload", operation) from None
+
+    def create_multipart_upload(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            self.calls.append("create_multipart_upload")
+            upload_id = str(next(self._ids))
+            self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(
+        self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes
+    ) -> dict:
+        with self._lock:
+            self.calls.append("upload_part")
+            if self.fail_uploads:
+                self.fail_uploads -= 1
+                raise FakeClientError("InternalError", "UploadPart")
+            self._upload(UploadId, "UploadPart")[PartNumber] = bytes(Body)
+        return {"ETag": self.etag(Body)}
+
+    def upload_part_copy(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        CopySource: dict[str, str],
+        CopySourceRange: str,
+    ) -> dict:
+        start, stop = CopySourceRange.removeprefix("bytes=").split("-")
+        with self._lock:
+            self.calls.append("upload_part_copy")
+            source = self._get(
+                CopySource["Bucket"], CopySource["Key"], "UploadPartCopy"
+            )
+            data = source[int(start) : int(stop) + 1]
+            self._upload(UploadId, "UploadPartCopy")[PartNumber] = data
+        return {"CopyPartResult": {"ETag": self.etag(data)}}
+
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict
+    ) -> dict:
+        with self._lock:
+            self.calls.append("complete_multipart_upload")
+            stored = self._upload(UploadId, "CompleteMultipartUpload")
+            parts: list[dict[str, typing.Any]] = MultipartUpload["Parts"]
+            numbers = [part["PartNumber"] for part in parts]
+            if not parts or numbers != sorted(set(numbers)):
+                raise FakeClientError("InvalidPartOrder", "CompleteMultipartUpload")
+            for i, part in enumerate(parts):
+                data = stored.get(part["PartNumber"])
+                if data is None or self.etag(data) != part["ETag"]:
+                    raise FakeClientError("InvalidPart", "CompleteMultipartUpload")
+                if i < len(parts) - 1 and len(data) < self.min_part_size:
+                    raise FakeClientError("EntityTooSmall", "CompleteMultipartUpload")
+            self.objects[(Bucket, Key)] = b"".join(stored[number] for number in numbers)
+            del self.uploads[UploadId]
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict:
+        with self._lock:
+            self.calls.append("abort_multipart_upload")
+            self._upload(UploadId, "AbortMultipartUpload")
+            del self.uploads[UploadId]
+        return {}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            data = self._get(Bucket, Key, "HeadObject")
+        return {"ContentLength": len(data), "ETag": self.etag(data)}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict[str, str]) -> dict:
+        with self._lock:
+            self.calls.append("copy_object")
+            self.objects[(Bucket, Key)] = self._get(
+                CopySource["Bucket"], CopySource["Key"], "CopyObject"
+            )
+        return {}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def generate_presigned_url(
+        self, ClientMethod: str, Params: dict[str, str], ExpiresIn: int = 3600
+    ) -> str:
+        return f"http://s3.fake/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+class _FakeHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_FakeHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.respond(body=False)
+
+    def do_GET(self) -> None:
+        self.respond(body=True)
+
+    def send_empty(self, status: int, **headers: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+
+    def respond(self, body: bool) -> None:
+        fake = self.server.fake
+        range_header = self.headers.get("Range")
+        with fake.lock:
+            fake.requests.append((self.command, self.path, range_header))
+            data = fake.objects.get(self.path)
+        if data is None:
+            return self.send_empty(404)
+        if self.command == "HEAD" and not fake.allow_head:
+            return self.send_empty(405)
+        etag = fake.etag(data)
+        if self.headers.get("If-Match", etag) != etag:
+            return self.send_empty(412)
+
+        status, start, stop = 200, 0, len(data)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match and fake.accept_ranges and self.headers.get("If-Range", etag) == etag:
+            start = int(match[1])
+            stop = min(int(match[2]) + 1, len(data)) if match[2] else len(data)
+            if start >= len(data) or stop <= start:
+                return self.send_empty(416, Content_Range=f"bytes */{len(data)}")
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(stop - start))
+        self.send_header("ETag", etag)
+        if fake.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{stop - 1}/{len(data)}")
+        self.end_headers()
+        if body:
+            self.wfile.write(data[start:stop])
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeHTTPServer"
+
+
+class FakeHTTPServer:
+    """Local HTTP server standing in for the remote files of `OssFileParser`.
+
+    Serves `objects`, keyed by path, on a random port of 127.0.0.1 with
+    `HEAD`, single `Range` requests, a strong `ETag` and `If-Match` /
+    `If-Range`. Replacing an object changes its ETag, `accept_ranges` and
+    `allow_head` turn those features off. Requests are recorded in `requests`
+    as `(method, path, range)`.
+
+        with FakeHTTPServer({"/data.csv": content}) as server:
+            url = server.url("/data.csv")
+    """
+
+    def __init__(
+        self,
+        objects: dict[str, bytes] | None = None,
+        accept_ranges: bool = True,
+        allow_head: bool = True,
+    ):
+        self.objects = dict(objects or {})
+        self.accept_ranges = accept_ranges
+        self.allow_head = allow_head
+        self.requests: list[tuple[str, str, str | None]] = []
+        self.lock = threading.Lock()
+        self.httpd = _FakeHTTPServer(("127.0.0.1", 0), _FakeHTTPHandler)
+        self.httpd.fake = self
+        self.thread: threading.Thread | None = None
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    def url(self, path: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
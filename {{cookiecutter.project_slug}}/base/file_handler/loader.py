@@ -1,20 +1,438 @@
 import abc
-from typing import Any
+import hashlib
+import itertools
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, NamedTuple, Type
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from pydantic import HttpUrl
 
+from ..exceptions import UploadTooLarge
+
+logger = logging.getLogger("default")
+
+KEY_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+
+class StoredObject(NamedTuple):
+    key: str
+    size: int
+    # False when an object with the same key was already stored
+    created: bool
+
+
+class UploadWriter(abc.ABC):
+    """An object being written to an `Uploader`, chunk by chunk.
+
+    Nothing is visible under a key before `commit`. Leaving the `with` block
+    without committing aborts the write.
+    """
+
+    committed: bool = False
+
+    @abc.abstractmethod
+    def write(self, chunk: bytes) -> None: ...
+
+    @abc.abstractmethod
+    def commit(self, key: str) -> bool:
+        """Store the written content under `key`, False if it already exists."""
+        ...
+
+    @abc.abstractmethod
+    def abort(self) -> None: ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.committed:
+            self.abort()
+
 
 class Uploader(abc.ABC):
-    pass
+    """Object store that uploads are streamed into.
+
+    Keys are chosen after the content is written, so they can be derived from
+    it, e.g. a content hash to store identical uploads once.
+    """
+
+    @abc.abstractmethod
+    def open(self, key: str | None = None) -> UploadWriter:
+        """`key` is the key the writer will be committed under, if known
+        upfront. Stores may then write the object in place."""
+        ...
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    def url(self, key: str, expires_in: int = 3600) -> HttpUrl:
+        """URL clients download an object from."""
+        raise NotImplementedError(f"{type(self).__name__} objects have no URL")
+
+    def store(
+        self,
+        chunks: Iterable[bytes],
+        hash_algorithm: str = "sha256",
+        max_size: int | None = None,
+    ) -> StoredObject:
+        """Write `chunks` under the hex digest of their content, raising
+        `UploadTooLarge` past `max_size` bytes."""
+        digest = hashlib.new(hash_algorithm)
+        size = 0
+        with self.open() as writer:
+            for chunk in chunks:
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLarge({"limit": max_size})
+                digest.update(chunk)
+                writer.write(chunk)
+            key = digest.hexdigest()
+            created = writer.commit(key)
+        return StoredObject(key, size, created)
+
+    @staticmethod
+    def validate_key(key: str) -> str:
+        if not KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Invalid object key {key!r}")
+        return key
+
+
+class LocalFileWriter(UploadWriter):
+    def __init__(self, uploader: "LocalFileUploader"):
+        self.uploader = uploader
+        self.file = tempfile.NamedTemporaryFile(
+            dir=uploader.tmp_dir, prefix="upload-", delete=False
+        )
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+
+    def commit(self, key: str) -> bool:
+        path = self.uploader.path(key)
+        self.file.close()
+        self.committed = True
+        if path.exists():
+            os.unlink(self.file.name)
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic on the same filesystem, concurrent writers of the same key
+        # write the same content
+        os.replace(self.file.name, path)
+        return True
+
+    def abort(self) -> None:
+        self.file.close()
+        try:
+            os.unlink(self.file.name)
+        except FileNotFoundError:
+            pass
+
+
+class LocalFileUploader(Uploader):
+    """Objects are files under `root`, sharded by the first characters of the
+    key. Partial uploads are written to `root/.tmp` and moved in place on
+    commit."""
+
+    def __init__(self, root: str | os.PathLike | None = None):
+        self.root = Path(root or settings.DJANGO_REST["UPLOAD_ROOT"])
+        self.tmp_dir = self.root / ".tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        key = self.validate_key(key)
+        return self.root / key[:2] / key[2:4] / key
+
+    def open(self, key: str | None = None) -> LocalFileWriter:
+        return LocalFileWriter(self)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+
+def get_s3_client():
+    try:
+        import boto3
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "AWSUploader needs boto3, install the `s3` extra or pass another "
+            "`uploader` / `upload_to`"
+        ) from e
+
+    return boto3.client("s3", endpoint_url=settings.DJANGO_REST.get("S3_ENDPOINT_URL"))
+
+
+def _error_code(exc: Exception) -> str | None:
+    # botocore `ClientError` and the fake client carry the S3 error code here
+    return getattr(exc, "response", {}).get("Error", {}).get("Code")
+
+
+class MultipartWriter(UploadWriter):
+    """S3 multipart upload, parts are sent by the uploader's worker pool.
+
+    `write` blocks while `max_workers` parts are in flight, so at most about
+    `(max_workers + 1) * part_size` bytes are buffered. Nothing is visible
+    before `commit`, which completes the upload or aborts it on failure.
+    """
+
+    def __init__(self, uploader: "AWSUploader", key: str | None = None):
+        self.uploader = uploader
+        self.client = uploader.client
+        # Content of unknown keys goes to a staging object, copied on commit
+        self.object_key = uploader.object_key(key) if key else uploader.staging_key()
+        self.upload_id = self.client.create_multipart_upload(
+            Bucket=uploader.bucket, Key=self.object_key
+        )["UploadId"]
+        self.executor = ThreadPoolExecutor(
+            uploader.max_workers, thread_name_prefix="upload"
+        )
+        self.parts: list[Future] = []
+        self.pending: set[Future] = set()
+        self.buffer = bytearray()
+        self.size = 0
+        self.completed = False
+
+    def write(self, chunk: bytes) -> None:
+        self.buffer += chunk
+        self.size += len(chunk)
+        part_size = self.uploader.part_size
+        while len(self.buffer) >= part_size:
+            self.submit(bytes(self.buffer[:part_size]))
+            del self.buffer[:part_size]
+
+    def submit(self, data: bytes) -> None:
+        if len(self.pending) >= self.uploader.max_workers:
+            done, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                # Fail fast instead of uploading the rest
+                future.result()
+        future = self.executor.submit(self.upload_part, len(self.parts) + 1, data)
+        self.parts.append(future)
+        self.pending.add(future)
+
+    def upload_part(self, number: int, data: bytes) -> dict[str, Any]:
+        for attempt in range(self.uploader.part_retries + 1):
+            try:
+                response = self.client.upload_part(
+                    Bucket=self.uploader.bucket,
+                    Key=self.object_key,
+                    UploadId=self.upload_id,
+                    PartNumber=number,
+                    Body=data,
+                )
+                return {"PartNumber": number, "ETag": response["ETag"]}
+            except Exception:
+                if attempt == self.uploader.part_retries:
+                    raise
+                time.sleep(self.uploader.retry_backoff * 2**attempt)
+
+    def complete(self) -> None:
+        # S3 requires at least one part, the last one may be empty
+        if self.buffer or not self.parts:
+            self.submit(bytes(self.buffer))
+            self.buffer.clear()
+        parts = [future.result() for future in self.parts]
+        self.client.complete_multipart_upload(
+            Bucket=self.uploader.bucket,
+            Key=self.object_key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        self.completed = True
+
+    def commit(self, key: str) -> bool:
+        target = self.uploader.object_key(key)
+        try:
+            if self.uploader.exists(key):
+                self.abort()
+                self.committed = True
+                return False
+            self.complete()
+            if self.object_key != target:
+                self.uploader.copy(self.object_key, target, self.size)
+                self.uploader.delete_object(self.object_key)
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self.executor.shutdown(wait=False)
+        self.committed = True
+        return True
+
+    def abort(self) -> None:
+        for future in self.parts:
+            future.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.completed:
+            if self.object_key.startswith(
+                f"{self.uploader.prefix}{self.uploader.staging_prefix}"
+            ):
+                self.uploader.delete_object(self.object_key)
+            return
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.uploader.bucket,
+                Key=self.object_key,
+                UploadId=self.upload_id,
+            )
+        except Exception:
+            # Left to the bucket's lifecycle rule for incomplete uploads
+            logger.warning("Aborting upload %s failed", self.upload_id, exc_info=True)
 
 
 class AWSUploader(Uploader):
-    pass
+    """Objects of an S3-compatible bucket, uploaded in parts concurrently.
+
+    `client` is a boto3 S3 client, `FakeS3Client` in tests.
+    """
+
+    # S3 parts but the last must be at least 5 MiB, at most 10000 parts
+    part_size: int = 16 * 2**20
+    max_workers: int = 8
+    part_retries: int = 3
+    retry_backoff: float = 0.2
+    # Largest object `copy_object` accepts, bigger ones are copied in parts
+    max_copy_size: int = 5 * 2**30
+    staging_prefix: str = ".tmp/"
+
+    def __init__(self, bucket: str | None = None, client=None, prefix: str = ""):
+        self.bucket = bucket or settings.DJANGO_REST["S3_BUCKET"]
+        self.client = client or get_s3_client()
+        self.prefix = prefix
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}{self.validate_key(key)}"
+
+    def staging_key(self) -> str:
+        return f"{self.prefix}{self.staging_prefix}{uuid.uuid4().hex}"
+
+    def open(self, key: str | None = None) -> MultipartWriter:
+        return MultipartWriter(self, key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except Exception as e:
+            if _error_code(e) in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.delete_object(self.object_key(key))
+
+    def delete_object(self, object_key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=object_key)
+
+    def copy(self, source: str, target: str, size: int) -> None:
+        """Server-side copy, in concurrent parts for objects over 5 GiB."""
+        copy_source = {"Bucket": self.bucket, "Key": source}
+        if size <= self.max_copy_size:
+            self.client.copy_object(
+                Bucket=self.bucket, Key=target, CopySource=copy_source
+            )
+            return
+
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=target)[
+            "UploadId"
+        ]
+
+        def copy_part(number: int, start: int) -> dict[str, Any]:
+            stop = min(start + self.max_copy_size, size)
+            response = self.client.upload_part_copy(
+                Bucket=self.bucket,
+                Key=target,
+                UploadId=upload_id,
+                PartNumber=number,
+                CopySource=copy_source,
+                CopySourceRange=f"bytes={start}-{stop - 1}",
+            )
+            return {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
+
+        try:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                parts = list(
+                    executor.map(
+                        copy_part,
+                        itertools.count(1),
+                        range(0, size, self.max_copy_size),
+                    )
+                )
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=target,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=target, UploadId=upload_id
+            )
+            raise
+
+    def url(self, key: str, expires_in: int = 3600) -> HttpUrl:
+        """Presigned GET URL of an object."""
+        return HttpUrl(
+            self.client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket, "Key": self.object_key(key)},
+                ExpiresIn=expires_in,
+            )
+        )
+
+
+class FileStat(NamedTuple):
+    size: int
+    mtime: float
+    # Strong validator of the content, None if the loader has none
+    etag: str | None = None
+
+
+class FileSlice:
+    """`length` bytes of `file` from its current position.
+
+    Keeps `fileno`, so WSGI servers can `sendfile` it, limited to the
+    response's Content-Length.
+    """
+
+    def __init__(self, file: BinaryIO, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
 
 
 class BaseFileLoader(abc.ABC):
     chunk_size = 64 * 2**10
-    uploader: Uploader = AWSUploader
+    # Store `load(upload=True)` pushes content to, `upload_to` if given
+    uploader: Type[Uploader] = AWSUploader
+    upload_to: Uploader | None = None
 
     @abc.abstractmethod
     def load(
@@ -28,3 +446,84 @@ class BaseFileLoader(abc.ABC):
         :return:
         """
         ...
+
+    @abc.abstractmethod
+    def stat(self, path: Any) -> FileStat:
+        """Raise `FileNotFoundError` if there is no such file."""
+        ...
+
+    @abc.abstractmethod
+    def iter_chunks(
+        self, path: Any, start: int = 0, stop: int | None = None
+    ) -> Iterator[bytes]:
+        """Content from byte `start` up to `stop`, in `chunk_size` pieces."""
+        ...
+
+    def local_path(self, path: Any) -> Path | None:
+        """Path of the file on this host, such files are served without
+        reading them in Python."""
+        return None
+
+    def get_uploader(self) -> Uploader:
+        return self.upload_to or self.uploader()
+
+    def upload(self, path: Any = None, content: bytes | None = None) -> HttpUrl:
+        """Stream `content`, or the file at `path`, into the uploader under
+        its content hash and return its URL."""
+        uploader = self.get_uploader()
+        chunks = [content] if content is not None else self.iter_chunks(path)
+        return uploader.url(uploader.store(chunks).key)
+
+
+class LocalFileLoader(BaseFileLoader):
+    """Objects of a `LocalFileUploader`, `path` is the object key."""
+
+    def __init__(
+        self,
+        store: LocalFileUploader | None = None,
+        upload_to: Uploader | None = None,
+    ):
+        self.store = store or LocalFileUploader()
+        self.upload_to = upload_to
+
+    def local_path(self, path: str) -> Path:
+        return self.store.path(path)
+
+    def stat(self, path: str) -> FileStat:
+        try:
+            st = self.local_path(path).stat()
+        except ValueError as e:
+            raise FileNotFoundError(path) from e
+        # Objects are never overwritten, so the key identifies the content
+        return FileStat(st.st_size, st.st_mtime, path)
+
+    def iter_chunks(
+        self, path: str, start: int = 0, stop: int | None = None
+    ) -> Iterator[bytes]:
+        with self.local_path(path).open("rb") as f:
+            f.seek(start)
+            remaining = -1 if stop is None else stop - start
+            while remaining:
+                size = (
+                    self.chunk_size
+                    if remaining < 0
+                    else min(remaining, self.chunk_size)
+                )
+                chunk = f.read(size)
+                if not chunk:
+                    break
+                if remaining > 0:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def load(
+        self,
+        path: str | None = None,
+        content: bytes | None = None,
+        upload: bool = False,
+    ) -> bytes | HttpUrl:
+        if upload:
+            return self.upload(path, content)
+        if content is not None:
+            return content
+        return b"".join(self.iter_chunks(path))
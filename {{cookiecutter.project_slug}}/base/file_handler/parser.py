@@ -1,19 +1,107 @@
 import abc
+import collections
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
-from typing import Iterable
+from typing import Iterable, Iterator
 
-import requests
+from django.conf import settings
 from django.core.files.base import File
+from django.core.files.uploadhandler import FileUploadHandler
 from django.http import HttpRequest
+from django.http.request import validate_host
 from pydantic import HttpUrl
 
+from ..exceptions import BodyInvalid, RemoteFetchFailed, UploadTooLarge
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+except ImportError:  # pragma: no cover
+    requests = None
+
+_session: "requests.Session | None" = None
+_session_lock = threading.Lock()
+
+
+def _reset_session() -> None:
+    global _session
+    _session = None
+
+
+# Pooled connections must not be shared with forked workers
+os.register_at_fork(after_in_child=_reset_session)
+
+
+def get_session() -> "requests.Session":
+    """HTTP session shared by the threads of this process.
+
+    Connections are kept alive per host, up to `HTTP_POOL_SIZE` of them, and
+    idempotent requests are retried on connection errors and 5xx responses.
+    """
+    global _session
+    if requests is None:
+        raise ImportError("Fetching remote files requires `requests`")
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+            )
+            pool_size = settings.DJANGO_REST.get("HTTP_POOL_SIZE", 32)
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """Stop parsing a multipart body as soon as a file exceeds `max_size`,
+    instead of spooling all of it to disk first."""
+
+    def __init__(self, max_size: int, request: HttpRequest | None = None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.received = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            raise UploadTooLarge({"limit": self.max_size})
+        return raw_data
+
+    def file_complete(self, file_size: int):
+        return None
+
 
 class BaseFileParser(abc.ABC):
     chunk_size = 64 * 2**10
+    # Body param holding the upload, reported when it is missing
+    field_name: str
 
     def __init__(self, request: HttpRequest, **kwargs):
         self.request = request
 
+    def accepts(self) -> bool:
+        """Whether the request carries an upload this parser reads."""
+        return True
+
+    @property
+    def filename(self) -> str | None:
+        return None
+
     @abc.abstractmethod
     def parse(self, *args, **kwargs) -> Iterable[bytes]:
         pass
@@ -22,6 +110,17 @@ class BaseFileParser(abc.ABC):
 class StreamFileParser(BaseFileParser):
     file_field: str = "file"
 
+    @property
+    def field_name(self) -> str:
+        return self.file_field
+
+    def accepts(self) -> bool:
+        return self.file_field in self.request.FILES
+
+    @property
+    def filename(self) -> str | None:
+        return self.file.name
+
     @cached_property
     def file(self) -> File:
         return self.get_file()
@@ -38,7 +137,39 @@ class StreamFileParser(BaseFileParser):
 
 
 class OssFileParser(BaseFileParser):
+    """Fetch the file at the `url_field` URL.
+
+    Only hosts of `allowed_hosts` are fetched and redirects are not followed,
+    so clients cannot make the server request internal addresses.
+
+    Objects of at least `parallel_threshold` bytes are fetched by concurrent
+    `Range` requests of `part_size`, if the server accepts ranges and sends a
+    strong `ETag`. Every part is pinned to that ETag, so parts of different
+    versions of the object are never mixed. Parts are yielded in order, at
+    most `max_workers` of them are buffered ahead.
+    """
+
     url_field = "url"
+    # `ALLOWED_HOSTS` syntax, e.g. ".example.com" for a domain and its
+    # subdomains. None for `REMOTE_FETCH_ALLOWED_HOSTS`, which allows none
+    allowed_hosts: list[str] | None = None
+    # (connect, read) seconds
+    timeout: tuple[float, float] = (5, 60)
+    # None to always fetch with a single request
+    parallel_threshold: int | None = 64 * 2**20
+    part_size: int = 8 * 2**20
+    max_workers: int = 8
+
+    @property
+    def field_name(self) -> str:
+        return self.url_field
+
+    def accepts(self) -> bool:
+        return self.url_field in self.request.POST
+
+    @property
+    def filename(self) -> str | None:
+        return (self.url.path or "").rsplit("/", 1)[-1] or None
 
     @cached_property
     def url(self) -> HttpUrl:
@@ -48,16 +179,115 @@ class OssFileParser(BaseFileParser):
     def chunks(self) -> Iterable[bytes]:
         return self.get_chunks()
 
+    def __init__(self, request: HttpRequest, **kwargs):
+        super().__init__(request, **kwargs)
+        # Strong ETag of the object fetched in parts
+        self.etag: str | None = None
+
+    def get_allowed_hosts(self) -> list[str]:
+        if self.allowed_hosts is not None:
+            return self.allowed_hosts
+        return settings.DJANGO_REST.get("REMOTE_FETCH_ALLOWED_HOSTS", [])
+
     def get_url(self) -> HttpUrl:
-        url: str = self.request.POST[self.url_field]  # type: ignore
-        return HttpUrl(url)
+        url = HttpUrl(self.request.POST[self.url_field])  # type: ignore
+        if not validate_host(url.host or "", self.get_allowed_hosts()):
+            raise BodyInvalid(
+                {"msg": f"`{self.url_field}` host {url.host} is not allowed"}
+            )
+        return url
+
+    def send_request(
+        self, method: str = "get", **request_kwargs
+    ) -> "requests.Response":
+        request_kwargs.setdefault("timeout", self.timeout)
+        # The target of a redirect would bypass `allowed_hosts`
+        request_kwargs["allow_redirects"] = False
+        session = get_session()
+        try:
+            response = session.request(method, str(self.url), **request_kwargs)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise RemoteFetchFailed({"url": self.url, "msg": e}) from e
+        if response.is_redirect:
+            response.close()
+            raise RemoteFetchFailed(
+                {"url": self.url, "msg": "redirects are not followed"}
+            )
+        return response
 
-    def send_request(self, method: str = "get", **request_kwargs) -> requests.Response:
-        return requests.request(method, str(self.url), **request_kwargs)
+    def get_size(self) -> int | None:
+        """Object size if the server accepts `Range` requests of a version
+        identified by a strong `ETag`, else None.
+
+        Servers and presigned URLs rejecting `HEAD` are fetched with a single
+        `GET` instead.
+        """
+        try:
+            response = self.send_request("head")
+        except RemoteFetchFailed:
+            return None
+        etag = response.headers.get("ETag")
+        if (
+            response.headers.get("Accept-Ranges", "").lower() != "bytes"
+            or etag is None
+            or etag.startswith("W/")
+        ):
+            return None
+        try:
+            size = int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return None
+        self.etag = etag
+        return size
 
     def get_chunks(self) -> Iterable[bytes]:
-        resp = self.send_request(stream=True)
-        return resp.iter_content(chunk_size=self.chunk_size)
+        if self.parallel_threshold is not None:
+            size = self.get_size()
+            if size is not None and size >= self.parallel_threshold:
+                return self.get_parallel_chunks(size)
+        return self.get_stream_chunks()
+
+    def get_stream_chunks(self) -> Iterator[bytes]:
+        with self.send_request(stream=True) as response:
+            try:
+                yield from response.iter_content(chunk_size=self.chunk_size)
+            except requests.RequestException as e:
+                raise RemoteFetchFailed({"url": self.url, "msg": e}) from e
+
+    def fetch_part(self, start: int, stop: int) -> bytes:
+        # A changed object fails `If-Match` with 412, or is sent whole with 200
+        # by servers only honoring `If-Range`
+        response = self.send_request(
+            headers={
+                "Range": f"bytes={start}-{stop - 1}",
+                "If-Match": self.etag,
+                "If-Range": self.etag,
+            }
+        )
+        if response.status_code != 206 or len(response.content) != stop - start:
+            raise RemoteFetchFailed(
+                {"url": self.url, "msg": f"Invalid response to range {start}-{stop}"}
+            )
+        return response.content
+
+    def get_parallel_chunks(self, size: int) -> Iterator[bytes]:
+        ranges = (
+            (start, min(start + self.part_size, size))
+            for start in range(0, size, self.part_size)
+        )
+        executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="fetch")
+        pending = collections.deque()
+        try:
+            for start, stop in ranges:
+                pending.append(executor.submit(self.fetch_part, start, stop))
+                if len(pending) >= self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Also reached when the consumer stops early or a part failed
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def parse(self, *args, **kwargs) -> Iterable[bytes]:
         yield from self.chunks
@@ -1,12 +1,64 @@
+import logging
 import typing
+from functools import lru_cache
 
-from django.db.models import Model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Field, Model
+from django.db.models.constants import LOOKUP_SEP
 from django.db.models.query import QuerySet
 from django.http.request import HttpRequest
 
+from .exceptions import QueryParameterInvalid
+from .request_body import get_request_data
+from .utils import get_indexed_fields
+
+logger = logging.getLogger("default")
+
+SUPPORTED_LOOKUPS = frozenset(
+    ["exact", "in", "gt", "gte", "lt", "lte", "icontains", "isnull"]
+)
+_TRUE_VALUES = ("1", "true", "yes")
+_FALSE_VALUES = ("0", "false", "no")
+
+
+@lru_cache(maxsize=None)
+def get_lookup_table(
+    model: typing.Type[Model],
+    fields: tuple[str, ...] | None,
+    lookups: tuple[tuple[str, tuple[str, ...]], ...],
+    warn_unindexed: bool = False,
+) -> dict[str, tuple[Field, str]]:
+    """Map every accepted param name to its `(field, lookup)`, once per model.
+
+    `fields` accept exact matches as `name`, `lookups` add `name__<lookup>`
+    params on top of that.
+    """
+    if fields is None:
+        fields = tuple(field.name for field in model._meta.fields)
+
+    table = {}
+    for name in fields:
+        table[name] = (model._meta.get_field(name), "exact")
+    for name, field_lookups in lookups:
+        field = model._meta.get_field(name)
+        for lookup in field_lookups:
+            if lookup not in SUPPORTED_LOOKUPS:
+                raise ValueError(f"Unsupported lookup {lookup!r} on {name!r}")
+            table[f"{name}{LOOKUP_SEP}{lookup}"] = (field, lookup)
+
+    if warn_unindexed:
+        indexed = get_indexed_fields(model)
+        for name in sorted({field.name for field, _ in table.values()} - indexed):
+            logger.warning("Filter field %s.%s is not indexed", model._meta.label, name)
+    return table
+
 
 class FilterBackendBase:
     fields: list[str] | None = None
+    # Extra lookups per field, e.g. `{"create_at": ["gte", "lte"]}`
+    lookups: dict[str, list[str]] | None = None
+    # Log a warning for filter fields not leading any index
+    warn_unindexed: bool = False
 
     def __init__(self, request: HttpRequest, model: Model):
         self.request = request
@@ -19,33 +71,72 @@ class FilterBackendBase:
             self._allow_fields = self.get_filter_fields()
         return self._allow_fields
 
+    @property
+    def lookup_table(self) -> dict[str, tuple[Field, str]]:
+        return get_lookup_table(
+            self.model,
+            tuple(self.fields) if self.fields is not None else None,
+            tuple(
+                (name, tuple(field_lookups))
+                for name, field_lookups in (self.lookups or {}).items()
+            ),
+            self.warn_unindexed,
+        )
+
     def filter_queryset(self, queryset: QuerySet):
         return queryset.filter(**self.get_allow_query_params())
 
     def get_filter_fields(self) -> list[str]:
-        if self.fields is None:
-            return [field.name for field in self.model._meta.fields]
-        return self.fields
+        return list(self.lookup_table)
 
     def get_query_params(self) -> dict[str, typing.Any]:
         return self.request.GET.dict()
 
+    def coerce_value(self, param: str, value: typing.Any) -> typing.Any:
+        """Convert a raw param to the field type before it reaches the ORM."""
+        field, lookup = self.lookup_table[param]
+        try:
+            if lookup == "isnull":
+                return self.coerce_bool(value)
+            if lookup == "icontains":
+                return str(value)
+            if lookup == "in":
+                if isinstance(value, str):
+                    value = [item for item in value.split(",") if item]
+                if not isinstance(value, (list, tuple)):
+                    value = [value]
+                return [field.to_python(item) for item in value]
+            return field.to_python(value)
+        except (DjangoValidationError, ValueError, TypeError) as e:
+            msg = "; ".join(e.messages) if hasattr(e, "messages") else str(e)
+            raise QueryParameterInvalid({"param": param, "msg": msg})
+
+    @staticmethod
+    def coerce_bool(value: typing.Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        value = str(value).lower()
+        if value in _TRUE_VALUES:
+            return True
+        if value in _FALSE_VALUES:
+            return False
+        raise ValueError("must be a boolean")
+
     def get_allow_query_params(self) -> dict[str, typing.Any]:
+        allow_fields = set(self.allow_fields) & self.lookup_table.keys()
         return {
-            key: value
+            key: self.coerce_value(key, value)
             for key, value in self.get_query_params().items()
-            if key in self.allow_fields
+            if key in allow_fields
         }
 
 
 class QueryParamsFilterBackend(FilterBackendBase):
-
     """Filter queryset by query params."""
 
 
 class BodyParamsFilterBackend(FilterBackendBase):
-
     """Filter queryset by body params."""
 
     def get_query_params(self) -> dict[str, typing.Any]:
-        return self.request.POST.dict()
+        return get_request_data(self.request)
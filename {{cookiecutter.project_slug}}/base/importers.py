@@ -0,0 +1,107 @@
+import abc
+import csv
+import io
+import typing
+
+from .encoders import loads
+from .exceptions import BodyInvalid
+
+
+class ChunkStream(io.RawIOBase):
+    """Read-only binary stream over an iterable of byte chunks.
+
+    Wrapped in `io.BufferedReader`, lines and rows are read across chunk
+    boundaries with only the current chunk held in memory.
+    """
+
+    def __init__(self, chunks: typing.Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.pending:
+            try:
+                self.pending = memoryview(next(self.chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+class BaseImporter(abc.ABC):
+    """Decode an iterable of byte chunks into rows, one at a time.
+
+    `records` yields `(line, record)` pairs and `decode` turns a record into a
+    row, so a malformed line fails on its own instead of the whole import.
+    """
+
+    content_type: str
+    extensions: tuple[str, ...]
+
+    def open(self, chunks: typing.Iterable[bytes]) -> io.BufferedReader:
+        return io.BufferedReader(ChunkStream(chunks), buffer_size=64 * 2**10)
+
+    @abc.abstractmethod
+    def records(
+        self, chunks: typing.Iterable[bytes]
+    ) -> typing.Iterator[tuple[int, typing.Any]]: ...
+
+    @abc.abstractmethod
+    def decode(self, record: typing.Any) -> typing.Any: ...
+
+
+class NdjsonImporter(BaseImporter):
+    content_type = "application/x-ndjson"
+    extensions = ("ndjson", "jsonl")
+
+    def records(
+        self, chunks: typing.Iterable[bytes]
+    ) -> typing.Iterator[tuple[int, bytes]]:
+        for line, raw in enumerate(self.open(chunks), 1):
+            if raw.strip():
+                yield line, raw
+
+    def decode(self, record: bytes) -> typing.Any:
+        try:
+            return loads(record)
+        except ValueError as e:
+            raise BodyInvalid({"msg": e}) from e
+
+
+class CsvImporter(BaseImporter):
+    """The first row is the header, values are passed on as strings."""
+
+    content_type = "text/csv"
+    extensions = ("csv",)
+
+    def __init__(self):
+        self.header: list[str] = []
+
+    def records(
+        self, chunks: typing.Iterable[bytes]
+    ) -> typing.Iterator[tuple[int, list[str]]]:
+        # `utf-8-sig` drops the BOM spreadsheet programs write
+        text = io.TextIOWrapper(self.open(chunks), encoding="utf-8-sig", newline="")
+        reader = csv.reader(text)
+        self.header = next(reader, [])
+        for values in reader:
+            if values:
+                yield reader.line_num, values
+
+    def decode(self, record: list[str]) -> dict[str, str]:
+        if len(record) != len(self.header):
+            raise BodyInvalid(
+                {"msg": f"expected {len(self.header)} columns, got {len(record)}"}
+            )
+        return dict(zip(self.header, record))
+
+
+IMPORTERS: dict[str, typing.Type[BaseImporter]] = {
+    "ndjson": NdjsonImporter,
+    "csv": CsvImporter,
+}
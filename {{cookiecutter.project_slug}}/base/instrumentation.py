@@ -0,0 +1,216 @@
+import contextlib
+import functools
+import logging
+import time
+import traceback
+import typing
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger("default.performance")
+
+_current_stats: ContextVar["RequestStats | None"] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class RequestStats:
+    """Timings and executed queries of the current request.
+
+    Installed as a `connection.execute_wrapper` on every database alias by
+    `PerformanceMiddleware`, other code adds timings with `timed()`.
+    """
+
+    # Keep the SQL of at most this many queries per request
+    max_queries: int = 1000
+
+    def __init__(self, repeat_threshold: int | None = None, keep_params: bool = False):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.query_count = 0
+        # Params hold the written values, e.g. every row of a bulk insert,
+        # they are only kept with `keep_params`
+        self.keep_params = keep_params
+        self.queries: list[tuple[str, typing.Any, float]] = []
+        self.timings: dict[str, float] = {}
+        # Same SQL with any params this many times is reported as N+1
+        self.repeat_threshold = repeat_threshold
+        self.repeated_callsites: dict[str, list[str]] = {}
+        self._query_keys: Counter = Counter()
+        self._query_shapes: Counter = Counter()
+        self._active: set[str] = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.query_count += 1
+            if len(self.queries) < self.max_queries:
+                self.queries.append(
+                    (sql, params if self.keep_params else None, duration)
+                )
+                if not many:
+                    self._query_keys[(sql, hash(repr(params)))] += 1
+                    self._query_shapes[sql] += 1
+                    if self._query_shapes[sql] == self.repeat_threshold:
+                        # Only the stack of the threshold-th query is kept
+                        self.repeated_callsites[sql] = get_callsite()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """SQL executed more than once with the same params, with its count."""
+        return {sql: n for (sql, _), n in self._query_keys.items() if n > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(n - 1 for n in self._query_keys.values() if n > 1)
+
+    @property
+    def repeated_queries(self) -> dict[str, int]:
+        """SQL executed at least `repeat_threshold` times, likely in a loop."""
+        if self.repeat_threshold is None:
+            return {}
+        return {
+            sql: n
+            for sql, n in self._query_shapes.items()
+            if n >= self.repeat_threshold
+        }
+
+    @contextlib.contextmanager
+    def timed(self, name: str) -> typing.Iterator[None]:
+        """Add the time spent in the block, minus its queries, to `name`."""
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start, db_start = time.perf_counter(), self.db_time
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            duration = time.perf_counter() - start - (self.db_time - db_start)
+            self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    def install(self) -> None:
+        """Wrap the queries of the calling thread's connections."""
+        for alias in connections:
+            connections[alias].execute_wrappers.append(self)
+
+    def uninstall(self) -> None:
+        for alias in connections:
+            wrappers = connections[alias].execute_wrappers
+            if self in wrappers:
+                wrappers.remove(self)
+
+    def activate(self):
+        return _current_stats.set(self)
+
+    @staticmethod
+    def deactivate(token) -> None:
+        _current_stats.reset(token)
+
+
+def get_callsite(limit: int = 3) -> list[str]:
+    """Innermost project frames of the current stack, library frames skipped."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()[:-2]
+        if "site-packages" not in frame.filename
+        and "/django/" not in frame.filename
+        and not frame.filename.startswith("<")
+    ]
+    return [
+        f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in frames[-limit:]
+    ]
+
+
+def get_request_stats() -> RequestStats | None:
+    return _current_stats.get()
+
+
+@contextlib.contextmanager
+def timed(name: str) -> typing.Iterator[None]:
+    """Time a block of the current request, a no-op outside of one."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    with stats.timed(name):
+        yield
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """`execute_wrapper` recording the SQL of the calling thread's queries."""
+
+    def __init__(self):
+        self.queries: list[str] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def describe(self) -> str:
+        return "\n".join(f"{i}. {sql}" for i, sql in enumerate(self.queries, 1))
+
+
+@contextlib.contextmanager
+def assert_max_queries(
+    budget: int, using: str = DEFAULT_DB_ALIAS
+) -> typing.Iterator[QueryCounter]:
+    """Fail with `QueryBudgetExceeded` if the block runs more than `budget`
+    queries, e.g. in tests around a client request."""
+    counter = QueryCounter()
+    with connections[using].execute_wrapper(counter):
+        yield counter
+    if len(counter) > budget:
+        raise QueryBudgetExceeded(
+            f"{len(counter)} queries executed, budget is {budget}:\n"
+            f"{counter.describe()}"
+        )
+
+
+def query_budget(
+    budget: int, strict: bool | None = None, using: str = DEFAULT_DB_ALIAS
+):
+    """Decorate a sync view or view method with a maximum number of queries.
+
+    Over budget, raise `QueryBudgetExceeded` if `strict` and log a warning
+    otherwise. `strict` defaults to `settings.DEBUG`.
+    """
+
+    def wrapper(func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            counter = QueryCounter()
+            with connections[using].execute_wrapper(counter):
+                result = func(*args, **kwargs)
+            if len(counter) > budget:
+                msg = (
+                    f"{func.__qualname__} executed {len(counter)} queries, "
+                    f"budget is {budget}"
+                )
+                if settings.DEBUG if strict is None else strict:
+                    raise QueryBudgetExceeded(f"{msg}:\n{counter.describe()}")
+                logger.warning(msg, extra={"sql": counter.queries})
+            return result
+
+        return inner
+
+    return wrapper
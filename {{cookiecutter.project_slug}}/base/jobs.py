@@ -0,0 +1,191 @@
+"""Background jobs kept in the database and run by `manage.py run_jobs`.
+
+Functions registered with `@task` are called through `enqueue()`, which only
+inserts a `Job` row. Workers claim pending rows with a conditional UPDATE, so
+any number of worker processes can share the table without a broker. Tasks
+are looked up in the `tasks` module of every installed app.
+"""
+
+import datetime
+import logging
+import os
+import socket
+import threading
+import typing
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .middleware import JsonMiddleware
+from .models import Job
+from .status_codes import JOB_WORKER_LOST
+
+logger = logging.getLogger("default")
+
+TASKS: dict[str, typing.Callable[..., typing.Any]] = {}
+
+_discovered = False
+
+
+def task(name: str | None = None):
+    """Register a function as a task. Its params and return value must be
+    JSON serializable."""
+
+    def decorator(func):
+        TASKS[name or f"{func.__module__}.{func.__qualname__}"] = func
+        return func
+
+    return decorator
+
+
+def autodiscover() -> None:
+    global _discovered
+    if not _discovered:
+        autodiscover_modules("tasks")
+        _discovered = True
+
+
+def enqueue(
+    name: str,
+    params: dict[str, typing.Any] | None = None,
+    max_attempts: int = 1,
+    user=None,
+) -> Job:
+    """Insert a pending job, owned by `user` if authenticated."""
+    autodiscover()
+    if name not in TASKS:
+        raise ValueError(f"Unknown task {name!r}")
+    return Job.objects.create(
+        name=name,
+        params=params or {},
+        max_attempts=max_attempts,
+        user=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def claim(worker: str, limit: int) -> list[Job]:
+    """Mark up to `limit` of the oldest pending jobs as running by `worker`.
+
+    A job is claimed only if it is still pending when updated, concurrent
+    workers never run the same attempt.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(status=Job.Status.PENDING).order_by(
+        "create_at", "pk"
+    )
+    claimed = [
+        pk
+        for pk in candidates.values_list("pk", flat=True)[:limit]
+        if Job.objects.filter(pk=pk, status=Job.Status.PENDING).update(
+            status=Job.Status.RUNNING,
+            worker=worker,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            heartbeat_at=now,
+            update_at=now,
+        )
+    ]
+    return list(Job.objects.filter(pk__in=claimed).order_by("create_at", "pk"))
+
+
+def run_job(job: Job) -> None:
+    """Run a claimed job and store its outcome.
+
+    Failed jobs go back to pending while attempts are left.
+    """
+    func = TASKS.get(job.name)
+    result, error = None, None
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task {job.name!r}")
+        result = func(**job.params)
+        status = Job.Status.DONE
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job.pk, job.name)
+        msg, code = JsonMiddleware.dispatch_exception(e)
+        error = {"msg": msg, "code": code}
+        status = (
+            Job.Status.PENDING if job.attempts < job.max_attempts else Job.Status.FAILED
+        )
+    now = timezone.now()
+    # Unless the job was requeued as stale and claimed by another worker
+    Job.objects.filter(pk=job.pk, worker=job.worker, status=Job.Status.RUNNING).update(
+        status=status,
+        result=result,
+        error=error,
+        finished_at=now if status != Job.Status.PENDING else None,
+        update_at=now,
+    )
+
+
+class Worker:
+    """Run claimed jobs on a pool of `threads`.
+
+    Running jobs are heartbeated every `poll_interval`. Jobs of workers that
+    have not heartbeated for `stale_after` seconds, e.g. killed ones, are
+    retried or failed.
+    """
+
+    def __init__(
+        self, threads: int = 4, poll_interval: float = 1, stale_after: float = 300
+    ):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stopping = threading.Event()
+        autodiscover()
+
+    def stop(self) -> None:
+        self.stopping.set()
+
+    def heartbeat(self, pks: typing.Iterable[uuid.UUID]) -> None:
+        Job.objects.filter(pk__in=list(pks), worker=self.name).update(
+            heartbeat_at=timezone.now()
+        )
+
+    def requeue_stale(self) -> None:
+        stale = Job.objects.filter(
+            status=Job.Status.RUNNING,
+            heartbeat_at__lt=timezone.now()
+            - datetime.timedelta(seconds=self.stale_after),
+        )
+        error = {"msg": JOB_WORKER_LOST.render(), "code": JOB_WORKER_LOST.code}
+        stale.filter(attempts__gte=F("max_attempts")).update(
+            status=Job.Status.FAILED, error=error, finished_at=timezone.now()
+        )
+        stale.update(status=Job.Status.PENDING, error=error)
+
+    def execute(self, job: Job) -> None:
+        try:
+            run_job(job)
+        finally:
+            # Connections are per thread, this one would stay open otherwise
+            connections.close_all()
+
+    def run(self, burst: bool = False) -> None:
+        """Poll until `stop()`, or with `burst` until no job is left."""
+        logger.info("Job worker %s started with %s threads", self.name, self.threads)
+        running: dict[Future, uuid.UUID] = {}
+        with ThreadPoolExecutor(self.threads, thread_name_prefix="job") as executor:
+            while not self.stopping.is_set():
+                for future in [future for future in running if future.done()]:
+                    del running[future]
+                if running:
+                    self.heartbeat(running.values())
+                self.requeue_stale()
+
+                free = self.threads - len(running)
+                jobs = claim(self.name, free) if free else []
+                for job in jobs:
+                    running[executor.submit(self.execute, job)] = job.pk
+                if burst and not running:
+                    break
+                if not jobs or not free:
+                    self.stopping.wait(self.poll_interval)
+        connections.close_all()
+        logger.info("Job worker %s stopped", self.name)
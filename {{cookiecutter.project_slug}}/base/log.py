@@ -0,0 +1,177 @@
+"""Logging components referenced by `settings.LOGGING`.
+
+This module is imported while settings are being loaded, so it must not
+import Django settings or any module that does.
+"""
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import typing
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every `LogRecord` has, anything else was passed with `extra=`
+_RECORD_ATTRS = frozenset(
+    [*logging.LogRecord("", 0, "", 0, "", (), None).__dict__, "message", "asctime"]
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, `extra=` fields are included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class TracebackRateLimitFilter(logging.Filter):
+    """Keep at most `burst` tracebacks per identical error every `window` seconds.
+
+    Errors are identical when they share the exception type and the frame it
+    was raised from. Records over the limit are still logged, without
+    `exc_info` and with a `suppressed_tracebacks` count.
+    """
+
+    def __init__(self, window: float = 60, burst: int = 1, name: str = ""):
+        super().__init__(name)
+        self.window = window
+        self.burst = burst
+        self._seen: dict[tuple, list[float | int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(record: logging.LogRecord) -> tuple:
+        exc_type, _, tb = record.exc_info
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        if tb is None:
+            return exc_type, record.pathname, record.lineno
+        return exc_type, tb.tb_frame.f_code.co_filename, tb.tb_lineno
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or record.exc_info[0] is None:
+            return True
+
+        key = self.get_key(record)
+        now = time.monotonic()
+        with self._lock:
+            # [window start, tracebacks kept, tracebacks suppressed]
+            seen = self._seen.get(key)
+            if seen is None or now - seen[0] > self.window:
+                if len(self._seen) > 1000:
+                    self._seen.clear()
+                seen = self._seen[key] = [now, 0, 0]
+            if seen[1] < self.burst:
+                seen[1] += 1
+                return True
+            seen[2] += 1
+            suppressed = seen[2]
+
+        record.exc_info = None
+        record.exc_text = None
+        record.suppressed_tracebacks = suppressed
+        return True
+
+
+# Listener threads do not survive `fork`, e.g. gunicorn `--preload` workers
+_queue_handlers: "weakref.WeakSet[QueueListenerHandler]" = weakref.WeakSet()
+
+
+def _reset_queue_handlers() -> None:
+    for handler in list(_queue_handlers):
+        handler.reset()
+
+
+os.register_at_fork(after_in_child=_reset_queue_handlers)
+
+
+class QueueListenerHandler(QueueHandler):
+    """Hand records to `handlers` running in a background thread.
+
+    The logging thread only enqueues the record. Formatting, tracebacks and I/O
+    happen in the listener thread. `handlers` are names of handlers from the
+    same `LOGGING` config. They are resolved on the first record, so their
+    configuration order does not matter. When the queue is full, records are
+    dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, handlers: list[str], maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.handler_names = handlers
+        self.listener: QueueListener | None = None
+        self.dropped = 0
+        self._start_lock = threading.Lock()
+        _queue_handlers.add(self)
+
+    def reset(self) -> None:
+        """Forget the parent's listener in a forked child, the next record
+        starts one. Records queued by the parent are left to it."""
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener = None
+        self._start_lock = threading.Lock()
+
+    def get_handlers(self) -> list[logging.Handler]:
+        handlers = [logging.getHandlerByName(name) for name in self.handler_names]
+        missing = [
+            name for name, handler in zip(self.handler_names, handlers) if not handler
+        ]
+        if missing:
+            raise ValueError(f"Unknown logging handlers: {', '.join(missing)}")
+        return typing.cast(list[logging.Handler], handlers)
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self.listener is not None:
+                return
+            self.listener = QueueListener(
+                self.queue, *self.get_handlers(), respect_handler_level=True
+            )
+            self.listener.start()
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        with self._start_lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike `QueueHandler.prepare`, leave the traceback to the listener
+        # thread and only render the message, since args may be mutated later
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.listener is None:
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,85 @@
+import typing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from base.utils import get_indexed_fields
+from base.views import ListView
+
+
+def iter_list_views(
+    patterns: list, prefix: str = ""
+) -> typing.Iterator[tuple[str, typing.Type[ListView]]]:
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_list_views(
+                pattern.url_patterns, prefix + str(pattern.pattern)
+            )
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None and issubclass(view_class, ListView):
+                yield prefix + str(pattern.pattern), view_class
+
+
+class Command(BaseCommand):
+    help = "Report list endpoints whose ordering or filter fields are not indexed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error if any endpoint is reported, e.g. in CI.",
+        )
+
+    def get_unindexed_fields(
+        self, view_class: typing.Type[ListView]
+    ) -> tuple[list[str], list[str]]:
+        model = view_class.model
+        indexed = get_indexed_fields(model) | {"pk"}
+
+        ordering = [
+            field.lstrip("-")
+            for field in view_class.ordering or ()
+            if isinstance(field, str)
+        ]
+        # Only the leading ordering field can use an index on its own
+        unindexed_ordering = (
+            ordering[:1] if ordering[:1] and ordering[0] not in indexed else []
+        )
+
+        unindexed_filters = []
+        if view_class.filter_backend_class is not None:
+            backend = view_class.filter_backend_class(None, model)
+            table = backend.lookup_table
+            names = {
+                table[param][0].name
+                for param in backend.get_filter_fields()
+                if param in table
+            }
+            unindexed_filters = sorted(names - indexed)
+        return unindexed_ordering, unindexed_filters
+
+    def handle(self, *args, **options):
+        reported = 0
+        for route, view_class in iter_list_views(get_resolver().url_patterns):
+            if view_class.model is None:
+                continue
+            ordering, filters = self.get_unindexed_fields(view_class)
+            if not ordering and not filters:
+                continue
+
+            reported += 1
+            self.stdout.write(
+                self.style.WARNING(
+                    f"/{route} ({view_class.__module__}.{view_class.__qualname__})"
+                )
+            )
+            if ordering:
+                self.stdout.write(f"  ordering field not indexed: {ordering[0]}")
+            if filters:
+                self.stdout.write(f"  filter fields not indexed: {', '.join(filters)}")
+
+        if reported and options["fail"]:
+            raise CommandError(f"{reported} endpoint(s) use unindexed fields")
+        if not reported:
+            self.stdout.write(self.style.SUCCESS("All list endpoints are indexed"))
@@ -0,0 +1,81 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from base.jobs import Worker
+from base.metrics import mark_process_dead
+
+
+def run_worker(options: dict) -> None:
+    worker = Worker(
+        threads=options["threads"],
+        poll_interval=options["poll_interval"],
+        stale_after=options["stale_after"],
+    )
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *args: worker.stop())
+    worker.run(burst=options["burst"])
+
+
+class Command(BaseCommand):
+    help = "Run background jobs enqueued with `base.jobs.enqueue`."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Jobs run at once by each process, for I/O bound tasks.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Worker processes, for CPU bound tasks.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds between polls for new jobs and heartbeats.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=300,
+            help="Seconds without heartbeat after which a running job is retried.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is left instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        if options["processes"] <= 1:
+            run_worker(options)
+            return
+
+        # Forked processes must not share the parent's connections
+        connections.close_all()
+        processes = [
+            multiprocessing.get_context("fork").Process(
+                target=run_worker, args=(options,)
+            )
+            for _ in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+
+        def stop(*args):
+            # Children finish their running jobs on SIGTERM
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for process in processes:
+            process.join()
+            mark_process_dead(process.pid)
@@ -0,0 +1,337 @@
+import abc
+import atexit
+import json
+import os
+import threading
+import time
+import typing
+import uuid
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: typing.Any) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(labelnames: typing.Sequence[str], labels: Labels, **extra) -> str:
+    pairs = [*zip(labelnames, labels), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Metric(abc.ABC):
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[Labels, typing.Any] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict[Labels, typing.Any]:
+        with self._lock:
+            return {labels: self.copy_value(v) for labels, v in self._values.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def copy_value(self, value: typing.Any) -> typing.Any:
+        return value
+
+    @abc.abstractmethod
+    def merge_value(self, a: typing.Any, b: typing.Any) -> typing.Any:
+        """Combine the values of the same labels from two processes."""
+        ...
+
+    @abc.abstractmethod
+    def render(self, values: dict[Labels, typing.Any]) -> typing.Iterator[str]: ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def merge_value(self, a: float, b: float) -> float:
+        return a + b
+
+    def render(self, values: dict[Labels, float]) -> typing.Iterator[str]:
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram(Metric):
+    """Buckets are stored non-cumulative and summed up when rendered."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: typing.Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [bucket counts with +Inf last, sum, count]
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def copy_value(self, value: list) -> list:
+        return [list(value[0]), value[1], value[2]]
+
+    def merge_value(self, a: list, b: list) -> list:
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1], a[2] + b[2]]
+
+    def render(self, values: dict[Labels, list]) -> typing.Iterator[str]:
+        for labels, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, n in zip([*self.buckets, "+Inf"], counts):
+                cumulative += n
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.labelnames, labels, le=bound)} {cumulative}"
+                )
+            rendered = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{rendered} {total}"
+            yield f"{self.name}_count{rendered} {count}"
+
+
+class MetricsRegistry:
+    """In-process metrics, rendered in the Prometheus text format.
+
+    Recording only takes a per-metric lock. With `multiprocess_dir` set, every
+    process writes its values to `<dir>/<pid>-<id>.json` at most every
+    `flush_interval` seconds and at exit, the random id keeps a reused PID
+    from overwriting a stopped worker's file. `render` then sums the files of
+    all processes, so any worker can serve the exposition endpoint. Stopped
+    workers are folded into `dead.json` by `mark_process_dead`, their counts
+    stay part of the totals.
+    """
+
+    dead_file: str = "dead.json"
+
+    def __init__(
+        self, multiprocess_dir: str | os.PathLike | None = None, flush_interval=5
+    ):
+        self.metrics: dict[str, Metric] = {}
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        self.process_id = self.new_process_id()
+        if self.multiprocess_dir is not None:
+            self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.flush)
+        os.register_at_fork(after_in_child=self.after_fork)
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Labels = ()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: typing.Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def reset(self) -> None:
+        for metric in self.metrics.values():
+            metric.reset()
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def new_process_id() -> str:
+        return f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+    def after_fork(self) -> None:
+        # Values recorded before a fork belong to the parent process
+        self.reset()
+        self.process_id = self.new_process_id()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def process_file(self) -> Path:
+        return self.multiprocess_dir / f"{self.process_id}.json"
+
+    def maybe_flush(self) -> None:
+        """Cheap enough to call after every request."""
+        if (
+            self.multiprocess_dir is not None
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.multiprocess_dir is None:
+            return
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            values = {name: metric.snapshot() for name, metric in self.metrics.items()}
+            self.write_file(self.process_file, self.dump(values))
+
+    @staticmethod
+    def dump(values: dict[str, dict[Labels, typing.Any]]) -> dict[str, list]:
+        return {
+            name: [[list(labels), value] for labels, value in samples.items()]
+            for name, samples in values.items()
+        }
+
+    @staticmethod
+    def write_file(path: Path, data: typing.Any) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def read_file(path: Path) -> typing.Any:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def read_dead(self) -> dict[str, typing.Any]:
+        """`{"processes": [...], "metrics": {...}}` of the folded workers."""
+        dead = self.read_file(self.multiprocess_dir / self.dead_file)
+        return dead or {"processes": [], "metrics": {}}
+
+    def merge(
+        self, values: dict[str, dict[Labels, typing.Any]], data: dict[str, list]
+    ) -> None:
+        for name, samples in data.items():
+            metric = self.metrics.get(name)
+            if metric is None:
+                continue
+            merged = values[name]
+            for labels, value in samples:
+                labels = tuple(labels)
+                merged[labels] = (
+                    metric.merge_value(merged[labels], value)
+                    if labels in merged
+                    else value
+                )
+
+    def collect(self) -> dict[str, dict[Labels, typing.Any]]:
+        values = {name: metric.snapshot() for name, metric in self.metrics.items()}
+        if self.multiprocess_dir is None:
+            return values
+
+        dead = self.read_dead()
+        self.merge(values, dead["metrics"])
+        folded = {*dead["processes"], self.process_id}
+        for path in self.multiprocess_dir.glob("*-*.json"):
+            if path.stem in folded:
+                continue
+            data = self.read_file(path)
+            if data is not None:
+                self.merge(values, data)
+        return values
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Fold the files of the stopped process `pid` into `dead.json`.
+
+        Call it from the process manager, e.g. gunicorn's `child_exit` hook.
+        Folded files are listed in `dead.json` before they are removed, so
+        readers never count them twice.
+        """
+        if self.multiprocess_dir is None:
+            return
+        paths = list(self.multiprocess_dir.glob(f"{pid}-*.json"))
+        if not paths:
+            return
+        with self._flush_lock:
+            dead = self.read_dead()
+            values = {name: {} for name in self.metrics}
+            self.merge(values, dead["metrics"])
+            for path in paths:
+                data = self.read_file(path)
+                if data is not None:
+                    self.merge(values, data)
+            existing = {path.stem for path in self.multiprocess_dir.glob("*-*.json")}
+            processes = [stem for stem in dead["processes"] if stem in existing]
+            self.write_file(
+                self.multiprocess_dir / self.dead_file,
+                {
+                    "processes": processes + [path.stem for path in paths],
+                    "metrics": self.dump(values),
+                },
+            )
+            for path in paths:
+                path.unlink(missing_ok=True)
+
+    def render(self) -> str:
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(values))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(
+    settings.DJANGO_REST.get("METRICS_MULTIPROCESS_DIR"),
+    settings.DJANGO_REST.get("METRICS_FLUSH_INTERVAL", 5),
+)
+
+
+def mark_process_dead(pid: int) -> None:
+    """`REGISTRY.mark_process_dead`, for gunicorn's config:
+
+    `def child_exit(server, worker): mark_process_dead(worker.pid)`
+    """
+    REGISTRY.mark_process_dead(pid)
+
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Request latency by URL name and method.",
+    ("view", "method"),
+)
+RESPONSES = REGISTRY.counter(
+    "http_responses_total",
+    "Responses by URL name, HTTP status and `status_codes.Code`.",
+    ("view", "status", "code"),
+)
+DB_QUERIES = REGISTRY.counter(
+    "db_queries_total",
+    "Database queries by URL name.",
+    ("view",),
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes",
+    "Response body size by URL name, streaming responses excluded.",
+    ("view",),
+    buckets=(100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
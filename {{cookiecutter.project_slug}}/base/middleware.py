@@ -1,24 +1,41 @@
 import logging
+import time
 from itertools import chain, groupby
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError
 from django.http.request import HttpRequest
 from django.http.response import HttpResponse
 from pydantic import ValidationError
 
 from . import status_codes
 from .exceptions import CustomException
-from .response import ResponseStructure
+from .instrumentation import RequestStats, get_request_stats
+from .metrics import DB_QUERIES, REGISTRY, REQUEST_DURATION, RESPONSE_SIZE, RESPONSES
+from .response import Response
 
 logger = logging.getLogger("default")
+performance_logger = logging.getLogger("default.performance")
 
 
 class BaseMiddleware:
+    # Runs natively in both WSGI and ASGI handlers, without thread hops
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         # One-time configuration and initialization.
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+
         # Code to be executed for each request before
         # the view (and later middleware) are called.
 
@@ -27,28 +44,44 @@ class BaseMiddleware:
         # Code to be executed for each request/response after
         # the view is called.
 
+        return self.process_response(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response: HttpResponse = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
         return response
 
 
 class JsonMiddleware(BaseMiddleware):
-    def __call__(self, *args, **kwargs) -> HttpResponse:
-        response: HttpResponse = super().__call__(*args, **kwargs)
-        if response.status_code >= 400:
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        # 416 responses of `DownloadView` carry `Content-Range`, range clients
+        # rely on the status
+        if response.status_code >= 400 and not response.has_header("Content-Range"):
             detail = response.reason_phrase
 
             msg = status_codes.FAILED.render(
                 {"status_code": response.status_code, "msg": detail}
             )
 
-            logger.error(msg)
-            r = ResponseStructure(
+            logger.error(
+                msg,
+                extra={
+                    "status_code": response.status_code,
+                    "method": request.method,
+                    "path": request.path,
+                },
+            )
+            return Response(
                 data=None,
                 msg=msg,
                 code=response.status_code,
             )
-            return HttpResponse(
-                r.model_dump_json(by_alias=True),
-            )
         return response
 
     @staticmethod
@@ -74,7 +107,12 @@ class JsonMiddleware(BaseMiddleware):
                 )
             return ", ".join(err_msgs), status_codes.PYDANTIC_VALIDATION_ERROR.code
 
-        # TODO: Database constraint violation
+        # Database constraint violation
+        if isinstance(exception, IntegrityError):
+            return (
+                status_codes.CONSTRAINT_VIOLATED.render({"msg": str(exception)}),
+                status_codes.CONSTRAINT_VIOLATED.code,
+            )
 
         # Uncaught exception
         return (
@@ -86,10 +124,174 @@ class JsonMiddleware(BaseMiddleware):
         self, request: HttpRequest, exception: Exception
     ) -> HttpResponse:
         msg, code = self.dispatch_exception(exception)
-        logger.error(msg, exc_info=True)
-        r = ResponseStructure(
+        logger.error(
+            msg,
+            exc_info=True,
+            extra={"code": code, "method": request.method, "path": request.path},
+        )
+        return Response(
             data=None,
             msg=msg,
             code=code,
         )
-        return HttpResponse(r.model_dump_json(by_alias=True))
+
+
+class PerformanceMiddleware(BaseMiddleware):
+    """Where the time of a request goes.
+
+    Measures the total time, the time and count of DB queries, duplicate
+    queries and the serialization time of `Response`. Every request is logged
+    with these as structured fields. Requests slower than
+    `PERF_SLOW_REQUEST_MS` are logged as warnings along with their SQL. With
+    `PERF_SERVER_TIMING` the timings are also sent in a `Server-Timing`
+    header. Place it before `JsonMiddleware` to include error responses.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.server_timing = settings.DJANGO_REST.get(
+            "PERF_SERVER_TIMING", settings.DEBUG
+        )
+        self.slow_request_ms = settings.DJANGO_REST.get("PERF_SLOW_REQUEST_MS", 500)
+        self.repeat_threshold = settings.DJANGO_REST.get(
+            "PERF_N_PLUS_ONE_THRESHOLD", 10
+        )
+        self.log_query_params = settings.DJANGO_REST.get(
+            "PERF_LOG_QUERY_PARAMS", settings.DEBUG
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        stats = RequestStats(self.repeat_threshold, self.log_query_params)
+        token = stats.activate()
+        stats.install()
+        try:
+            response = self.get_response(request)
+        finally:
+            stats.uninstall()
+            stats.deactivate(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats = RequestStats(self.repeat_threshold, self.log_query_params)
+        token = stats.activate()
+        # Queries run on the request's thread-sensitive executor thread
+        await sync_to_async(stats.install)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stats.uninstall)()
+            stats.deactivate(token)
+        return self.finish(request, response, stats)
+
+    def finish(
+        self, request: HttpRequest, response: HttpResponse, stats: RequestStats
+    ) -> HttpResponse:
+        total_ms = stats.elapsed * 1000
+        timings = {name: round(t * 1000, 3) for name, t in stats.timings.items()}
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status_code": response.status_code,
+            "total_ms": round(total_ms, 3),
+            "db_ms": round(stats.db_time * 1000, 3),
+            "queries": stats.query_count,
+            "duplicate_queries": stats.duplicate_count,
+            "timings": timings,
+        }
+        msg = "%s %s %s in %.1fms, %s queries"
+        args = (
+            request.method,
+            request.path,
+            response.status_code,
+            total_ms,
+            stats.query_count,
+        )
+        if total_ms >= self.slow_request_ms:
+            fields["sql"] = [
+                {"sql": sql, "ms": round(t * 1000, 3)}
+                | ({"params": params} if stats.keep_params else {})
+                for sql, params, t in stats.queries
+            ]
+            fields["duplicates"] = stats.duplicates
+            performance_logger.warning("Slow request " + msg, *args, extra=fields)
+        else:
+            performance_logger.info(msg, *args, extra=fields)
+
+        for sql, count in stats.repeated_queries.items():
+            performance_logger.warning(
+                "Possible N+1 on %s %s: %s queries of the same shape: %s",
+                request.method,
+                request.path,
+                count,
+                sql,
+                extra={
+                    "path": request.path,
+                    "sql": sql,
+                    "count": count,
+                    "callsite": stats.repeated_callsites.get(sql),
+                },
+            )
+
+        if self.server_timing:
+            response["Server-Timing"] = self.get_server_timing(stats, total_ms)
+        return response
+
+    @staticmethod
+    def get_server_timing(stats: RequestStats, total_ms: float) -> str:
+        metrics = [
+            f"total;dur={total_ms:.3f}",
+            f'db;dur={stats.db_time * 1000:.3f};desc="{stats.query_count} queries"',
+        ]
+        metrics += [
+            f"{name};dur={duration * 1000:.3f}"
+            for name, duration in stats.timings.items()
+        ]
+        return ", ".join(metrics)
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Record request metrics into `metrics.REGISTRY`.
+
+    Query counts come from `PerformanceMiddleware`, place this after it and
+    before `JsonMiddleware` so error responses carry their `Code`.
+    """
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def get_view_label(request: HttpRequest) -> str:
+        match = request.resolver_match
+        if match is None:
+            return "<unresolved>"
+        return match.view_name or match.route
+
+    def record(
+        self, request: HttpRequest, response: HttpResponse, duration: float
+    ) -> None:
+        view = self.get_view_label(request)
+        REQUEST_DURATION.observe(duration, view, request.method)
+        RESPONSES.inc(
+            view, str(response.status_code), str(getattr(response, "code", ""))
+        )
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), view)
+        stats = get_request_stats()
+        if stats is not None:
+            DB_QUERIES.inc(view, amount=stats.query_count)
+        REGISTRY.maybe_flush()
@@ -1,9 +1,104 @@
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.signals import class_prepared, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_model_version_on_commit
 
 
 class BaseDatabaseModel(models.Model):
     create_at = models.DateTimeField(auto_now_add=True)
     update_at = models.DateTimeField(auto_now=True)
 
+    # Indexes added to every concrete subclass, as tuples of field names.
+    # `(create_at, pk)` serves the default `ListView` ordering and its cursor
+    # pagination, `update_at` serves change polling. Set to `()` to opt out.
+    default_indexes: tuple[tuple[str, ...], ...] = (
+        ("create_at", "pk"),
+        ("update_at",),
+    )
+
     class Meta:
         abstract = True
+
+
+@receiver(class_prepared)
+def add_default_indexes(sender, **kwargs):
+    # Added here rather than in `Meta.indexes`, which subclasses declaring
+    # their own `Meta` would not inherit
+    opts = sender._meta
+    if not issubclass(sender, BaseDatabaseModel) or opts.abstract or opts.proxy:
+        return
+    declared = {tuple(index.fields) for index in opts.indexes}
+    for fields in sender.default_indexes:
+        fields = [opts.pk.name if name == "pk" else name for name in fields]
+        if tuple(fields) in declared:
+            continue
+        index = models.Index(fields=fields)
+        index.set_name_with_model(sender)
+        opts.indexes.append(index)
+    # Migrations only serialize options present in `original_attrs`
+    opts.original_attrs["indexes"] = opts.indexes
+
+
+class Job(BaseDatabaseModel):
+    """A call of a `base.jobs` task, claimed and run by `manage.py run_jobs`."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Who enqueued it, the only one to read its status and result. Jobs
+    # enqueued anonymously are readable by anyone knowing the id
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    name = models.CharField(max_length=255)
+    params = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    # `{"msg": ..., "code": ...}` of the last failure
+    error = models.JSONField(null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    worker = models.CharField(max_length=255, blank=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    heartbeat_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "t_job"
+        indexes = [
+            models.Index(fields=["status", "create_at"]),
+            models.Index(fields=["status", "heartbeat_at"]),
+        ]
+
+    def status_data(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "attempts": self.attempts,
+            "create_at": self.create_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+@receiver([post_save, post_delete])
+def invalidate_model_cache(sender, **kwargs):
+    # `QuerySet.update()`, `bulk_create()` and raw SQL send no signals, call
+    # `bump_model_version` after them or cached data stays stale
+    if issubclass(sender, BaseDatabaseModel):
+        bump_model_version_on_commit(sender, kwargs.get("using"))
@@ -0,0 +1,321 @@
+import abc
+import base64
+import binascii
+import datetime
+import json
+import typing
+from functools import cached_property
+
+from asgiref.sync import sync_to_async
+from django.core import paginator
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+from .cache import get_model_version, normalize_params
+from .exceptions import QueryParameterInvalid
+
+
+class CountStrategy(abc.ABC):
+    """How `ListView` computes the total count of a paginated list."""
+
+    @abc.abstractmethod
+    def count(self, queryset: QuerySet, params: dict[str, typing.Any]) -> int | None:
+        """
+
+        :param queryset: the filtered queryset
+        :param params: the filter params applied to `queryset`
+        :return: the count, or None to omit it from the response
+        """
+        ...
+
+    async def acount(
+        self, queryset: QuerySet, params: dict[str, typing.Any]
+    ) -> int | None:
+        return await sync_to_async(self.count)(queryset, params)
+
+
+class ExactCount(CountStrategy):
+    """`SELECT COUNT(*)` on every request."""
+
+    def count(self, queryset: QuerySet, params: dict[str, typing.Any]) -> int | None:
+        return queryset.count()
+
+    async def acount(
+        self, queryset: QuerySet, params: dict[str, typing.Any]
+    ) -> int | None:
+        return await queryset.acount()
+
+
+class NoCount(CountStrategy):
+    """Omit the count, pages are sliced without knowing the total."""
+
+    def count(self, queryset: QuerySet, params: dict[str, typing.Any]) -> int | None:
+        return None
+
+    async def acount(
+        self, queryset: QuerySet, params: dict[str, typing.Any]
+    ) -> int | None:
+        return None
+
+
+class CachedCount(CountStrategy):
+    """Exact count cached per model and filter params.
+
+    Writes to `BaseDatabaseModel` subclasses bump the model version, which
+    invalidates every cached count of that model.
+    """
+
+    key_prefix: str = "count"
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        cache_alias: str = DEFAULT_CACHE_ALIAS,
+        fallback: CountStrategy | None = None,
+    ):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.fallback = fallback or ExactCount()
+
+    def get_cache_key(self, queryset: QuerySet, params: dict[str, typing.Any]) -> str:
+        model = queryset.model
+        return ":".join(
+            [
+                self.key_prefix,
+                model._meta.label_lower,
+                str(get_model_version(model)),
+                normalize_params(params),
+            ]
+        )
+
+    def count(self, queryset: QuerySet, params: dict[str, typing.Any]) -> int | None:
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(queryset, params)
+        count = cache.get(key)
+        if count is None:
+            count = self.fallback.count(queryset, params)
+            cache.set(key, count, self.timeout)
+        return count
+
+
+class EstimatedCount(CountStrategy):
+    """Row estimate from the query planner, for backends that expose one.
+
+    Estimates below `threshold` are replaced by an exact count, which is cheap
+    at that size and avoids visibly wrong totals on small result sets. Backends
+    without planner statistics fall back to `fallback`.
+    """
+
+    def __init__(self, threshold: int = 10000, fallback: CountStrategy | None = None):
+        self.threshold = threshold
+        self.fallback = fallback or ExactCount()
+
+    def estimate(self, queryset: QuerySet) -> int | None:
+        vendor = connections[queryset.db].vendor
+        if vendor == "postgresql":
+            plan = json.loads(queryset.explain(format="json"))
+            return int(plan[0]["Plan"]["Plan Rows"])
+        return None
+
+    def count(self, queryset: QuerySet, params: dict[str, typing.Any]) -> int | None:
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return self.fallback.count(queryset, params)
+        return estimate
+
+
+class UncountedPage(paginator.Page):
+    """Page of a paginator without count.
+
+    `has_next` fetches the page along with one extra row instead of
+    comparing with the number of pages, and keeps the fetched rows.
+    """
+
+    def __init__(self, object_list, number, paginator, probe):
+        super().__init__(object_list, number, paginator)
+        self.probe = probe
+
+    def has_next(self) -> bool:
+        return self.keep_probed(list(self.probe))
+
+    async def ahas_next(self) -> bool:
+        return self.keep_probed([row async for row in self.probe])
+
+    def keep_probed(self, rows: list) -> bool:
+        self.object_list = rows[: self.paginator.per_page]
+        return len(rows) > self.paginator.per_page
+
+
+class Paginator(paginator.Paginator):
+    """Paginator taking its count from a `CountStrategy`.
+
+    When the strategy omits the count, pages are sliced by number only and
+    the upper bound is not validated.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_strategy: CountStrategy | None = None,
+        count_params: dict[str, typing.Any] | None = None,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy or ExactCount()
+        self.count_params = count_params or {}
+
+    @cached_property
+    def count(self) -> int | None:
+        return self.count_strategy.count(self.object_list, self.count_params)
+
+    def set_count(self, count: int | None) -> None:
+        """Use a count already known by the caller instead of the strategy."""
+        self.__dict__["count"] = count
+
+    async def acount(self) -> int | None:
+        if "count" not in self.__dict__:
+            self.set_count(
+                await self.count_strategy.acount(self.object_list, self.count_params)
+            )
+        return self.count
+
+    def page(self, number):
+        if self.count is not None:
+            return super().page(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise paginator.PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise paginator.EmptyPage(self.error_messages["min_page"])
+        bottom = (number - 1) * self.per_page
+        return UncountedPage(
+            self.object_list[bottom : bottom + self.per_page],
+            number,
+            self,
+            self.object_list[bottom : bottom + self.per_page + 1],
+        )
+
+
+def _encode_cursor_value(value: typing.Any) -> typing.Any:
+    # Keep full precision, `DjangoJSONEncoder` truncates microseconds
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class CursorPage:
+    def __init__(self, object_list: list[typing.Any], next_cursor: str | None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+class CursorPaginator:
+    """Keyset pagination over `ordering`, with the primary key as tie-breaker.
+
+    Instead of `OFFSET`, every page filters on the ordering values of the last
+    row of the previous page, so fetching a deep page costs the same as the
+    first one. Ordering fields must be non-null concrete fields of the model.
+    """
+
+    cursor_kwarg: str = "cursor"
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        ordering: typing.Sequence[str],
+        per_page: int,
+        cursor_kwarg: str | None = None,
+    ):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.cursor_kwarg = cursor_kwarg or self.cursor_kwarg
+        self.keys = self.get_keys(ordering)
+
+    def get_keys(self, ordering: typing.Sequence[str]) -> list[tuple[str, bool]]:
+        """Return `(field, descending)` pairs, ending with the primary key."""
+        opts = self.queryset.model._meta
+        keys = []
+        for field in ordering:
+            if not isinstance(field, str):
+                raise ValueError(
+                    "Cursor pagination only supports field name ordering, "
+                    f"got {field!r}"
+                )
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            keys.append((opts.pk.name if name == "pk" else name, descending))
+
+        if opts.pk.name not in [name for name, _ in keys]:
+            keys.append((opts.pk.name, keys[0][1] if keys else False))
+        return keys
+
+    @property
+    def ordering(self) -> list[str]:
+        return [f"-{name}" if descending else name for name, descending in self.keys]
+
+    def encode_cursor(self, values: list[typing.Any]) -> str:
+        raw = json.dumps(values, default=_encode_cursor_value, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> list[typing.Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise QueryParameterInvalid(
+                {"param": self.cursor_kwarg, "msg": str(e)}
+            ) from e
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise QueryParameterInvalid(
+                {"param": self.cursor_kwarg, "msg": "cursor does not match ordering"}
+            )
+        return values
+
+    def get_keyset_filter(self, values: list[typing.Any]) -> Q:
+        """`(a, b) > (x, y)` expanded to `a > x OR (a = x AND b > y)`."""
+        condition = Q()
+        for i, (name, descending) in enumerate(self.keys):
+            clause = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+            for (prev_name, _), prev_value in zip(self.keys[:i], values):
+                clause &= Q(**{prev_name: prev_value})
+            condition |= clause
+        return condition
+
+    def get_row_values(self, row: typing.Any) -> list[typing.Any]:
+        opts = self.queryset.model._meta
+        values = []
+        for name, _ in self.keys:
+            attname = opts.get_field(name).attname
+            values.append(
+                row[attname] if isinstance(row, dict) else getattr(row, attname)
+            )
+        return values
+
+    def get_page_queryset(self, cursor: str | None = None) -> QuerySet:
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(
+                self.get_keyset_filter(self.decode_cursor(cursor))
+            )
+        # Fetch one extra row to know whether there is a next page
+        return queryset[: self.per_page + 1]
+
+    def build_page(self, rows: list[typing.Any]) -> CursorPage:
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[: self.per_page]
+            next_cursor = self.encode_cursor(self.get_row_values(rows[-1]))
+        return CursorPage(rows, next_cursor)
+
+    def page(self, cursor: str | None = None) -> CursorPage:
+        return self.build_page(list(self.get_page_queryset(cursor)))
+
+    async def apage(self, cursor: str | None = None) -> CursorPage:
+        return self.build_page([row async for row in self.get_page_queryset(cursor)])
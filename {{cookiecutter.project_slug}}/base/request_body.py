@@ -0,0 +1,51 @@
+import typing
+
+from django.http.request import HttpRequest
+from pydantic import BaseModel
+
+from .encoders import loads
+from .exceptions import BodyInvalid
+
+_PARSED_BODY_ATTR = "_parsed_body"
+
+ModelT = typing.TypeVar("ModelT", bound=BaseModel)
+
+
+def is_form_request(request: HttpRequest) -> bool:
+    """POST requests not sent as JSON are read from `request.POST`."""
+    return request.method == "POST" and request.content_type != "application/json"
+
+
+def get_request_data(request: HttpRequest) -> typing.Any:
+    """Parsed request body, cached on the request.
+
+    The decorators, `BodyParamsFilterBackend` and the validate mixins all read
+    the body through here, so it is decoded once per request.
+    """
+    try:
+        return getattr(request, _PARSED_BODY_ATTR)
+    except AttributeError:
+        pass
+
+    if is_form_request(request):
+        data = request.POST.dict()
+    else:
+        try:
+            data = loads(request.body)
+        except ValueError as e:
+            raise BodyInvalid({"msg": str(e)})
+    setattr(request, _PARSED_BODY_ATTR, data)
+    return data
+
+
+def validate_request_data(
+    request: HttpRequest, pydantic_model: typing.Type[ModelT]
+) -> ModelT:
+    """Validate the request body with `pydantic_model`.
+
+    JSON bodies nobody has parsed yet are validated straight from the raw
+    bytes, without building an intermediate dict.
+    """
+    if is_form_request(request) or hasattr(request, _PARSED_BODY_ATTR):
+        return pydantic_model.model_validate(get_request_data(request))
+    return pydantic_model.model_validate_json(request.body)
@@ -2,16 +2,22 @@ import json
 from typing import Any
 
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.core.paginator import Page
 from django.db import models
-from django.forms.models import model_to_dict
-from django.http.response import JsonResponse
+from django.http.response import HttpResponse
 from pydantic import BaseModel, Field
 
+from .encoders import render_envelope
+from .instrumentation import timed
+from .serializers import ModelSerializer
 from .status_codes import SUCCESS
 
 RESPONSE_CONFIG = settings.DJANGO_REST
 
+PAGINATED_LIST_FIELD = RESPONSE_CONFIG["RESPONSE_PAGINATED_LIST_FIELD"]
+PAGINATED_COUNT_FIELD = RESPONSE_CONFIG["RESPONSE_PAGINATED_COUNT_FIELD"]
+PAGINATED_NEXT_FIELD = RESPONSE_CONFIG["RESPONSE_PAGINATED_NEXT_FIELD"]
+
 
 class ResponseStructure(BaseModel):
     data: Any = Field(..., serialization_alias=RESPONSE_CONFIG["RESPONSE_DATA_FIELD"])
@@ -27,12 +33,21 @@ class PaginatedResponseStructure(BaseModel):
     paginated_list: list[Any] = Field(
         [], serialization_alias=RESPONSE_CONFIG["RESPONSE_PAGINATED_LIST_FIELD"]
     )
-    count: int = Field(
+    count: int | None = Field(
         0, serialization_alias=RESPONSE_CONFIG["RESPONSE_PAGINATED_COUNT_FIELD"]
     )
+    next: str | int | None = Field(
+        None, serialization_alias=RESPONSE_CONFIG["RESPONSE_PAGINATED_NEXT_FIELD"]
+    )
+
+
+class Response(HttpResponse):
+    """JSON response wrapped in `ResponseStructure`.
 
+    The envelope is encoded straight to bytes by `encoders.render_envelope`,
+    `ResponseStructure` is only built if `self.response` is accessed.
+    """
 
-class Response(JsonResponse):
     def serialize_model_data(self, data: Any) -> Any:
         match data:
             case bytes():
@@ -40,9 +55,12 @@ class Response(JsonResponse):
             case str() | int() | float() | bool() | None | dict():
                 return data
             case models.Model():
-                return model_to_dict(data)
+                return ModelSerializer.for_model(type(data)).serialize(data)
             case models.query.QuerySet():
-                return data.values()
+                # Already projected by `values()` / `values_list()`
+                if not issubclass(data._iterable_class, models.query.ModelIterable):
+                    return list(data)
+                return list(data.values())
             case list() | tuple():
                 return [self.serialize_model_data(item) for item in data]
             case _:
@@ -51,37 +69,45 @@ class Response(JsonResponse):
     def __init__(
         self, data: Any, msg: str | None = None, code: int | None = None, **kwargs
     ):
-        self.response = ResponseStructure(
-            data=self.serialize_model_data(data),
-            msg=msg,
-            code=code or SUCCESS.code,
-        )
-        super().__init__(
-            self.response.model_dump(by_alias=True),
-            **kwargs,
-        )
+        with timed("serialize"):
+            self.data = self.serialize_model_data(data)
+            self.msg = msg
+            self.code = code or SUCCESS.code
+            content = render_envelope(self.data, self.msg, self.code)
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content, **kwargs)
+
+    @property
+    def response(self) -> ResponseStructure:
+        return ResponseStructure(data=self.data, msg=self.msg, code=self.code)
 
 
 class PaginatedResponse(Response):
     def __init__(
         self,
         data: list[Any] | None = None,
-        count: int = 0,
-        paginator: Paginator | None = None,
+        count: int | None = 0,
+        page: Page | None = None,
+        next: str | int | None = None,
         **kwargs,
     ):
-        if paginator is not None and isinstance(paginator, Paginator):
-            self.paginate_response = PaginatedResponseStructure(
-                paginated_list=list(paginator.object_list.values()),
-                count=paginator.count,
-            )
+        with timed("serialize"):
+            if page is not None:
+                count = page.paginator.count
+                # Without a count, `next` tells clients whether to keep paging
+                if count is None and page.has_next():
+                    next = page.number + 1
+                # `page.object_list` is the sliced queryset of the requested page
+                paginated_list = page.object_list
+            else:
+                paginated_list = data or []
 
-        else:
-            self.paginate_response = PaginatedResponseStructure(
-                paginated_list=data or [], count=count
+            paginate_response = {
+                PAGINATED_LIST_FIELD: self.serialize_model_data(paginated_list),
+                PAGINATED_COUNT_FIELD: count,
+                PAGINATED_NEXT_FIELD: next,
+            }
+            super().__init__(
+                data={k: v for k, v in paginate_response.items() if v is not None},
+                **kwargs,
             )
-
-        super().__init__(
-            data=self.paginate_response.model_dump(by_alias=True),
-            **kwargs,
-        )
@@ -0,0 +1,106 @@
+import typing
+from functools import lru_cache
+from itertools import chain
+
+from django.db import models
+from django.db.models.fields.files import FileField
+
+
+def _file_name(value: typing.Any) -> str | None:
+    return value.name or None
+
+
+def _related_pks(value: typing.Any) -> list[typing.Any]:
+    return [obj.pk for obj in value]
+
+
+class ModelSerializer:
+    """Field list and per-field converters of a model, compiled once.
+
+    Produces the same keys as `model_to_dict` without walking `_meta` for
+    every instance. Use `ModelSerializer.for_model` to get a cached instance.
+    """
+
+    def __init__(
+        self,
+        model: typing.Type[models.Model],
+        fields: typing.Iterable[str] | None = None,
+        exclude: typing.Iterable[str] | None = None,
+        editable_only: bool = True,
+    ):
+        self.model = model
+        fields = set(fields) if fields is not None else None
+        exclude = set(exclude or ())
+        opts = model._meta
+
+        # (name, attname, converter), converter is None for JSON-ready values
+        self.fields: list[tuple[str, str, typing.Callable | None]] = []
+        self.many_to_many: list[str] = []
+        for field in chain(opts.concrete_fields, opts.many_to_many):
+            if editable_only and not field.editable:
+                continue
+            if fields is not None and field.name not in fields:
+                continue
+            if field.name in exclude:
+                continue
+            if field.many_to_many:
+                self.many_to_many.append(field.name)
+            elif isinstance(field, FileField):
+                self.fields.append((field.name, field.attname, _file_name))
+            else:
+                self.fields.append((field.name, field.attname, None))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _field_names(model: typing.Type[models.Model]) -> frozenset[str]:
+        opts = model._meta
+        return frozenset(
+            field.name for field in chain(opts.concrete_fields, opts.many_to_many)
+        )
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _for_model(
+        cls,
+        model: typing.Type[models.Model],
+        fields: frozenset[str] | None,
+        exclude: frozenset[str],
+        editable_only: bool,
+    ) -> "ModelSerializer":
+        return cls(model, fields, exclude, editable_only)
+
+    @classmethod
+    def for_model(
+        cls,
+        model: typing.Type[models.Model],
+        fields: typing.Iterable[str] | None = None,
+        exclude: typing.Iterable[str] | None = None,
+        editable_only: bool = True,
+    ) -> "ModelSerializer":
+        # Names come from query params, unknown and repeated ones must not
+        # make new cache entries
+        known = cls._field_names(model)
+        return cls._for_model(
+            model,
+            known.intersection(fields) if fields is not None else None,
+            known.intersection(exclude or ()),
+            editable_only,
+        )
+
+    @property
+    def names(self) -> list[str]:
+        return [name for name, _, _ in self.fields] + self.many_to_many
+
+    @property
+    def attnames(self) -> list[str]:
+        """Columns to load, for `QuerySet.only()` or `QuerySet.values()`."""
+        return [attname for _, attname, _ in self.fields]
+
+    def serialize(self, instance: models.Model) -> dict[str, typing.Any]:
+        data = {}
+        for name, attname, converter in self.fields:
+            value = getattr(instance, attname)
+            data[name] = converter(value) if converter is not None else value
+        for name in self.many_to_many:
+            data[name] = _related_pks(getattr(instance, name).all())
+        return data
@@ -22,3 +22,11 @@ PYDANTIC_VALIDATION_ERROR = Code("Validation error: %(msg)s", 5)
 OBJECT_NOT_FOUND = Code("Object not found: %(msg)s", 6)
 PATH_PARAM_MISSING = Code("Path param `%(param)s` is required", 7)
 LOGIN_REQUIRED = Code("Login required", 8)
+QUERY_PARAM_INVALID = Code("Query param `%(param)s` is invalid: %(msg)s", 9)
+BODY_INVALID = Code("Request body is invalid: %(msg)s", 10)
+BULK_ITEMS_INVALID = Code("%(count)s of %(total)s items are invalid", 11)
+UPLOAD_TOO_LARGE = Code("Upload exceeds the limit of %(limit)s bytes", 12)
+REMOTE_FETCH_FAILED = Code("Fetching %(url)s failed: %(msg)s", 13)
+JOB_NOT_FINISHED = Code("Job %(id)s is %(status)s", 14)
+JOB_WORKER_LOST = Code("The worker running the job stopped responding", 15)
+CONSTRAINT_VIOLATED = Code("Constraint violated: %(msg)s", 16)
@@ -0,0 +1,68 @@
+import typing
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, QueryDict
+from django.utils.module_loading import import_string
+
+from .file_handler.loader import LocalFileLoader, LocalFileUploader
+from .jobs import task
+
+
+def make_request(user_id: typing.Any = None, query: str = "") -> HttpRequest:
+    """A GET request of the user who enqueued the job, so views scope their
+    querysets as they would for that user."""
+    request = HttpRequest()
+    request.method = "GET"
+    request.GET = QueryDict(query)
+    request.user = (
+        AnonymousUser()
+        if user_id is None
+        else get_user_model()._default_manager.get(pk=user_id)
+    )
+    return request
+
+
+@task("base.import_file")
+def import_file(
+    view: str, format: str, key: str, user_id: typing.Any = None
+) -> dict[str, typing.Any]:
+    """Import a file spooled by `ImportView.start_in_background`."""
+    import_view = import_string(view)()
+    import_view.setup(make_request(user_id))
+    loader = LocalFileLoader(import_view.spool_uploader_class())
+    try:
+        return import_view.run_import(
+            import_view.importers[format](), loader.iter_chunks(key)
+        )
+    finally:
+        loader.store.delete(key)
+
+
+@task("base.export_list")
+def export_list(
+    view: str, query: str, user_id: typing.Any = None
+) -> dict[str, typing.Any]:
+    """Export a list as `ExportView` would for `?{query}`, into `EXPORT_ROOT`.
+
+    The file is served by `JobDownloadView` to the job's owner only.
+    """
+    export_view = import_string(view)()
+    export_view.setup(make_request(user_id, query))
+    exporter = export_view.get_exporter()
+
+    key = uuid.uuid4().hex
+    size = 0
+    with LocalFileUploader(settings.DJANGO_REST["EXPORT_ROOT"]).open(key) as writer:
+        for chunk in exporter.export(export_view.get_export_rows(exporter)):
+            size += len(chunk)
+            writer.write(chunk)
+        writer.commit(key)
+    return {
+        "key": key,
+        "size": size,
+        "filename": export_view.get_filename(exporter),
+        "content_type": exporter.content_type,
+    }
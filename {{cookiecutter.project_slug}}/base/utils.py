@@ -4,9 +4,37 @@ from django.db import models
 from django.http.request import HttpRequest
 from rich import print
 
+from .cache import ObjectCache
 from .exceptions import QueryParameterMissing
 
 
+def get_indexed_fields(model: typing.Type[models.Model]) -> set[str]:
+    """Names of the fields that lead an index of `model`.
+
+    Only the first column of a composite index is usable on its own for
+    filtering and ordering, so the other columns are not reported.
+    """
+    opts = model._meta
+    indexed = {
+        field.name
+        for field in opts.concrete_fields
+        if field.primary_key or field.unique or field.db_index
+    }
+    for index in opts.indexes:
+        if index.fields:
+            indexed.add(index.fields[0].lstrip("-"))
+    for fields in opts.unique_together:
+        indexed.add(fields[0])
+    for constraint in opts.total_unique_constraints:
+        indexed.add(constraint.fields[0])
+    return indexed
+
+
+def get_view_path(view: typing.Any) -> str:
+    """Dotted path of a view's class, importable by `import_string`."""
+    return f"{type(view).__module__}.{type(view).__qualname__}"
+
+
 def log_settings(settings: str):
     print(f"[green bold]Using {settings} settings[/]")
 
@@ -16,13 +44,17 @@ class ObjectFinder:
         self,
         model: typing.Type[models.Model],
         request: HttpRequest | None = None,
+        object_cache: ObjectCache | None = None,
     ):
         self.request = request
         self.model = model
+        self.object_cache = object_cache
 
     def get_object(self, **kwargs) -> models.Model:
         if not kwargs:
             raise ValueError("Query kwargs must be provided")
+        if self.object_cache is not None:
+            return self.object_cache.get(self.model, self.model.objects, **kwargs)
         return self.model.objects.get(**kwargs)
 
     def get_by_pk(self, pk: typing.Any, pk_field: str = "pk") -> models.Model:
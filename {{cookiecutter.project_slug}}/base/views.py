@@ -1,58 +1,496 @@
-import json
+import contextlib
+import csv
+import datetime
+import hmac
 import typing
+import uuid
+from calendar import timegm
 from functools import cached_property
+from pathlib import Path, PurePosixPath
 
-from django.db.models import Model
-from django.db.models.query import QuerySet
-from django.forms import model_to_dict
-from django.http import HttpRequest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, Field, Max, Model
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import QuerySet, prefetch_related_objects
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+    quote_etag,
+)
+from django.utils.translation import gettext as _
 from django.views import View, generic
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from .cache import (
+    ObjectCache,
+    ResponseCache,
+    bump_model_version_on_commit,
+    normalize_params,
+)
+from .exceptions import (
+    BodyInvalid,
+    BodyParameterMissing,
+    CustomException,
+    PathParameterMissing,
+    QueryParameterInvalid,
+)
+from .exporters import EXPORTERS, BaseExporter
+from .file_handler.loader import (
+    BaseFileLoader,
+    FileSlice,
+    FileStat,
+    LocalFileLoader,
+    LocalFileUploader,
+    StoredObject,
+    Uploader,
+)
+from .file_handler.parser import (
+    BaseFileParser,
+    MaxSizeUploadHandler,
+    StreamFileParser,
+)
 from .filter_backends import (
     BodyParamsFilterBackend,
     FilterBackendBase,
     QueryParamsFilterBackend,
 )
+from .importers import IMPORTERS, BaseImporter
+from .jobs import enqueue
+from .metrics import CONTENT_TYPE, REGISTRY, MetricsRegistry
+from .middleware import JsonMiddleware
+from .models import Job
+from .pagination import (
+    CountStrategy,
+    CursorPage,
+    CursorPaginator,
+    ExactCount,
+    NoCount,
+    Paginator,
+)
+from .request_body import get_request_data, validate_request_data
 from .response import PaginatedResponse, Response
+from .serializers import ModelSerializer
+from .status_codes import BULK_ITEMS_INVALID, JOB_NOT_FINISHED
+from .utils import get_view_path
+
+
+def get_auto_now_fields(model: typing.Type[Model]) -> list[Field]:
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+    ]
+
+
+class ProjectionMixin:
+    """Sparse fieldsets with `?fields=a,b` and `?exclude=c`.
+
+    Requested fields are validated against `ret_model_fields` /
+    `ret_model_fields_exclude` and pushed into the query with `only()` or
+    `values()`, serialization uses a `ModelSerializer` compiled per model.
+    """
+
+    model: Model
+    ret_model_fields: list[str] | None = None
+    ret_model_fields_exclude: list[str] | None = None
+    fields_kwarg: str = "fields"
+    exclude_kwarg: str = "exclude"
+    # Same as `model_to_dict`, non-editable fields are not returned
+    editable_only: bool = True
+    # Relations loaded along with model instances, many-to-many fields are
+    # serialized from the prefetch cache instead of one query per object
+    select_related: list[str] | None = None
+    prefetch_related: list[str] | None = None
 
+    def get_requested_fields(self, kwarg: str) -> list[str] | None:
+        value = self.request.GET.get(kwarg)
+        if not value:
+            return None
+        names = list(
+            dict.fromkeys(name.strip() for name in value.split(",") if name.strip())
+        )
+        allowed = ModelSerializer.for_model(
+            self.model,
+            self.ret_model_fields,
+            self.ret_model_fields_exclude,
+            self.editable_only,
+        ).names
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise QueryParameterInvalid(
+                {"param": kwarg, "msg": f"unknown fields {', '.join(unknown)}"}
+            )
+        return names
+
+    @cached_property
+    def serializer(self) -> ModelSerializer:
+        fields = self.get_requested_fields(self.fields_kwarg)
+        exclude = self.get_requested_fields(self.exclude_kwarg) or []
+        return ModelSerializer.for_model(
+            self.model,
+            self.ret_model_fields if fields is None else fields,
+            [*(self.ret_model_fields_exclude or []), *exclude],
+            self.editable_only,
+        )
+
+    def apply_related(self, queryset: QuerySet) -> QuerySet:
+        """Add `select_related` / `prefetch_related`, `values()` ignores both."""
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def project_queryset(
+        self, queryset: QuerySet, extra: typing.Iterable[str] = ()
+    ) -> QuerySet:
+        # Relations loaded by `select_related` cannot be deferred
+        related = [name.split(LOOKUP_SEP)[0] for name in self.select_related or ()]
+        return self.apply_related(queryset).only(
+            *self.serializer.attnames, *extra, *related
+        )
+
+    def project_values(
+        self, queryset: QuerySet, extra: typing.Iterable[str] = ()
+    ) -> QuerySet:
+        attnames = self.serializer.attnames
+        attnames += [attname for attname in extra if attname not in attnames]
+        return queryset.values(*(attnames or [self.model._meta.pk.attname]))
+
+
+class ConditionalGetMixin:
+    """`ETag` / `Last-Modified` derived from `last_modified_field`.
 
-class ListView(generic.ListView):
+    Requests carrying a matching `If-None-Match` / `If-Modified-Since` are
+    answered with 304 before any row is serialized.
+    """
+
+    last_modified_field: str | None = "update_at"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.etag: str | None = None
+        self.last_modified: datetime.datetime | None = None
+
+    def use_conditional_get(self) -> bool:
+        return self.last_modified_field is not None and self.request.method in (
+            "GET",
+            "HEAD",
+        )
+
+    def make_etag(self, *parts: typing.Any) -> str:
+        # Query params select the representation, e.g. page, size and fields
+        return quote_etag(
+            normalize_params(
+                {
+                    "model": self.model._meta.label_lower,
+                    "parts": parts,
+                    "params": self.request.GET.dict(),
+                }
+            )
+        )
+
+    def check_conditions(
+        self, etag: str, last_modified: datetime.datetime | None
+    ) -> HttpResponse | None:
+        self.etag, self.last_modified = etag, last_modified
+        return get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=timegm(last_modified.utctimetuple())
+            if last_modified is not None
+            else None,
+        )
+
+    def set_conditional_headers(self, response: HttpResponse) -> HttpResponse:
+        if self.etag is not None:
+            response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(
+                timegm(self.last_modified.utctimetuple())
+            )
+        return response
+
+
+class ResponseCacheMixin:
+    """Opt-in cache of whole responses, see `cache.ResponseCache`.
+
+    Keyed on the view, the params selecting the representation and the user
+    scope. Hits skip the queries, serialization and encoding, conditional
+    requests are answered from the cached validators. Sync views only.
+
+    Entries are invalidated by model signals, writes through
+    `QuerySet.update()` or raw SQL must call `bump_model_version`.
+    """
+
+    response_cache: ResponseCache | None = None
+    response_cache_methods: tuple[str, ...] = ("get", "head")
+
+    def get_response_cache_scope(self) -> str:
+        """Users never share entries, return "" where the response does not
+        depend on the user."""
+        user = getattr(self.request, "user", None)
+        return str(user.pk) if user is not None and user.is_authenticated else ""
+
+    def get_response_cache_params(self) -> dict[str, typing.Any]:
+        return {
+            "kwargs": self.kwargs,
+            "fields": self.request.GET.get(self.fields_kwarg),
+            "exclude": self.request.GET.get(self.exclude_kwarg),
+        }
+
+    def get_response_cache_models(self) -> list[typing.Type[Model]]:
+        return [self.model, *self.response_cache.depends_on]
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            self.response_cache is None
+            or self.view_is_async
+            or request.method.lower() not in self.response_cache_methods
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = self.response_cache.get_cache_key(
+            get_view_path(self),
+            self.get_response_cache_scope(),
+            self.get_response_cache_params(),
+        )
+        dispatch = super().dispatch
+        response = self.response_cache.get_or_render(
+            key,
+            self.get_response_cache_models(),
+            lambda: dispatch(request, *args, **kwargs),
+        )
+        if response.status_code != 200 or not self.use_conditional_get():
+            return response
+        last_modified = response.get("Last-Modified")
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=parse_http_date_safe(last_modified)
+            if last_modified
+            else None,
+            response=response,
+        )
+
+
+class ListView(
+    ResponseCacheMixin, ConditionalGetMixin, ProjectionMixin, generic.ListView
+):
     size_kwarg: str = "size"
-    default_size: int = 10
-    filter_backend_class: typing.Type[
-        FilterBackendBase
-    ] | None = QueryParamsFilterBackend
+    default_size: int | None = 10
+    max_size: int = 100
+    filter_backend_class: typing.Type[FilterBackendBase] | None = (
+        QueryParamsFilterBackend
+    )
     ordering = ("-create_at",)
+    # `page`: offset pagination with `page`/`size`
+    # `cursor`: keyset pagination with `cursor`/`size`, cost independent of depth
+    pagination_mode: typing.Literal["page", "cursor"] = "page"
+    cursor_kwarg: str = "cursor"
+    cursor_paginator_class: typing.Type[CursorPaginator] = CursorPaginator
+    editable_only = False
+    paginator_class = Paginator
+    # None: `ExactCount` in page mode, `NoCount` in cursor mode
+    count_strategy: CountStrategy | None = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.object_list: QuerySet | None = None
+        # Exact count computed along with the conditional GET validators
+        self.validator_count: int | None = None
 
     @cached_property
     def filter_backend(self) -> FilterBackendBase:
         return self.filter_backend_class(self.request, self.model)
 
-    def get_paginate_by(self, queryset: QuerySet) -> int:
-        return self.request.GET.get(self.size_kwarg, 10)
+    def get_queryset(self) -> QuerySet:
+        return self.apply_related(super().get_queryset())
+
+    def get_paginate_by(self, queryset: QuerySet) -> int | None:
+        size = self.request.GET.get(self.size_kwarg)
+        if size is None:
+            return self.default_size
+        try:
+            size = int(size)
+        except ValueError:
+            raise QueryParameterInvalid(
+                {"param": self.size_kwarg, "msg": "size must be an integer"}
+            )
+        if size < 1:
+            raise QueryParameterInvalid(
+                {"param": self.size_kwarg, "msg": "size must be greater than 0"}
+            )
+        return min(size, self.max_size)
+
+    def get_count_strategy(self) -> CountStrategy:
+        if self.count_strategy is not None:
+            return self.count_strategy
+        return NoCount() if self.pagination_mode == "cursor" else ExactCount()
+
+    def get_response_cache_params(self) -> dict[str, typing.Any]:
+        return {
+            **super().get_response_cache_params(),
+            "filters": self.get_count_params(),
+            "page": self.get_page_number(),
+            "size": self.request.GET.get(self.size_kwarg),
+            "cursor": self.request.GET.get(self.cursor_kwarg),
+        }
+
+    def get_count_params(self) -> dict[str, typing.Any]:
+        if self.filter_backend is None:
+            return {}
+        return self.filter_backend.get_allow_query_params()
+
+    def get_paginator(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        orphans=0,
+        allow_empty_first_page=True,
+        **kwargs,
+    ) -> Paginator:
+        paginator = self.paginator_class(
+            queryset,
+            per_page,
+            count_strategy=self.get_count_strategy(),
+            count_params=self.get_count_params(),
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            **kwargs,
+        )
+        if self.validator_count is not None and isinstance(
+            paginator.count_strategy, ExactCount
+        ):
+            paginator.set_count(self.validator_count)
+        return paginator
+
+    def get_count(self) -> int | None:
+        strategy = self.get_count_strategy()
+        if self.validator_count is not None and isinstance(strategy, ExactCount):
+            return self.validator_count
+        return strategy.count(self.object_list, self.get_count_params())
+
+    def get_page_number(self) -> typing.Any:
+        return (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int):
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        page = self.get_page(paginator)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_page(self, paginator: Paginator) -> Page:
+        try:
+            return paginator.page(self.get_page_number())
+        except InvalidPage as e:
+            raise QueryParameterInvalid({"param": self.page_kwarg, "msg": str(e)})
+
+    def get_cursor_paginator(
+        self, queryset: QuerySet, page_size: int
+    ) -> CursorPaginator:
+        return self.cursor_paginator_class(
+            queryset,
+            self.get_ordering() or (),
+            page_size,
+            cursor_kwarg=self.cursor_kwarg,
+        )
+
+    def paginate_queryset_by_cursor(
+        self, queryset: QuerySet, page_size: int
+    ) -> CursorPage:
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        return paginator.page(self.request.GET.get(self.cursor_kwarg))
+
+    def get_values_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Project rows, in cursor mode the ordering fields are always kept."""
+        extra = []
+        if self.pagination_mode == "cursor":
+            opts = self.model._meta
+            extra = [opts.pk.attname] + [
+                opts.get_field(field.lstrip("-")).attname
+                for field in self.get_ordering() or ()
+                if field.lstrip("-") != "pk"
+            ]
+        return self.project_values(queryset, extra)
 
     def filter_queryset(self, queryset: QuerySet) -> QuerySet:
         if self.filter_backend is not None:
             queryset = self.filter_backend.filter_queryset(queryset)
         return queryset
 
+    def use_conditional_get(self) -> bool:
+        # The validators come with an exact count, which replaces the count
+        # query; other strategies exist to avoid scanning the filtered set
+        return super().use_conditional_get() and isinstance(
+            self.get_count_strategy(), ExactCount
+        )
+
+    def get_validator_aggregates(self) -> dict[str, typing.Any]:
+        return {
+            "last_modified": Max(self.last_modified_field),
+            "count": Count("pk"),
+        }
+
+    def get_list_conditional_response(self, aggregates: dict) -> HttpResponse | None:
+        """`MAX(last_modified_field)` and the count identify the filtered set."""
+        self.validator_count = aggregates["count"]
+        return self.check_conditions(
+            self.make_etag(aggregates["last_modified"], aggregates["count"]),
+            aggregates["last_modified"],
+        )
+
     def get(self, request: HttpRequest, *args, **kwargs):
         qs = self.get_queryset()
         self.object_list = self.filter_queryset(qs)
-        context = super().get_context_data(**kwargs)
-        paginator = context["paginator"]
-        if paginator is None:
-            return Response(data=context["object_list"])
-        return PaginatedResponse(paginator=context["paginator"])
+        if self.use_conditional_get():
+            aggregates = self.object_list.aggregate(**self.get_validator_aggregates())
+            not_modified = self.get_list_conditional_response(aggregates)
+            if not_modified is not None:
+                return not_modified
+        return self.set_conditional_headers(self.list_response())
+
+    def list_response(self) -> Response:
+        page_size = self.get_paginate_by(self.object_list)
+        values = self.get_values_queryset(self.object_list)
+        if page_size is None:
+            return Response(data=values)
+
+        if self.pagination_mode == "cursor":
+            page = self.paginate_queryset_by_cursor(values, page_size)
+            return PaginatedResponse(
+                data=page.object_list,
+                count=self.get_count(),
+                next=page.next_cursor,
+            )
+
+        _, page, _, _ = self.paginate_queryset(values, page_size)
+        return PaginatedResponse(page=page)
 
 
 class ListViewWithPost(ListView):
     filter_backend_class = BodyParamsFilterBackend
+    response_cache_methods = ("get", "head", "post")
 
     def post(self, request, *args, **kwargs):
         """Post query"""
@@ -60,52 +498,202 @@ class ListViewWithPost(ListView):
         return self.get(request, *args, **kwargs)
 
 
-class ObjectMixin:
-    model: Model
-    ret_model_fields: list[str] | None = None
-    ret_model_fields_exclude: list[str] | None = None
+class ExportView(ListView):
+    """Stream the filtered and ordered list as `?format=ndjson|csv|json`.
+
+    Rows are read with `QuerySet.iterator(chunk_size=...)` and written through
+    a `StreamingHttpResponse`, so memory stays flat regardless of row count.
+    """
+
+    format_kwarg: str = "format"
+    default_format: str = "ndjson"
+    exporters: dict[str, typing.Type[BaseExporter]] = EXPORTERS
+    export_fields: list[str] | None = None
+    chunk_size: int = 2000
+    # Export with a `base.jobs` worker into `EXPORT_ROOT` and answer 202 with
+    # the job, its owner fetches the file with `JobDownloadView`
+    run_in_background: bool = False
+
+    def get_export_fields(self) -> list[str]:
+        if self.export_fields is not None:
+            return self.export_fields
+        return self.serializer.attnames
+
+    def get_exporter(self) -> BaseExporter:
+        export_format = self.request.GET.get(self.format_kwarg, self.default_format)
+        if export_format not in self.exporters:
+            raise QueryParameterInvalid(
+                {
+                    "param": self.format_kwarg,
+                    "msg": f"must be one of {', '.join(self.exporters)}",
+                }
+            )
+        return self.exporters[export_format](self.get_export_fields())
+
+    def get_export_rows(
+        self, exporter: BaseExporter
+    ) -> typing.Iterator[dict[str, typing.Any]]:
+        self.object_list = self.filter_queryset(self.get_queryset())
+        return self.object_list.values(*exporter.fields).iterator(
+            chunk_size=self.chunk_size
+        )
+
+    def get_filename(self, exporter: BaseExporter) -> str:
+        return f"{self.model._meta.model_name}.{exporter.extension}"
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        exporter = self.get_exporter()
+        if self.run_in_background:
+            job = enqueue(
+                "base.export_list",
+                {
+                    "view": get_view_path(self),
+                    "query": request.GET.urlencode(),
+                    "user_id": request.user.pk,
+                },
+                user=request.user,
+            )
+            return Response(data=job.status_data(), status=202)
+
+        response = StreamingHttpResponse(
+            exporter.export(self.get_export_rows(exporter)),
+            content_type=exporter.content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.get_filename(exporter)}"'
+        )
+        return response
+
+
+class ObjectMixin(ProjectionMixin):
+    # Opt-in read-through cache for object lookups, see `cache.ObjectCache`
+    object_cache: ObjectCache | None = None
 
     def __init__(self):
         self.object: Model | None = None
 
+    def invalidate_object_cache(self):
+        if self.object_cache is not None:
+            self.object_cache.invalidate(self.model)
+
     def return_inst(self, instance: Model | None = None) -> Response:
         instance = instance or self.object
         if instance is None:
             raise ValueError("instance is None")
-        return Response(
-            data=model_to_dict(
-                instance,
-                fields=self.ret_model_fields,
-                exclude=self.ret_model_fields_exclude,
-            )
-        )
+        return Response(data=self.serializer.serialize(instance))
 
 
 class ValidateObjectMixin(ObjectMixin):
     pydantic_model: typing.Type[BaseModel] | None = None
 
     def validate(self, request, partial: bool = False) -> dict[str, typing.Any]:
-        if request.method != "POST":
-            loc = json.loads(request.body.decode())
-        else:
-            loc = request.POST.dict()
+        if self.pydantic_model is None:
+            return get_request_data(request)
+        if not partial:
+            return validate_request_data(request, self.pydantic_model).model_dump()
+        return self.validate_partial(get_request_data(request))
 
-        if self.pydantic_model is not None:
-            if not partial:
-                return self.pydantic_model(**loc).model_dump()
+    def validate_partial(self, loc: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """Validate only the submitted fields of `pydantic_model`.
 
-            # For partial update
-            return self.pydantic_model(
-                **model_to_dict(self.object),
-                **loc,
-            ).model_dump()
-        return loc
+        Each known key runs through its field validator as an assignment on
+        an unvalidated instance, unknown keys are ignored like in full mode.
+        """
+        if not isinstance(loc, dict):
+            raise BodyInvalid({"msg": "expected a JSON object"})
+        fields = self.pydantic_model.model_fields
+        instance = self.pydantic_model.model_construct()
+        validator = self.pydantic_model.__pydantic_validator__
+        for k, v in loc.items():
+            if k in fields:
+                validator.validate_assignment(instance, k, v)
+        return instance.model_dump(include=instance.model_fields_set)
 
+    def apply_changes(self, instance: Model, data: dict[str, typing.Any]) -> list[str]:
+        """Set the values that differ from `instance`, keys that are not
+        concrete non-pk fields (by name or attname) are ignored.
+
+        :return: `update_fields` for `save()`, empty when nothing changed
+        """
+        names = {
+            name
+            for field in self.model._meta.concrete_fields
+            if not field.primary_key
+            for name in (field.name, field.attname)
+        }
+        changed = []
+        for k, v in data.items():
+            if k in names and getattr(instance, k) != v:
+                setattr(instance, k, v)
+                changed.append(k)
+        if not changed:
+            return []
+        return changed + [
+            field.name
+            for field in get_auto_now_fields(self.model)
+            if field.name not in changed
+        ]
+
+
+class CachedObjectMixin(generic.detail.SingleObjectMixin):
+    """Object lookups through `ObjectMixin.object_cache`."""
+
+    def get_object_lookup(self) -> dict[str, typing.Any]:
+        """Lookup kwargs `get_object` filters the queryset with."""
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        lookup = {}
+        if pk is not None:
+            lookup["pk"] = pk
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            lookup[self.get_slug_field()] = slug
+        if not lookup:
+            raise AttributeError(
+                "Generic detail view %s must be called with either an object "
+                "pk or a slug in the URLconf." % self.__class__.__name__
+            )
+        return lookup
+
+    def not_found(self) -> Http404:
+        return Http404(
+            _("No %(verbose_name)s found matching the query")
+            % {"verbose_name": self.model._meta.verbose_name}
+        )
+
+    def get_cached_object(self) -> Model:
+        try:
+            return self.object_cache.get(
+                self.model,
+                self.apply_related(self.get_queryset()),
+                **self.get_object_lookup(),
+            )
+        except self.model.DoesNotExist:
+            raise self.not_found()
+
+
+class DetailView(
+    ResponseCacheMixin, ConditionalGetMixin, CachedObjectMixin, ObjectMixin, View
+):
+    def get_detail_queryset(self) -> QuerySet:
+        extra = [self.last_modified_field] if self.use_conditional_get() else []
+        return self.project_queryset(self.get_queryset(), extra)
+
+    def get_detail_conditional_response(self) -> HttpResponse | None:
+        last_modified = getattr(self.object, self.last_modified_field)
+        return self.check_conditions(
+            self.make_etag(self.object.pk, last_modified), last_modified
+        )
 
-class DetailView(generic.detail.SingleObjectMixin, ObjectMixin, View):
     def get(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        return self.return_inst()
+        if self.object_cache is not None:
+            self.object = self.get_cached_object()
+        else:
+            self.object = self.get_object(self.get_detail_queryset())
+        if self.use_conditional_get():
+            not_modified = self.get_detail_conditional_response()
+            if not_modified is not None:
+                return not_modified
+        return self.set_conditional_headers(self.return_inst())
 
 
 class CreateView(ValidateObjectMixin, View):
@@ -121,10 +709,12 @@ class CreateView(ValidateObjectMixin, View):
 
 class UpdateMixinView(generic.detail.SingleObjectMixin, ValidateObjectMixin, View):
     def perform_update(self, instance: Model, partial: bool = False) -> Model:
-        for k, v in self.validate(self.request, partial=partial).items():
-            setattr(instance, k, v)
-
-        instance.save()
+        update_fields = self.apply_changes(
+            instance, self.validate(self.request, partial=partial)
+        )
+        if update_fields:
+            instance.save(update_fields=update_fields)
+            self.invalidate_object_cache()
         return instance
 
 
@@ -150,35 +740,716 @@ class DeleteView(generic.detail.SingleObjectMixin, ObjectMixin, View):
 
     def perform_delete(self):
         self.object.delete()
+        self.invalidate_object_cache()
+
 
+class BulkMixin(ValidateObjectMixin):
+    """Write many objects from one JSON array body in a single transaction.
 
-class UploadView(View):
-    # TODO: parse file content from stream or oss to bytes-like object
-    parsers: list = []
+    Every item is validated before anything is written. If any item fails,
+    nothing is written and the response lists the errors per item index.
+    Writes are issued `batch_size` rows per statement.
+    """
 
-    def get_upload_resource(self):
-        # Get bytes-like object from self.parsers
-        raise NotImplementedError()
+    batch_size: int = 500
+    max_items: int = 10000
 
-    def perform_upload(self):
-        # Save bytes-like object to database or somewhere
-        raise NotImplementedError()
+    def get_queryset(self) -> QuerySet:
+        return self.model._default_manager.all()
+
+    def get_items(self, request: HttpRequest) -> list[typing.Any]:
+        items = get_request_data(request)
+        if not isinstance(items, list):
+            raise BodyInvalid({"msg": "expected a JSON array"})
+        if len(items) > self.max_items:
+            raise BodyInvalid({"msg": f"at most {self.max_items} items are allowed"})
+        return items
+
+    def validate_item(self, item: typing.Any) -> dict[str, typing.Any]:
+        if self.pydantic_model is not None:
+            return self.pydantic_model.model_validate(item).model_dump()
+        if not isinstance(item, dict):
+            raise BodyInvalid({"msg": "expected a JSON object"})
+        return item
+
+    def item_error(self, index: int, exception: Exception) -> dict[str, typing.Any]:
+        msg, code = JsonMiddleware.dispatch_exception(exception)
+        return {"index": index, "msg": msg, "code": code}
+
+    def bulk_error_response(
+        self, errors: list[dict[str, typing.Any]], total: int
+    ) -> Response:
+        return Response(
+            data=errors,
+            msg=BULK_ITEMS_INVALID.render({"count": len(errors), "total": total}),
+            code=BULK_ITEMS_INVALID.code,
+        )
+
+    def return_instances(self, objs: list[Model]) -> Response:
+        if self.prefetch_related:
+            prefetch_related_objects(objs, *self.prefetch_related)
+        return Response(data=[self.serializer.serialize(obj) for obj in objs])
+
+    def atomic(self):
+        return transaction.atomic(using=router.db_for_write(self.model))
+
+    def find_integrity_errors(
+        self, items: list[typing.Any], write: typing.Callable[[typing.Any], None]
+    ) -> list[dict[str, typing.Any]]:
+        """Write `items` one by one, each in a savepoint, to tell which ones
+        violate a constraint, with each other or with existing rows. Nothing
+        is kept."""
+        using = router.db_for_write(self.model)
+        errors = []
+        with self.atomic():
+            for index, item in enumerate(items):
+                try:
+                    with transaction.atomic(using=using):
+                        write(item)
+                except IntegrityError as e:
+                    errors.append(self.item_error(index, e))
+            transaction.set_rollback(True, using=using)
+        return errors
+
+    def invalidate_object_cache(self):
+        # Bulk writes send no `post_save` signal, bump the model version here
+        bump_model_version_on_commit(self.model, router.db_for_write(self.model))
+
+
+class BulkCreateView(BulkMixin, View):
+    def post(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        objs, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                objs.append(self.model(**self.validate_item(item)))
+            except (ValidationError, CustomException, TypeError) as e:
+                errors.append(self.item_error(index, e))
+        if errors:
+            return self.bulk_error_response(errors, len(items))
+
+        try:
+            objs = self.perform_bulk_create(objs)
+        except IntegrityError:
+            errors = self.find_integrity_errors(
+                objs, lambda obj: self.model.objects.bulk_create([obj])
+            )
+            if not errors:
+                raise
+            return self.bulk_error_response(errors, len(items))
+        return self.return_instances(objs)
+
+    def perform_bulk_create(self, objs: list[Model]) -> list[Model]:
+        with self.atomic():
+            objs = self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.invalidate_object_cache()
+        return objs
+
+
+class BulkUpdateView(BulkMixin, View):
+    """Full update of many objects, each item carries its primary key."""
+
+    # Item key holding the primary key, defaults to the pk field name
+    pk_key: str | None = None
+
+    def get_pk_key(self) -> str:
+        return self.pk_key or self.model._meta.pk.name
+
+    def put(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        pk_key, pk_field = self.get_pk_key(), self.model._meta.pk
+        pks, data, errors = [], [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict) or pk_key not in item:
+                    raise BodyParameterMissing({"param": pk_key})
+                item = dict(item)
+                pks.append(pk_field.to_python(item.pop(pk_key)))
+                data.append(self.validate_item(item))
+            except (ValidationError, DjangoValidationError, CustomException) as e:
+                errors.append(self.item_error(index, e))
+        if errors:
+            return self.bulk_error_response(errors, len(items))
+
+        with self.atomic():
+            instances = self.get_queryset().select_for_update().in_bulk(pks)
+            for index, pk in enumerate(pks):
+                if pk not in instances:
+                    errors.append(
+                        self.item_error(
+                            index, self.model.DoesNotExist(f"pk={pk} does not exist")
+                        )
+                    )
+            if errors:
+                return self.bulk_error_response(errors, len(items))
+
+            changes = [(instances[pk], values) for pk, values in zip(pks, data)]
+            try:
+                with self.atomic():
+                    objs = self.perform_bulk_update(changes)
+            except IntegrityError:
+                errors = self.find_integrity_errors(
+                    changes, lambda change: self.perform_bulk_update([change])
+                )
+                if not errors:
+                    raise
+                return self.bulk_error_response(errors, len(items))
+        self.invalidate_object_cache()
+        return self.return_instances(objs)
+
+    def perform_bulk_update(
+        self, changes: list[tuple[Model, dict[str, typing.Any]]]
+    ) -> list[Model]:
+        # `bulk_update` skips `pre_save`, so `auto_now` fields are set here
+        auto_now = get_auto_now_fields(self.model)
+        fields = {field.name for field in auto_now}
+        objs = []
+        for instance, values in changes:
+            for k, v in values.items():
+                setattr(instance, k, v)
+            for field in auto_now:
+                field.pre_save(instance, add=False)
+            fields.update(values)
+            objs.append(instance)
+        if objs and fields:
+            self.model.objects.bulk_update(
+                objs, sorted(fields), batch_size=self.batch_size
+            )
+        return objs
+
+
+class BulkDeleteView(BulkMixin, View):
+    """Delete the objects whose primary keys are given as a JSON array."""
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        pk_field = self.model._meta.pk
+        pks, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                pks.append(pk_field.to_python(item))
+            except DjangoValidationError as e:
+                errors.append(self.item_error(index, BodyInvalid({"msg": str(e)})))
+        if errors:
+            return self.bulk_error_response(errors, len(items))
+
+        with self.atomic():
+            existing = set(
+                self.get_queryset()
+                .select_for_update()
+                .filter(pk__in=pks)
+                .values_list("pk", flat=True)
+            )
+            for index, pk in enumerate(pks):
+                if pk not in existing:
+                    errors.append(
+                        self.item_error(
+                            index, self.model.DoesNotExist(f"pk={pk} does not exist")
+                        )
+                    )
+            if errors:
+                return self.bulk_error_response(errors, len(items))
+            self.perform_bulk_delete(pks)
+        self.invalidate_object_cache()
+        return Response(data=pks)
+
+    def perform_bulk_delete(self, pks: list[typing.Any]) -> None:
+        for start in range(0, len(pks), self.batch_size):
+            self.get_queryset().filter(
+                pk__in=pks[start : start + self.batch_size]
+            ).delete()
+
+
+class ParseFileMixin:
+    parsers: list[typing.Type[BaseFileParser]] = [StreamFileParser]
+
+    def get_parser(self) -> BaseFileParser:
+        """The first of `parsers` accepting the request."""
+        parsers = [parser_class(self.request) for parser_class in self.parsers]
+        for parser in parsers:
+            if parser.accepts():
+                return parser
+        raise BodyParameterMissing(
+            {"param": " or ".join(parser.field_name for parser in parsers)}
+        )
+
+
+class ImportView(ParseFileMixin, BulkMixin, View):
+    """Create objects from an uploaded or remote CSV / NDJSON file.
+
+    Rows are decoded, validated and written `batch_size` at a time, one
+    `bulk_create` per batch, so memory does not grow with the file. Invalid
+    rows are skipped and reported by line number, up to `max_errors` of them.
+    With `all_or_nothing`, any invalid row rolls the whole import back.
+    """
+
+    # Add `OssFileParser` to import from URLs of its `allowed_hosts`
+    parsers = [StreamFileParser]
+    importers: dict[str, typing.Type[BaseImporter]] = IMPORTERS
+    # Taken from the file extension when not given
+    format_kwarg: str = "format"
+    max_errors: int = 1000
+    all_or_nothing: bool = False
+    # Upsert rows conflicting on `unique_fields`, `update_fields` defaults to
+    # every imported field
+    update_conflicts: bool = False
+    unique_fields: list[str] | None = None
+    update_fields: list[str] | None = None
+    # Import with a `base.jobs` worker and answer 202 with the job, the file
+    # is kept in `UPLOAD_ROOT` meanwhile, which workers must share
+    run_in_background: bool = False
+    spool_uploader_class: typing.Type[LocalFileUploader] = LocalFileUploader
+
+    def setup(self, request: HttpRequest, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.check_update_conflicts()
+
+    def check_update_conflicts(self) -> None:
+        if not self.update_conflicts:
+            return
+        if not self.unique_fields:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}.update_conflicts needs unique_fields"
+            )
+        names = {field.name for field in self.model._meta.concrete_fields}
+        unknown = set(self.unique_fields).union(self.update_fields or ()) - names
+        if unknown:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} has unknown upsert fields "
+                f"{', '.join(sorted(unknown))}"
+            )
+
+    @cached_property
+    def batch_adapter(self) -> TypeAdapter:
+        return TypeAdapter(list[self.pydantic_model])
+
+    def get_import_format(self, parser: BaseFileParser) -> str:
+        import_format = self.request.GET.get(self.format_kwarg)
+        if import_format is None:
+            extension = PurePosixPath(parser.filename or "").suffix[1:].lower()
+            import_format = next(
+                (
+                    name
+                    for name, importer in self.importers.items()
+                    if extension in importer.extensions
+                ),
+                None,
+            )
+        if import_format not in self.importers:
+            raise QueryParameterInvalid(
+                {
+                    "param": self.format_kwarg,
+                    "msg": f"must be one of {', '.join(self.importers)}",
+                }
+            )
+        return import_format
+
+    def row_error(self, line: int, exception: Exception) -> dict[str, typing.Any]:
+        msg, code = JsonMiddleware.dispatch_exception(exception)
+        return {"line": line, "msg": msg, "code": code}
+
+    def validate_batch(self, rows: list[typing.Any]) -> list[typing.Any]:
+        """Validated rows, or the exception of each invalid one."""
+        if self.pydantic_model is not None:
+            try:
+                return [
+                    item.model_dump()
+                    for item in self.batch_adapter.validate_python(rows)
+                ]
+            except ValidationError:
+                # Validate one by one to tell the invalid rows apart
+                pass
+        results = []
+        for row in rows:
+            try:
+                results.append(self.validate_item(row))
+            except (ValidationError, CustomException, TypeError) as e:
+                results.append(e)
+        return results
+
+    def perform_import(self, objs: list[Model], fields: typing.Iterable[str]) -> None:
+        kwargs = {}
+        if self.update_conflicts:
+            update_fields = self.update_fields or [
+                *(name for name in fields if name not in self.unique_fields),
+                *(field.name for field in get_auto_now_fields(self.model)),
+            ]
+            kwargs = {
+                "update_conflicts": True,
+                "unique_fields": self.unique_fields,
+                "update_fields": list(dict.fromkeys(update_fields)),
+            }
+        self.model._default_manager.bulk_create(
+            objs, batch_size=self.batch_size, **kwargs
+        )
+
+    def import_batch(
+        self, summary: dict[str, typing.Any], lines: list[int], rows: list[typing.Any]
+    ) -> None:
+        objs, fields = [], {}
+        for line, result in zip(lines, self.validate_batch(rows)):
+            if isinstance(result, Exception):
+                self.add_error(summary, line, result)
+                continue
+            try:
+                objs.append(self.model(**result))
+            except TypeError as e:
+                self.add_error(summary, line, e)
+                continue
+            fields.update(dict.fromkeys(result))
+        if objs and not (self.all_or_nothing and summary["failed"]):
+            self.perform_import(objs, fields)
+            summary["imported"] += len(objs)
+
+    def add_error(
+        self, summary: dict[str, typing.Any], line: int, exception: Exception
+    ) -> None:
+        summary["failed"] += 1
+        if len(summary["errors"]) < self.max_errors:
+            summary["errors"].append(self.row_error(line, exception))
+
+    def run_import(
+        self, importer: BaseImporter, chunks: typing.Iterable[bytes]
+    ) -> dict[str, typing.Any]:
+        summary = {"total": 0, "imported": 0, "failed": 0, "errors": []}
+        lines, rows = [], []
+        with self.atomic() if self.all_or_nothing else contextlib.nullcontext():
+            try:
+                for line, record in importer.records(chunks):
+                    summary["total"] += 1
+                    try:
+                        rows.append(importer.decode(record))
+                    except CustomException as e:
+                        self.add_error(summary, line, e)
+                        continue
+                    lines.append(line)
+                    if len(rows) >= self.batch_size:
+                        self.import_batch(summary, lines, rows)
+                        lines, rows = [], []
+                if rows:
+                    self.import_batch(summary, lines, rows)
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise BodyInvalid({"msg": e}) from e
+            if self.all_or_nothing and summary["failed"]:
+                transaction.set_rollback(True, using=router.db_for_write(self.model))
+                summary["imported"] = 0
+        if summary["imported"]:
+            self.invalidate_object_cache()
+        return summary
+
+    def import_response(self, summary: dict[str, typing.Any]) -> Response:
+        if summary["failed"]:
+            return Response(
+                data=summary,
+                msg=BULK_ITEMS_INVALID.render(
+                    {"count": summary["failed"], "total": summary["total"]}
+                ),
+                code=BULK_ITEMS_INVALID.code,
+            )
+        return Response(data=summary)
+
+    def start_in_background(
+        self, import_format: str, chunks: typing.Iterable[bytes]
+    ) -> Response:
+        # The request's upload is gone once the response is sent, workers
+        # read it from the object store instead
+        key = uuid.uuid4().hex
+        with self.spool_uploader_class().open(key) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.commit(key)
+        job = enqueue(
+            "base.import_file",
+            {
+                "view": get_view_path(self),
+                "format": import_format,
+                "key": key,
+                "user_id": self.request.user.pk,
+            },
+            user=self.request.user,
+        )
+        return Response(data=job.status_data(), status=202)
 
     def post(self, request, *args, **kwargs):
-        raise NotImplementedError()
+        parser = self.get_parser()
+        import_format = self.get_import_format(parser)
+        if self.run_in_background:
+            return self.start_in_background(import_format, parser.parse())
+        return self.import_response(
+            self.run_import(self.importers[import_format](), parser.parse())
+        )
+
+
+class EnqueueJobView(View):
+    """Enqueue `task_name` with the request body as params, answered with 202
+    and the job to poll with `JobStatusView`."""
+
+    task_name: str
+    pydantic_model: typing.Type[BaseModel] | None = None
+    max_attempts: int = 1
+
+    def get_params(self, request: HttpRequest) -> dict[str, typing.Any]:
+        if self.pydantic_model is not None:
+            return validate_request_data(request, self.pydantic_model).model_dump(
+                mode="json"
+            )
+        params = get_request_data(request)
+        if not isinstance(params, dict):
+            raise BodyInvalid({"msg": "expected a JSON object"})
+        return params
+
+    def post(self, request, *args, **kwargs):
+        job = enqueue(
+            self.task_name, self.get_params(request), self.max_attempts, request.user
+        )
+        return Response(data=job.status_data(), status=202)
+
+
+class JobMixin:
+    def get_job(self) -> Job:
+        # Jobs of other users are not found, as unknown ids
+        user = self.request.user
+        return Job.objects.get(
+            pk=self.kwargs["pk"], user=user if user.is_authenticated else None
+        )
+
+
+class JobStatusView(JobMixin, View):
+    def get(self, request, *args, **kwargs):
+        return Response(data=self.get_job().status_data())
+
+
+class JobResultView(JobStatusView):
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        if job.status == Job.Status.DONE:
+            return Response(data=job.result)
+        if job.status == Job.Status.FAILED:
+            return Response(data=None, msg=job.error["msg"], code=job.error["code"])
+        return Response(
+            data=job.status_data(),
+            msg=JOB_NOT_FINISHED.render({"id": job.pk, "status": job.status}),
+            code=JOB_NOT_FINISHED.code,
+        )
+
+
+class MetricsView(View):
+    """Prometheus exposition of `registry`, mount it where scrapers reach it
+    but clients do not.
+
+    Requests must send `Authorization: Bearer <METRICS_TOKEN>`, without a
+    token configured the metrics are only served with `DEBUG`.
+    """
+
+    registry: MetricsRegistry = REGISTRY
+
+    def check_token(self, request: HttpRequest) -> None:
+        token = settings.DJANGO_REST.get("METRICS_TOKEN")
+        if token is None:
+            if not settings.DEBUG:
+                raise PermissionDenied("METRICS_TOKEN is not configured")
+            return
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(sent.encode(), token.encode()):
+            raise PermissionDenied("Invalid metrics token")
+
+    def get(self, request, *args, **kwargs):
+        self.check_token(request)
+        return HttpResponse(self.registry.render(), content_type=CONTENT_TYPE)
+
+
+class UploadView(ParseFileMixin, View):
+    """Stream an upload into `uploader_class`, stored under its content hash.
+
+    Chunks of the first parser accepting the request are hashed and counted
+    as they are written, so the body is never held in memory as a whole.
+    Identical uploads are stored once.
+    """
+
+    uploader_class: typing.Type[Uploader] = LocalFileUploader
+    # None for no limit
+    max_upload_size: int | None = settings.DJANGO_REST.get("UPLOAD_MAX_SIZE")
+    hash_algorithm: str = "sha256"
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        if self.max_upload_size is not None:
+            # Must run before the body is parsed, i.e. `request.FILES` is read
+            request.upload_handlers.insert(
+                0, MaxSizeUploadHandler(self.max_upload_size, request)
+            )
+
+    @cached_property
+    def uploader(self) -> Uploader:
+        return self.uploader_class()
+
+    def get_upload_resource(self) -> typing.Iterable[bytes]:
+        return self.get_parser().parse()
+
+    def perform_upload(self, chunks: typing.Iterable[bytes]) -> StoredObject:
+        return self.uploader.store(chunks, self.hash_algorithm, self.max_upload_size)
+
+    def post(self, request, *args, **kwargs):
+        stored = self.perform_upload(self.get_upload_resource())
+        return Response(data=stored._asdict())
 
 
 class DownloadView(View):
-    # TODO: load content from database or somewhere
-    loaders: list = []
+    """Serve a file of the first loader that has it, with `Range` support.
+
+    Local files are handed to the server's `wsgi.file_wrapper`, which can
+    `sendfile` them, or to the web server itself with `offload`. Other files
+    are streamed in `chunk_size` pieces, none are read into memory whole.
+    """
+
+    loaders: list[typing.Type[BaseFileLoader]] = [LocalFileLoader]
+    key_kwarg: str = "key"
+    content_type: str = "application/octet-stream"
+    as_attachment: bool = True
+    # "x-accel-redirect" (nginx) or "x-sendfile" (Apache, lighttpd) to let the
+    # web server send local files, ranges are then handled there as well
+    offload: str | None = settings.DJANGO_REST.get("DOWNLOAD_OFFLOAD")
+    # nginx `internal` location serving `UPLOAD_ROOT`
+    accel_prefix: str = settings.DJANGO_REST.get("DOWNLOAD_ACCEL_PREFIX", "/protected/")
+
+    def get_key(self) -> str:
+        key = self.kwargs.get(self.key_kwarg)
+        if key is None:
+            raise PathParameterMissing({"param": self.key_kwarg})
+        return key
 
-    def get_download_resource(self):
-        # Get content from self.loaders
-        raise NotImplementedError()
+    def get_filename(self, key: str) -> str:
+        return key
 
-    def perform_download(self):
-        # Serialize content to bytes-like object
-        raise NotImplementedError()
+    def get_download_resource(self) -> tuple[BaseFileLoader, str, FileStat]:
+        key = self.get_key()
+        for loader_class in self.loaders:
+            loader = loader_class()
+            try:
+                return loader, key, loader.stat(key)
+            except FileNotFoundError:
+                continue
+        raise Http404(_("No file found matching the query"))
+
+    def if_range_matches(self, stat: FileStat) -> bool:
+        validator = self.request.META.get("HTTP_IF_RANGE")
+        if validator is None:
+            return True
+        if validator.startswith(('"', "W/")):
+            # Only strong validators match
+            return stat.etag is not None and validator == quote_etag(stat.etag)
+        return parse_http_date_safe(validator) == int(stat.mtime)
+
+    def get_range(self, stat: FileStat) -> range | None:
+        """Requested bytes, None for the whole file, empty if unsatisfiable.
+
+        Only single ranges are supported, others get the whole file.
+        """
+        header = self.request.META.get("HTTP_RANGE")
+        if not header or not self.if_range_matches(stat):
+            return None
+        units, _, spec = header.partition("=")
+        first, sep, last = spec.strip().partition("-")
+        if units.strip().lower() != "bytes" or not sep or "," in spec:
+            return None
+        try:
+            if not first:
+                return range(max(0, stat.size - int(last)), stat.size)
+            start = int(first)
+            stop = int(last) + 1 if last else stat.size
+        except ValueError:
+            return None
+        if start < 0 or (last and stop <= start):
+            return None
+        # Empty when `start` is past the end
+        return range(min(start, stat.size), min(stop, stat.size))
+
+    def offload_response(self, path: Path) -> HttpResponse:
+        response = HttpResponse(content_type=self.content_type)
+        if self.offload == "x-accel-redirect":
+            relative = path.relative_to(settings.DJANGO_REST["UPLOAD_ROOT"])
+            response["X-Accel-Redirect"] = (
+                f"{self.accel_prefix.rstrip('/')}/{relative.as_posix()}"
+            )
+        elif self.offload == "x-sendfile":
+            response["X-Sendfile"] = str(path)
+        else:
+            raise ValueError(f"Unknown download offload {self.offload!r}")
+        return response
+
+    def stream_response(
+        self, loader: BaseFileLoader, key: str, byte_range: range
+    ) -> HttpResponse:
+        path = loader.local_path(key)
+        if path is None:
+            return StreamingHttpResponse(
+                loader.iter_chunks(key, byte_range.start, byte_range.stop),
+                content_type=self.content_type,
+            )
+        file = path.open("rb")
+        file.seek(byte_range.start)
+        response = FileResponse(
+            FileSlice(file, len(byte_range)), content_type=self.content_type
+        )
+        response.block_size = loader.chunk_size
+        return response
+
+    def perform_download(
+        self, loader: BaseFileLoader, key: str, stat: FileStat
+    ) -> HttpResponse:
+        etag = quote_etag(stat.etag) if stat.etag is not None else None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=int(stat.mtime)
+        )
+        if response is not None:
+            return response
+
+        path = loader.local_path(key)
+        if self.offload and path is not None:
+            response = self.offload_response(path)
+        else:
+            byte_range = self.get_range(stat)
+            if byte_range is not None and not byte_range:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.size}"
+                return response
+            if byte_range is None:
+                byte_range = range(stat.size)
+            response = self.stream_response(loader, key, byte_range)
+            if len(byte_range) != stat.size:
+                response.status_code = 206
+                response["Content-Range"] = (
+                    f"bytes {byte_range.start}-{byte_range.stop - 1}/{stat.size}"
+                )
+            response["Content-Length"] = len(byte_range)
+            response["Accept-Ranges"] = "bytes"
+
+        if etag is not None:
+            response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.mtime)
+        response["Content-Disposition"] = content_disposition_header(
+            self.as_attachment, self.get_filename(key)
+        )
+        return response
 
     def get(self, request, *args, **kwargs):
-        raise NotImplementedError()
+        return self.perform_download(*self.get_download_resource())
+
+
+class JobDownloadView(JobMixin, DownloadView):
+    """Serve the file of a finished `base.export_list` job to its owner."""
+
+    def get_download_resource(self) -> tuple[BaseFileLoader, str, FileStat]:
+        result = self.get_job().result
+        if not isinstance(result, dict) or "key" not in result:
+            raise Http404(_("No file found matching the query"))
+        self.filename = result["filename"]
+        self.content_type = result["content_type"]
+        loader = LocalFileLoader(LocalFileUploader(settings.DJANGO_REST["EXPORT_ROOT"]))
+        try:
+            return loader, result["key"], loader.stat(result["key"])
+        except FileNotFoundError:
+            raise Http404(_("No file found matching the query"))
+
+    def get_filename(self, key: str) -> str:
+        return self.filename
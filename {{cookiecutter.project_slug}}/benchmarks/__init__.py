@@ -0,0 +1,10 @@
+import os
+
+
+def setup_django():
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "{{cookiecutter.project_slug}}.settings"
+    )
+    import django
+
+    django.setup()
@@ -0,0 +1,75 @@
+"""Microbenchmark of response encoding.
+
+Compares `base.response.PaginatedResponse` with the previous path, which built
+`PaginatedResponseStructure` and `ResponseStructure`, dumped both to dicts and
+re-encoded the result with `JsonResponse`.
+
+    python -m benchmarks.response_encoding --rows 100 --number 200
+"""
+
+import argparse
+import datetime
+import decimal
+import timeit
+import uuid
+
+from benchmarks import setup_django
+
+
+def make_rows(n: int) -> list[dict]:
+    now = datetime.datetime.now()
+    return [
+        {
+            "id": i,
+            "create_at": now,
+            "update_at": now,
+            "user_id": f"{i:08d}",
+            "username": f"user-{i}",
+            "email": f"user-{i}@example.com",
+            "balance": decimal.Decimal("1024.50"),
+            "token": uuid.uuid4(),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_response(rows: list[dict]):
+    from django.http.response import JsonResponse
+
+    from base.response import PaginatedResponseStructure, ResponseStructure
+
+    paginated = PaginatedResponseStructure(paginated_list=rows, count=len(rows))
+    r = ResponseStructure(data=paginated.model_dump(by_alias=True), msg=None, code=0)
+    return JsonResponse(r.model_dump(by_alias=True))
+
+
+def fast_response(rows: list[dict]):
+    from base.response import PaginatedResponse
+
+    return PaginatedResponse(data=rows, count=len(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from base import encoders
+
+    rows = make_rows(args.rows)
+    print(f"encoder: {'orjson' if encoders.orjson is not None else 'pydantic-core'}")
+    results = {}
+    for name, func in [("legacy", legacy_response), ("fast", fast_response)]:
+        timings = timeit.repeat(
+            lambda: func(rows), number=args.number, repeat=args.repeat
+        )
+        results[name] = min(timings) / args.number
+        print(f"{name:>8}: {results[name] * 1e6:10.1f} us/response")
+    print(f"speedup: {results['legacy'] / results['fast']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Throughput and latency of the example CRUD views through the full stack.
+
+Runs every request through the Django test client, so URL resolution and all
+of `MIDDLEWARE` are included, against a throwaway test database seeded with
+`--rows` users. Results are printed and, with `--output`, written as JSON.
+Comparing them with a `--baseline` file fails when a scenario's p50 regressed
+by more than `--max-regression`.
+
+    python -m benchmarks.views --rows 10000 --requests 500 --output bench.json
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import platform
+import sys
+import time
+import typing
+
+from benchmarks import setup_django
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "rps": round(len(values) / elapsed, 1),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+class ViewBenchmark:
+    """Scenarios over the `example_app` URLs, one request per call."""
+
+    def __init__(self, rows: int, page_size: int = 20):
+        from django.test import Client
+
+        self.client = Client()
+        self.rows = rows
+        self.page_size = page_size
+        self.counter = itertools.count()
+
+    def seed(self) -> None:
+        from example_app.models import User
+
+        User.objects.bulk_create(
+            [self.make_user(f"s{i:07d}") for i in range(self.rows)],
+            batch_size=1000,
+        )
+        self.pks = list(User.objects.values_list("pk", flat=True))
+        self.pk_cycle = itertools.cycle(self.pks)
+
+    @staticmethod
+    def make_user(user_id: str):
+        from example_app.models import User
+
+        return User(
+            user_id=user_id,
+            username=f"user-{user_id}",
+            email=f"{user_id}@example.com",
+            password="password",
+        )
+
+    def user_payload(self, prefix: str) -> bytes:
+        user_id = f"{prefix}{next(self.counter):07d}"
+        return json.dumps(
+            {
+                "user_id": user_id,
+                "username": f"user-{user_id}",
+                "email": f"{user_id}@example.com",
+                "password": "password",
+            }
+        ).encode()
+
+    def check(self, response, error: bool = False) -> None:
+        """Raise unless the envelope's code is a success, or with `error` a
+        failure."""
+        from django.conf import settings
+
+        from base.status_codes import SUCCESS
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Unexpected status {response.status_code}")
+        # Errors are rendered by `JsonMiddleware` with HTTP 200
+        code = json.loads(response.content)[settings.DJANGO_REST["RESPONSE_CODE_FIELD"]]
+        if (code != SUCCESS.code) != error:
+            raise RuntimeError(f"Unexpected code {code}: {response.content[:200]!r}")
+
+    def list(self):
+        page = next(self.counter) % max(1, self.rows // self.page_size) + 1
+        self.check(self.client.get(f"/example/list?size={self.page_size}&page={page}"))
+
+    def detail(self):
+        self.check(self.client.get(f"/example/detail/{next(self.pk_cycle)}"))
+
+    def create(self):
+        self.check(
+            self.client.post(
+                "/example/create",
+                self.user_payload("c"),
+                content_type="application/json",
+            )
+        )
+
+    def update(self):
+        self.check(
+            self.client.put(
+                f"/example/update/{next(self.pk_cycle)}",
+                self.user_payload("u"),
+                content_type="application/json",
+            )
+        )
+
+    def delete(self):
+        self.check(self.client.delete(f"/example/delete/{self.delete_pks.pop()}"))
+
+    def error(self):
+        self.check(self.client.get("/example/error"), error=True)
+
+    def prepare_delete(self, n: int) -> None:
+        from example_app.models import User
+
+        objs = User.objects.bulk_create(
+            [self.make_user(f"d{next(self.counter):07d}") for _ in range(n)]
+        )
+        self.delete_pks = [obj.pk for obj in objs]
+
+    def run(self, name: str, requests: int, warmup: int) -> dict[str, typing.Any]:
+        func = getattr(self, name)
+        if name == "delete":
+            self.prepare_delete(requests + warmup)
+        for _ in range(warmup):
+            func()
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(requests):
+            t = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - t)
+        return summarize(latencies, time.perf_counter() - start)
+
+
+SCENARIOS = ["list", "detail", "create", "update", "delete", "error"]
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"]
+        print(f"{name:>8}: p50 {ratio:.2f}x of baseline")
+        if ratio > 1 + max_regression:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument(
+        "--with-logging",
+        action="store_true",
+        help="keep logging enabled, the error path logs a traceback per request",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    if not args.with_logging:
+        logging.disable(logging.CRITICAL)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        benchmark = ViewBenchmark(args.rows)
+        benchmark.seed()
+        scenarios = {}
+        for name in args.scenarios:
+            scenarios[name] = benchmark.run(name, args.requests, args.warmup)
+            result = scenarios[name]
+            print(
+                f"{name:>8}: {result['rps']:9.1f} req/s"
+                f"  p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    results = {
+        "meta": {
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "rows": args.rows,
+            "requests": args.requests,
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"p50 regressed over {args.max_regression:.0%}: {regressions}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="User",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("create_at", models.DateTimeField(auto_now_add=True)),
+                ("update_at", models.DateTimeField(auto_now=True)),
+                ("user_id", models.CharField(max_length=8, unique=True)),
+                ("username", models.CharField(max_length=255)),
+                ("email", models.CharField(max_length=255)),
+                ("password", models.CharField(max_length=255)),
+            ],
+            options={
+                "db_table": "t_user",
+                "indexes": [
+                    models.Index(
+                        fields=["create_at", "id"], name="t_user_create__d5e101_idx"
+                    ),
+                    models.Index(
+                        fields=["update_at"], name="t_user_update__9daa2b_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -1 +1,913 @@
-# Create your tests here.
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+import typing
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+
+from base.cache import ResponseCache, bump_model_version
+from base.exceptions import BodyInvalid, RemoteFetchFailed, UploadTooLarge
+from base.file_handler.fakes import FakeHTTPServer, FakeS3Client
+from base.file_handler.loader import AWSUploader, LocalFileLoader, LocalFileUploader
+from base.file_handler.parser import OssFileParser
+from base.instrumentation import QueryBudgetExceeded, assert_max_queries, query_budget
+from base.jobs import TASKS, Worker, claim, enqueue, run_job, task
+from base.models import Job
+from base.pagination import CachedCount, NoCount
+from base.status_codes import (
+    BULK_ITEMS_INVALID,
+    CONSTRAINT_VIOLATED,
+    JOB_NOT_FINISHED,
+    OBJECT_NOT_FOUND,
+    PYDANTIC_VALIDATION_ERROR,
+    QUERY_PARAM_INVALID,
+    SUCCESS,
+    UNCAUGHT_EXCEPTION,
+)
+
+from .models import User
+from .views import (
+    ExampleAsyncListItems,
+    ExampleDetailItem,
+    ExampleImportItems,
+    ExampleListItems,
+)
+
+
+class TrackingS3Client(FakeS3Client):
+    """Records the most parts uploaded at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._count_lock = threading.Lock()
+
+    def upload_part(self, **kwargs) -> dict:
+        with self._count_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self.gate.wait(5)
+            return super().upload_part(**kwargs)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+
+
+class AWSUploaderTests(SimpleTestCase):
+    def setUp(self):
+        self.client = TrackingS3Client()
+        self.client.min_part_size = 4
+        self.uploader = AWSUploader("bucket", self.client)
+        self.uploader.part_size = 4
+        self.uploader.max_workers = 2
+        self.uploader.retry_backoff = 0
+
+    def chunks(self, n: int = 10) -> list[bytes]:
+        return [f"{i:03d}".encode() for i in range(n)]
+
+    def test_store_under_content_hash(self):
+        stored = self.uploader.store(self.chunks())
+        self.assertTrue(stored.created)
+        self.assertEqual(stored.size, 30)
+        self.assertEqual(
+            self.client.objects[("bucket", stored.key)], b"".join(self.chunks())
+        )
+        # Only the final object is left, the staging one is deleted
+        self.assertEqual(list(self.client.objects), [("bucket", stored.key)])
+        self.assertEqual(self.client.uploads, {})
+
+    def test_identical_content_is_stored_once(self):
+        first = self.uploader.store(self.chunks())
+        second = self.uploader.store(self.chunks())
+        self.assertEqual(first.key, second.key)
+        self.assertFalse(second.created)
+        self.assertEqual(self.client.uploads, {})
+
+    def test_failed_parts_are_retried(self):
+        self.client.fail_uploads = 2
+        stored = self.uploader.store(self.chunks())
+        self.assertEqual(
+            self.client.objects[("bucket", stored.key)], b"".join(self.chunks())
+        )
+
+    def test_upload_is_aborted_when_retries_are_exhausted(self):
+        self.client.fail_uploads = 100
+        with self.assertRaises(Exception):
+            self.uploader.store(self.chunks())
+        self.assertEqual(self.client.objects, {})
+        self.assertEqual(self.client.uploads, {})
+        self.assertIn("abort_multipart_upload", self.client.calls)
+
+    def test_upload_is_aborted_past_max_size(self):
+        with self.assertRaises(UploadTooLarge):
+            self.uploader.store(self.chunks(), max_size=10)
+        self.assertEqual(self.client.objects, {})
+        self.assertEqual(self.client.uploads, {})
+
+    def test_write_blocks_while_max_workers_parts_are_in_flight(self):
+        self.client.gate.clear()
+        with self.uploader.open() as writer:
+            thread = threading.Thread(target=writer.write, args=(b"x" * 400,))
+            thread.start()
+            thread.join(0.2)
+            # Writing stalls instead of buffering the remaining parts
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(len(writer.parts), self.uploader.max_workers)
+            self.client.gate.set()
+            thread.join()
+            writer.commit("written")
+        self.assertEqual(len(writer.parts), 100)
+        self.assertEqual(self.client.max_in_flight, self.uploader.max_workers)
+
+    def test_load_with_upload_returns_url(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = LocalFileUploader(root)
+            key = store.store([b"local content"]).key
+            loader = LocalFileLoader(store, upload_to=self.uploader)
+            url = loader.load(key, upload=True)
+        self.assertIn(f"/bucket/{key}", str(url))
+        self.assertEqual(self.client.objects[("bucket", key)], b"local content")
+
+
+class RangedFileParser(OssFileParser):
+    allowed_hosts = ["127.0.0.1"]
+    parallel_threshold = 1024
+    part_size = 256
+    max_workers = 4
+
+
+class OssFileParserTests(SimpleTestCase):
+    data = os.urandom(10 * 256 + 17)
+
+    def fetch(self, server: FakeHTTPServer, parser_class=RangedFileParser) -> bytes:
+        request = RequestFactory().post("/", {"url": server.url("/file.bin")})
+        return b"".join(parser_class(request).parse())
+
+    def ranges(self, server: FakeHTTPServer) -> list[str]:
+        return [range_ for _, _, range_ in server.requests if range_]
+
+    def test_large_objects_are_fetched_in_parts(self):
+        with FakeHTTPServer({"/file.bin": self.data}) as server:
+            self.assertEqual(self.fetch(server), self.data)
+        self.assertEqual(len(self.ranges(server)), 11)
+
+    def test_rejected_head_falls_back_to_get(self):
+        with FakeHTTPServer({"/file.bin": self.data}, allow_head=False) as server:
+            self.assertEqual(self.fetch(server), self.data)
+        self.assertEqual([method for method, *_ in server.requests], ["HEAD", "GET"])
+
+    def test_servers_without_ranges_are_streamed(self):
+        with FakeHTTPServer({"/file.bin": self.data}, accept_ranges=False) as server:
+            self.assertEqual(self.fetch(server), self.data)
+        self.assertEqual(self.ranges(server), [])
+
+    def test_object_changed_while_fetching_fails(self):
+        with FakeHTTPServer({"/file.bin": self.data}) as server:
+
+            class ChangingFileParser(RangedFileParser):
+                def fetch_part(self, start: int, stop: int) -> bytes:
+                    if start >= 5 * self.part_size:
+                        server.objects["/file.bin"] = (
+                            b"changed" + OssFileParserTests.data
+                        )
+                    return super().fetch_part(start, stop)
+
+            with self.assertRaises(RemoteFetchFailed):
+                self.fetch(server, ChangingFileParser)
+
+    def test_hosts_not_allowed_are_not_fetched(self):
+        with FakeHTTPServer({"/file.bin": self.data}) as server:
+            with self.assertRaises(BodyInvalid):
+                self.fetch(server, OssFileParser)
+        self.assertEqual(server.requests, [])
+
+
+class ExampleAPITestCase(TestCase):
+    """Requests to the example views through the test client."""
+
+    def setUp(self):
+        # Model versions and cached responses live in the default cache, the
+        # bump also clears the in-process tiers of `ObjectCache`
+        cache.clear()
+        bump_model_version(User)
+
+    def seed(self, n: int, **fields) -> list[User]:
+        return User.objects.bulk_create(
+            User(
+                user_id=f"u{i}",
+                username=f"name{i}",
+                email=f"name{i}@example.com",
+                password="secret",
+                **fields,
+            )
+            for i in range(n)
+        )
+
+    def json(self, response) -> dict:
+        if response.streaming:
+            return json.loads(b"".join(response.streaming_content))
+        return json.loads(response.content)
+
+    def send(self, method: str, path: str, data: typing.Any) -> dict:
+        response = getattr(self.client, method)(
+            path, json.dumps(data), content_type="application/json"
+        )
+        return self.json(response)
+
+    def get_data(self, path: str, **kwargs) -> dict:
+        body = self.json(self.client.get(path, **kwargs))
+        self.assertEqual(body["code"], SUCCESS.code, body)
+        return body["data"]
+
+
+class PaginationTests(ExampleAPITestCase):
+    def test_pages_are_sliced_in_the_database(self):
+        users = self.seed(25)
+        for i, user in enumerate(users):
+            User.objects.filter(pk=user.pk).update(
+                create_at=datetime.datetime(2024, 1, 1, second=i)
+            )
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get_data("/example/list?page=3&size=10")
+        self.assertEqual(data["count"], 25)
+        # Newest first, the last page holds the 5 oldest
+        self.assertEqual(
+            [row["id"] for row in data["list"]],
+            [user.pk for user in reversed(users[:5])],
+        )
+        self.assertIn("OFFSET 20", queries[-1]["sql"])
+
+    def test_size_is_capped(self):
+        self.seed(5)
+        with mock.patch.object(ExampleListItems, "max_size", 2):
+            data = self.get_data("/example/list?size=50")
+        self.assertEqual(len(data["list"]), 2)
+
+    def test_invalid_page_and_size_are_rejected(self):
+        self.seed(5)
+        for query in ["page=9", "page=x", "size=0", "size=x"]:
+            body = self.json(self.client.get(f"/example/list?{query}"))
+            self.assertEqual(body["code"], QUERY_PARAM_INVALID.code, query)
+
+    @mock.patch.object(ExampleListItems, "pagination_mode", "cursor")
+    def test_cursor_pages_do_not_skip_or_repeat_ties(self):
+        users = self.seed(7)
+        # Same ordering value for every row, only the pk tells them apart
+        User.objects.update(create_at=users[0].create_at)
+        seen, cursor, pages = [], "", 0
+        while True:
+            data = self.get_data(f"/example/list?size=3&cursor={cursor}")
+            self.assertNotIn("count", data)
+            seen += [row["id"] for row in data["list"]]
+            pages += 1
+            if "next" not in data:
+                break
+            cursor = data["next"]
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, sorted((user.pk for user in users), reverse=True))
+
+    @mock.patch.object(ExampleListItems, "pagination_mode", "cursor")
+    def test_malformed_cursor_is_rejected(self):
+        self.seed(2)
+        for cursor in ["!!", "WzFd"]:
+            body = self.json(self.client.get(f"/example/list?cursor={cursor}"))
+            self.assertEqual(body["code"], QUERY_PARAM_INVALID.code, cursor)
+
+
+class CountStrategyTests(ExampleAPITestCase):
+    def test_exact_count_comes_with_the_validators(self):
+        self.seed(5)
+        # The aggregate of the conditional GET validators, then the page
+        with self.assertNumQueries(2):
+            data = self.get_data("/example/list?size=2")
+        self.assertEqual(data["count"], 5)
+
+    @mock.patch.object(ExampleListItems, "count_strategy", CachedCount())
+    def test_cached_count_is_refreshed_by_writes(self):
+        users = self.seed(5)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get_data("/example/list?size=2")["count"], 5)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_data("/example/list?size=2")["count"], 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            users[0].delete()
+        self.assertEqual(self.get_data("/example/list?size=2")["count"], 4)
+        # Counts are cached per filter
+        data = self.get_data("/example/list?size=2&username__icontains=name1")
+        self.assertEqual(data["count"], 1)
+
+    def test_no_count_pages_tell_whether_there_is_a_next_page(self):
+        self.seed(25)
+        for view, path in [
+            (ExampleListItems, "/example/list"),
+            (ExampleAsyncListItems, "/example/async/list"),
+        ]:
+            with (
+                self.subTest(path),
+                mock.patch.object(view, "count_strategy", NoCount()),
+            ):
+                # A single query fetches the page and one more row
+                with self.assertNumQueries(1):
+                    data = self.get_data(f"{path}?page=2&size=10")
+                self.assertNotIn("count", data)
+                self.assertEqual(len(data["list"]), 10)
+                self.assertEqual(data["next"], 3)
+
+                data = self.get_data(f"{path}?page=3&size=10")
+                self.assertEqual(len(data["list"]), 5)
+                self.assertNotIn("next", data)
+
+                data = self.get_data(f"{path}?page=4&size=10")
+                self.assertEqual(data, {"list": []})
+
+
+class AsyncViewTests(ExampleAPITestCase):
+    def test_async_list_matches_the_sync_one(self):
+        self.seed(12)
+        for query in ["size=5&page=2", "fields=id,username", "username=name1"]:
+            with self.subTest(query):
+                self.assertEqual(
+                    self.get_data(f"/example/async/list?{query}"),
+                    self.get_data(f"/example/list?{query}"),
+                )
+
+    @mock.patch.object(ExampleAsyncListItems, "pagination_mode", "cursor")
+    def test_async_list_in_cursor_mode(self):
+        users = self.seed(5)
+        data = self.get_data("/example/async/list?size=3")
+        self.assertEqual(len(data["list"]), 3)
+        data = self.get_data(f"/example/async/list?size=3&cursor={data['next']}")
+        self.assertEqual(
+            [row["id"] for row in data["list"]], [users[1].pk, users[0].pk]
+        )
+        self.assertNotIn("next", data)
+
+    async def test_async_detail_under_asgi(self):
+        user = await User.objects.acreate(
+            user_id="a1", username="async", email="a@example.com", password="x"
+        )
+        response = await self.async_client.get(f"/example/async/detail/{user.pk}")
+        body = self.json(response)
+        self.assertEqual(body["code"], SUCCESS.code)
+        self.assertEqual(body["data"]["username"], "async")
+
+        # Missing objects end in the same envelope as with the sync view
+        response = await self.async_client.get("/example/async/detail/0")
+        self.assertEqual(
+            self.json(response),
+            self.json(await self.async_client.get("/example/detail/0")),
+        )
+
+
+class ConditionalGetTests(ExampleAPITestCase):
+    def test_list_answers_304_to_matching_validators(self):
+        self.seed(3)
+        response = self.client.get("/example/list?size=2")
+        self.assertEqual(response.status_code, 200)
+        # Only the validators aggregate runs, the page is not fetched
+        with self.assertNumQueries(1):
+            response_304 = self.client.get(
+                "/example/list?size=2", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response_304.status_code, 304)
+        response_304 = self.client.get(
+            "/example/list?size=2",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response_304.status_code, 304)
+
+        # Other params select another representation
+        other = self.client.get(
+            "/example/list?size=2&page=2", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(other["ETag"], response["ETag"])
+
+    def test_list_etag_changes_with_the_rows(self):
+        users = self.seed(3)
+        etag = self.client.get("/example/list")["ETag"]
+        for write in [lambda: users[0].save(), lambda: users[1].delete()]:
+            write()
+            response = self.client.get("/example/list", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            etag = response["ETag"]
+
+    def test_detail_answers_304_to_matching_validators(self):
+        user = self.seed(1)[0]
+        for path in [f"/example/detail/{user.pk}", f"/example/async/detail/{user.pk}"]:
+            with self.subTest(path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                response_304 = self.client.get(
+                    path, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+                self.assertEqual(response_304.status_code, 304)
+                self.assertEqual(response_304.content, b"")
+                response_304 = self.client.get(
+                    path, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+                )
+                self.assertEqual(response_304.status_code, 304)
+
+
+class ObjectCacheTests(ExampleAPITestCase):
+    def test_detail_is_read_through_the_cache(self):
+        user = self.seed(1)[0]
+        path = f"/example/detail/{user.pk}"
+        self.assertEqual(self.get_data(path)["username"], "name0")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_data(path)["username"], "name0")
+        # Without the in-process tier, from the shared cache
+        with mock.patch.object(ExampleDetailItem.object_cache, "local", None):
+            with self.assertNumQueries(0):
+                self.assertEqual(self.get_data(path)["username"], "name0")
+
+    def test_writes_invalidate_once_committed(self):
+        user = self.seed(1)[0]
+        path = f"/example/detail/{user.pk}"
+        self.get_data(path)
+        with self.captureOnCommitCallbacks() as callbacks:
+            user.username = "renamed"
+            user.save()
+            # Not bumped yet, a reader could cache the old row again
+            self.assertEqual(self.get_data(path)["username"], "name0")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get_data(path)["username"], "renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        body = self.json(self.client.get(path))
+        self.assertNotEqual(body["code"], SUCCESS.code)
+
+    def test_misses_are_cached(self):
+        path = "/example/detail/100"
+        body = self.json(self.client.get(path))
+        self.assertNotEqual(body["code"], SUCCESS.code)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.json(self.client.get(path)), body)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create(
+                pk=100, user_id="u100", username="late", email="e", password="p"
+            )
+        self.assertEqual(self.get_data(path)["username"], "late")
+
+
+def user_item(user_id: str) -> dict[str, str]:
+    return {
+        "user_id": user_id,
+        "username": "bulk",
+        "email": "bulk@example.com",
+        "password": "secret",
+    }
+
+
+class BulkViewTests(ExampleAPITestCase):
+    def assertItemErrors(self, body: dict, codes: dict[int, int], total: int):
+        self.assertEqual(body["code"], BULK_ITEMS_INVALID.code)
+        self.assertEqual(
+            body["msg"],
+            BULK_ITEMS_INVALID.render({"count": len(codes), "total": total}),
+        )
+        self.assertEqual(
+            {error["index"]: error["code"] for error in body["data"]}, codes
+        )
+
+    def test_bulk_create(self):
+        body = self.send(
+            "post", "/example/bulk/create", [user_item("a"), user_item("b")]
+        )
+        self.assertEqual(body["code"], SUCCESS.code)
+        self.assertEqual([row["user_id"] for row in body["data"]], ["a", "b"])
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_bulk_create_reports_invalid_items(self):
+        items = [user_item("a"), {"user_id": "b"}, user_item("c")]
+        body = self.send("post", "/example/bulk/create", items)
+        self.assertItemErrors(body, {1: PYDANTIC_VALIDATION_ERROR.code}, 3)
+        self.assertFalse(User.objects.exists())
+
+    def test_bulk_create_reports_constraint_violations(self):
+        self.seed(1)
+        items = [user_item("a"), user_item("b"), user_item("a"), user_item("u0")]
+        body = self.send("post", "/example/bulk/create", items)
+        # Duplicates within the batch and of existing rows
+        self.assertItemErrors(
+            body, {2: CONSTRAINT_VIOLATED.code, 3: CONSTRAINT_VIOLATED.code}, 4
+        )
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_bulk_update(self):
+        users = self.seed(2)
+        items = [{"id": user.pk, **user_item(f"v{user.pk}")} for user in users]
+        body = self.send("put", "/example/bulk/update", items)
+        self.assertEqual(body["code"], SUCCESS.code)
+        self.assertEqual(User.objects.filter(username="bulk").count(), 2)
+
+    def test_bulk_update_reports_missing_and_conflicting_items(self):
+        users = self.seed(3)
+        body = self.send(
+            "put",
+            "/example/bulk/update",
+            [{"id": users[0].pk, **user_item("x")}, {"id": 0, **user_item("y")}],
+        )
+        self.assertItemErrors(body, {1: OBJECT_NOT_FOUND.code}, 2)
+
+        body = self.send(
+            "put",
+            "/example/bulk/update",
+            [
+                {"id": users[0].pk, **user_item("x")},
+                {"id": users[1].pk, **user_item("u2")},
+            ],
+        )
+        self.assertItemErrors(body, {1: CONSTRAINT_VIOLATED.code}, 2)
+        self.assertFalse(User.objects.filter(username="bulk").exists())
+
+    def test_bulk_delete(self):
+        users = self.seed(3)
+        body = self.send("delete", "/example/bulk/delete", [users[0].pk, 0])
+        self.assertItemErrors(body, {1: OBJECT_NOT_FOUND.code}, 2)
+        self.assertEqual(User.objects.count(), 3)
+
+        body = self.send("delete", "/example/bulk/delete", [users[0].pk, users[1].pk])
+        self.assertEqual(body["code"], SUCCESS.code)
+        self.assertEqual(list(User.objects.values_list("pk", flat=True)), [users[2].pk])
+
+
+class UpdateTests(ExampleAPITestCase):
+    def test_unchanged_patch_writes_nothing(self):
+        user = self.seed(1)[0]
+        with self.assertNumQueries(1):
+            body = self.send(
+                "patch", f"/example/partial_update/{user.pk}", {"username": "name0"}
+            )
+        self.assertEqual(body["code"], SUCCESS.code)
+        user_after = User.objects.get(pk=user.pk)
+        self.assertEqual(user_after.update_at, user.update_at)
+
+    def test_patch_writes_only_changed_columns(self):
+        user = self.seed(1)[0]
+        with CaptureQueriesContext(connection) as queries:
+            body = self.send(
+                "patch",
+                f"/example/partial_update/{user.pk}",
+                {"username": "renamed", "email": user.email},
+            )
+        self.assertEqual(body["data"]["username"], "renamed")
+        update = queries[-1]["sql"]
+        self.assertTrue(update.startswith("UPDATE"), update)
+        self.assertIn('"username"', update)
+        self.assertIn('"update_at"', update)
+        self.assertNotIn('"email"', update)
+        self.assertNotIn('"password"', update)
+
+    def test_put_writes_only_changed_columns(self):
+        user = self.seed(1)[0]
+        item = {
+            "user_id": user.user_id,
+            "username": user.username,
+            "email": "new@example.com",
+            "password": user.password,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            body = self.send("put", f"/example/update/{user.pk}", item)
+        self.assertEqual(body["data"]["email"], "new@example.com")
+        update = queries[-1]["sql"]
+        self.assertIn('"email"', update)
+        self.assertNotIn('"username"', update)
+        with self.assertNumQueries(1):
+            self.send("put", f"/example/update/{user.pk}", item)
+
+
+class LookupFilterTests(ExampleAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = self.seed(12)
+
+    def user_ids(self, query: str) -> set[str]:
+        data = self.get_data(f"/example/list?size=100&{query}")
+        return {row["user_id"] for row in data["list"]}
+
+    def test_lookups(self):
+        pks = ",".join(str(user.pk) for user in self.users[:2])
+        self.assertEqual(self.user_ids(f"id__in={pks}"), {"u0", "u1"})
+        self.assertEqual(
+            self.user_ids("username__icontains=NAME1"), {"u1", "u10", "u11"}
+        )
+        self.assertEqual(self.user_ids("user_id=u3"), {"u3"})
+        self.assertEqual(self.user_ids("email__isnull=true"), set())
+        self.assertEqual(len(self.user_ids("email__isnull=false")), 12)
+
+    def test_range_lookups(self):
+        for i, user in enumerate(self.users):
+            User.objects.filter(pk=user.pk).update(
+                create_at=datetime.datetime(2024, 1, i + 1)
+            )
+        self.assertEqual(
+            self.user_ids("create_at__gte=2024-01-11&create_at__lte=2024-01-12"),
+            {"u10", "u11"},
+        )
+
+    def test_params_outside_the_allowlist_are_ignored(self):
+        self.assertEqual(len(self.user_ids("password__icontains=x&junk=1")), 12)
+
+    def test_invalid_values_are_rejected(self):
+        for query in ["id__in=1,x", "email__isnull=maybe", "create_at__gte=x"]:
+            body = self.json(self.client.get(f"/example/list?{query}"))
+            self.assertEqual(body["code"], QUERY_PARAM_INVALID.code, query)
+
+    def test_body_params_filter_post_lists(self):
+        body = self.send("post", "/example/list_with_post", {"user_id": "u4"})
+        self.assertEqual([row["user_id"] for row in body["data"]["list"]], ["u4"])
+
+
+class QueryBudgetTests(ExampleAPITestCase):
+    def test_assert_max_queries(self):
+        self.seed(3)
+        with assert_max_queries(2):
+            self.client.get("/example/list")
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_max_queries(1):
+                self.client.get("/example/list")
+
+    def test_view_over_budget(self):
+        self.seed(3)
+        strict = query_budget(1, strict=True)(ExampleListItems.get)
+        with mock.patch.object(ExampleListItems, "get", strict):
+            body = self.json(self.client.get("/example/list"))
+        self.assertEqual(body["code"], UNCAUGHT_EXCEPTION.code)
+        self.assertIn("budget is 1", body["msg"])
+
+        lenient = query_budget(1, strict=False)(ExampleListItems.get)
+        with mock.patch.object(ExampleListItems, "get", lenient):
+            with self.assertLogs("default.performance", "WARNING") as logs:
+                self.get_data("/example/list")
+        self.assertIn("executed 2 queries, budget is 1", logs.output[0])
+
+    def test_repeated_queries_are_reported_as_n_plus_one(self):
+        self.seed(10)
+        list_response = ExampleListItems.list_response
+
+        def one_query_per_row(view):
+            for pk in view.object_list.values_list("pk", flat=True):
+                User.objects.get(pk=pk)
+            return list_response(view)
+
+        with mock.patch.object(ExampleListItems, "list_response", one_query_per_row):
+            with self.assertLogs("default.performance", "WARNING") as logs:
+                self.get_data("/example/list")
+        [record] = [r for r in logs.records if r.msg.startswith("Possible N+1")]
+        self.assertEqual(record.count, 10)
+        self.assertIn("one_query_per_row", record.callsite[-1])
+
+
+class ImportTests(ExampleAPITestCase):
+    def upload(self, name: str, content: bytes, query: str = "") -> dict:
+        response = self.client.post(
+            f"/example/import{query}", {"file": SimpleUploadedFile(name, content)}
+        )
+        return self.json(response)
+
+    def test_csv_import_reports_invalid_rows_by_line(self):
+        content = (
+            b"user_id,username,email,password\n"
+            b"a,first,a@example.com,x\n"
+            b"b,second\n"
+            b"c,third,c@example.com,x\n"
+        )
+        body = self.upload("users.csv", content)
+        self.assertEqual(body["code"], BULK_ITEMS_INVALID.code)
+        self.assertEqual(
+            {key: body["data"][key] for key in ["total", "imported", "failed"]},
+            {"total": 3, "imported": 2, "failed": 1},
+        )
+        self.assertEqual(body["data"]["errors"][0]["line"], 3)
+        self.assertEqual(
+            set(User.objects.values_list("user_id", flat=True)), {"a", "c"}
+        )
+
+    def test_ndjson_import_upserts_on_unique_fields(self):
+        self.seed(1)
+        rows = [
+            {"user_id": "u0", "username": "updated", "email": "e", "password": "x"},
+            {"user_id": "n", "username": "new", "email": "e", "password": "x"},
+        ]
+        content = b"\n".join(json.dumps(row).encode() for row in rows)
+        body = self.upload("users.data", content, "?format=ndjson")
+        self.assertEqual(body["code"], SUCCESS.code)
+        self.assertEqual(body["data"]["imported"], 2)
+        self.assertEqual(
+            dict(User.objects.values_list("user_id", "username")),
+            {"u0": "updated", "n": "new"},
+        )
+
+    def test_unknown_format_is_rejected(self):
+        body = self.upload("users.xml", b"<users/>")
+        self.assertEqual(body["code"], QUERY_PARAM_INVALID.code)
+
+    def test_upsert_configuration_is_checked_on_setup(self):
+        request = RequestFactory().post("/")
+        for attrs in [{"unique_fields": None}, {"update_fields": ["missing"]}]:
+            with self.subTest(attrs), mock.patch.multiple(ExampleImportItems, **attrs):
+                with self.assertRaises(ImproperlyConfigured):
+                    ExampleImportItems.as_view()(request)
+
+
+class JobTests(ExampleAPITestCase):
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        config = {
+            **settings.DJANGO_REST,
+            "UPLOAD_ROOT": root.name,
+            "EXPORT_ROOT": os.path.join(root.name, "exports"),
+        }
+        self.enterContext(override_settings(DJANGO_REST=config))
+        users = get_user_model()._default_manager
+        self.alice = users.create_user("alice", password="x")
+        self.bob = users.create_user("bob", password="x")
+
+    def run_jobs(self) -> None:
+        for job in claim("test", 10):
+            run_job(job)
+
+    def test_background_export_is_served_to_its_owner(self):
+        self.seed(3)
+        self.client.force_login(self.alice)
+        response = self.client.get("/example/export/background?format=csv")
+        self.assertEqual(response.status_code, 202)
+        job_id = self.json(response)["data"]["id"]
+        self.assertEqual(Job.objects.get(pk=job_id).user, self.alice)
+
+        body = self.json(self.client.get(f"/jobs/{job_id}/result"))
+        self.assertEqual(body["code"], JOB_NOT_FINISHED.code)
+        self.run_jobs()
+        self.assertEqual(self.get_data(f"/jobs/{job_id}")["status"], "done")
+        response = self.client.get(f"/jobs/{job_id}/download")
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(content.splitlines()[0].split(",")[:2], ["id", "create_at"])
+        self.assertEqual(len(content.splitlines()), 4)
+
+        # Other users and anonymous clients see no such job
+        for login in [self.bob, None]:
+            self.client.logout()
+            if login is not None:
+                self.client.force_login(login)
+            for path in ["", "/result"]:
+                body = self.json(self.client.get(f"/jobs/{job_id}{path}"))
+                self.assertNotEqual(body["code"], SUCCESS.code)
+            response = self.client.get(f"/jobs/{job_id}/download")
+            self.assertNotEqual(self.json(response)["code"], SUCCESS.code)
+
+    def test_background_import(self):
+        content = b"user_id,username,email,password\na,first,a@example.com,x\nbad\n"
+        response = self.client.post(
+            "/example/import/background",
+            {"file": SimpleUploadedFile("users.csv", content)},
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = self.json(response)["data"]["id"]
+        self.assertFalse(User.objects.exists())
+        self.run_jobs()
+        result = self.get_data(f"/jobs/{job_id}/result")
+        self.assertEqual((result["imported"], result["failed"]), (1, 1))
+        self.assertTrue(User.objects.filter(user_id="a").exists())
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        self.calls = []
+        name = f"{type(self).__name__}.flaky"
+        self.addCleanup(TASKS.pop, name)
+
+        @task(name)
+        def flaky(fail: int) -> int:
+            self.calls.append(fail)
+            if len(self.calls) <= fail:
+                raise ValueError("flaky")
+            return len(self.calls)
+
+        self.task_name = name
+
+    def test_failed_jobs_are_retried_while_attempts_are_left(self):
+        job = enqueue(self.task_name, {"fail": 1}, max_attempts=2)
+        Worker(threads=2, poll_interval=0.01).run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result), ("done", 2, 2))
+
+    def test_failed_jobs_keep_their_last_error(self):
+        job = enqueue(self.task_name, {"fail": 5}, max_attempts=2)
+        Worker(threads=2, poll_interval=0.01).run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertIn("flaky", job.error["msg"])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_jobs_of_lost_workers_are_requeued(self):
+        job = enqueue(self.task_name, {"fail": 0}, max_attempts=2)
+        Job.objects.filter(pk=job.pk).update(
+            status="running",
+            attempts=1,
+            worker="lost",
+            heartbeat_at=datetime.datetime(2000, 1, 1),
+        )
+        Worker(threads=1, poll_interval=0.01).run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("done", 2))
+
+
+class ResponseCacheTests(ExampleAPITestCase):
+    path = "/example/list/cached?size=2&username__icontains=name"
+
+    def usernames(self) -> set[str]:
+        data = self.get_data("/example/list/cached")
+        return {row["username"] for row in data["list"]}
+
+    def test_hits_skip_the_view(self):
+        self.seed(3)
+        response = self.client.get(self.path)
+        # Param order and params not selecting the representation do not matter
+        with self.assertNumQueries(0):
+            hit = self.client.get(
+                "/example/list/cached?username__icontains=name&junk=1&size=2"
+            )
+        self.assertEqual(hit.content, response.content)
+        with self.assertNumQueries(0):
+            response_304 = self.client.get(
+                self.path, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response_304.status_code, 304)
+        with self.assertNumQueries(2):
+            self.client.get(f"{self.path}&page=2")
+
+    def test_writes_invalidate_entries(self):
+        users = self.seed(3)
+        self.assertEqual(self.usernames(), {"name0", "name1", "name2"})
+        with self.captureOnCommitCallbacks(execute=True):
+            users[2].username = "renamed"
+            users[2].save()
+        self.assertEqual(self.usernames(), {"name0", "name1", "renamed"})
+
+        # Bulk writes send no signals, the view bumps the version itself
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send("post", "/example/bulk/create", [user_item("late")])
+        self.assertIn("bulk", self.usernames())
+
+    def test_users_do_not_share_entries(self):
+        self.seed(3)
+        self.get_data(self.path)
+        user = get_user_model()._default_manager.create_user("alice", password="x")
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_data(self.path)
+        self.assertTrue(any("t_user" in query["sql"] for query in queries))
+
+    def test_concurrent_misses_render_once(self):
+        response_cache = ResponseCache(timeout=60)
+        renders = []
+
+        def render() -> HttpResponse:
+            renders.append(1)
+            time.sleep(0.2)
+            return HttpResponse(b"rendered")
+
+        contents = []
+        threads = [
+            threading.Thread(
+                target=lambda: contents.append(
+                    response_cache.get_or_render("key", [User], render).content
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(renders), 1)
+        self.assertEqual(contents, [b"rendered"] * 8)
@@ -1,21 +1,46 @@
 from django.urls import path
+
 from .views import (
-    ExampleListItems,
-    ExampleListItemsWithPost,
+    ExampleAsyncDetailItem,
+    ExampleAsyncListItems,
+    ExampleBackgroundExportItems,
+    ExampleBackgroundImportItems,
+    ExampleBulkCreateItems,
+    ExampleBulkDeleteItems,
+    ExampleBulkUpdateItems,
+    ExampleCachedListItems,
     ExampleCreateItem,
-    ExampleUpdateItem,
     ExampleDeleteItem,
-    ExamplePartialUpdateItem,
     ExampleDetailItem,
+    ExampleDownload,
+    ExampleExportItems,
+    ExampleImportItems,
+    ExampleListItems,
+    ExampleListItemsWithPost,
+    ExamplePartialUpdateItem,
+    ExampleUpdateItem,
+    ExampleUpload,
 )
 
 urlpatterns = [
     path("list", ExampleListItems.as_view()),
+    path("list/cached", ExampleCachedListItems.as_view()),
     path("list_with_post", ExampleListItemsWithPost.as_view()),
+    path("export", ExampleExportItems.as_view()),
+    path("export/background", ExampleBackgroundExportItems.as_view()),
+    path("import", ExampleImportItems.as_view()),
+    path("import/background", ExampleBackgroundImportItems.as_view()),
     path("create", ExampleCreateItem.as_view()),
     path("update/<int:pk>", ExampleUpdateItem.as_view()),
     path("delete/<int:pk>", ExampleDeleteItem.as_view()),
     path("partial_update/<int:pk>", ExamplePartialUpdateItem.as_view()),
     path("detail/<int:pk>", ExampleDetailItem.as_view()),
+    path("bulk/create", ExampleBulkCreateItems.as_view()),
+    path("bulk/update", ExampleBulkUpdateItems.as_view()),
+    path("bulk/delete", ExampleBulkDeleteItems.as_view()),
+    path("upload", ExampleUpload.as_view()),
+    path("download/<str:key>", ExampleDownload.as_view()),
+    path("async/list", ExampleAsyncListItems.as_view()),
+    path("async/detail/<int:pk>", ExampleAsyncDetailItem.as_view()),
     path("error", lambda request: 1 / 0),
 ]
@@ -1,20 +1,46 @@
+from django.http import HttpRequest
+from django.views import View
+
+from base.async_views import AsyncDetailView, AsyncListView
+from base.cache import ObjectCache, ResponseCache
+from base.file_handler.parser import OssFileParser, StreamFileParser
+from base.filter_backends import QueryParamsFilterBackend
 from base.views import (
+    BulkCreateView,
+    BulkDeleteView,
+    BulkUpdateView,
     CreateView,
     DeleteView,
     DetailView,
+    DownloadView,
+    ExportView,
+    ImportView,
     ListView,
     ListViewWithPost,
     PartialUpdateView,
     UpdateView,
+    UploadView,
 )
-from django.http import HttpRequest
-from django.views import View
 
 from .models import PydanticUser, User
 
 
+class ExampleFilterBackend(QueryParamsFilterBackend):
+    lookups = {
+        "id": ["in"],
+        "create_at": ["gte", "lte"],
+        "username": ["icontains"],
+        "email": ["isnull"],
+    }
+
+
 class ExampleListItems(ListView):
     model = User
+    filter_backend_class = ExampleFilterBackend
+
+
+class ExampleCachedListItems(ExampleListItems):
+    response_cache = ResponseCache(timeout=60)
 
 
 class ExampleListItemsWithPost(ListViewWithPost):
@@ -22,6 +48,15 @@ class ExampleListItemsWithPost(ListViewWithPost):
     model = User
 
 
+class ExampleExportItems(ExportView):
+    model = User
+    ret_model_fields_exclude = ["password"]
+
+
+class ExampleBackgroundExportItems(ExampleExportItems):
+    run_in_background = True
+
+
 class ExampleCreateItem(CreateView):
     model = User
     pydantic_model = PydanticUser
@@ -43,8 +78,54 @@ class ExamplePartialUpdateItem(PartialUpdateView):
 
 class ExampleDetailItem(DetailView):
     model = User
+    object_cache = ObjectCache()
+
+
+class ExampleImportItems(ImportView):
+    model = User
+    pydantic_model = PydanticUser
+    update_conflicts = True
+    unique_fields = ["user_id"]
+
+
+class ExampleBackgroundImportItems(ExampleImportItems):
+    run_in_background = True
+
+
+class ExampleBulkCreateItems(BulkCreateView):
+    model = User
+    pydantic_model = PydanticUser
+
+
+class ExampleBulkUpdateItems(BulkUpdateView):
+    model = User
+    pydantic_model = PydanticUser
+
+
+class ExampleBulkDeleteItems(BulkDeleteView):
+    model = User
+
+
+class ExampleAsyncListItems(AsyncListView):
+    model = User
+
+
+class ExampleAsyncDetailItem(AsyncDetailView):
+    model = User
 
 
 class ExampleUncaughtExceptionHandler(View):
     def get(self, request: HttpRequest, *args, **kwargs):
         raise ValueError("test uncaught exception handler")
+
+
+class ExampleRemoteFileParser(OssFileParser):
+    allowed_hosts = [".amazonaws.com"]
+
+
+class ExampleUpload(UploadView):
+    parsers = [StreamFileParser, ExampleRemoteFileParser]
+
+
+class ExampleDownload(DownloadView):
+    pass
@@ -72,6 +72,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "base",
     {%- if cookiecutter.add_example_app %}
     "example_app",
     {%- endif %}
@@ -85,6 +86,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "base.middleware.PerformanceMiddleware",
+    "base.middleware.MetricsMiddleware",
     "base.middleware.JsonMiddleware",
 ]
 
@@ -116,6 +119,17 @@ WSGI_APPLICATION = "{{cookiecutter.project_slug}}.wsgi.application"
 DATABASES = {"default": env.dj_db_url("DATABASE_URL")}
 
 
+# `ResponseCache` and `ObjectCache` need a default cache shared by every web
+# and `run_jobs` process with an atomic `incr`, so model versions bumped by one
+# invalidate the cached data of all, e.g. Redis or Memcached:
+# CACHES = {
+#     "default": {
+#         "BACKEND": "django.core.cache.backends.redis.RedisCache",
+#         "LOCATION": env.str("REDIS_URL"),
+#     }
+# }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -162,6 +176,18 @@ LOG_FILE = LOG_DIR / env.str("LOG_FILE", "access.log")
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "base.log.JsonFormatter",
+        },
+    },
+    "filters": {
+        "traceback_rate_limit": {
+            "()": "base.log.TracebackRateLimitFilter",
+            "window": env.float("LOG_TRACEBACK_WINDOW", 60),
+            "burst": env.int("LOG_TRACEBACK_BURST", 1),
+        },
+    },
     "handlers": {
         "console": {
             "level": "DEBUG",
@@ -173,12 +199,20 @@ LOGGING = {
             "filename": str(LOG_FILE),
             "maxBytes": 1024 * 1024 * 5,
             "backupCount": 5,
+            "formatter": "json",
+        },
+        # Requests only enqueue records, `console` and `file` write them
+        # from a background thread
+        "queue": {
+            "()": "base.log.QueueListenerHandler",
+            "handlers": ["console", "file"],
+            "filters": ["traceback_rate_limit"],
         },
     },
     "loggers": {
 
         "default": {
-            "handlers": ["console", "file"],
+            "handlers": ["console", "file"] if DEBUG else ["queue"],
             "propagate": True,
             "level": "DEBUG" if DEBUG else "INFO",
         }
@@ -194,4 +228,44 @@ DJANGO_REST = {
     "RESPONSE_CODE_FIELD": "code",
     "RESPONSE_PAGINATED_LIST_FIELD": "list",
     "RESPONSE_PAGINATED_COUNT_FIELD": "count",
+    "RESPONSE_PAGINATED_NEXT_FIELD": "next",
+    # `Server-Timing` header, exposes query counts and timings to clients
+    "PERF_SERVER_TIMING": DEBUG,
+    # Requests slower than this are logged as warnings with their SQL
+    "PERF_SLOW_REQUEST_MS": env.int("PERF_SLOW_REQUEST_MS", 500),
+    # Log the params of slow requests' SQL, they contain the written values
+    "PERF_LOG_QUERY_PARAMS": DEBUG,
+    # Same SQL run this many times in a request is logged as a possible N+1
+    "PERF_N_PLUS_ONE_THRESHOLD": env.int("PERF_N_PLUS_ONE_THRESHOLD", 10),
+    # Shared directory for metrics of multi-process servers, e.g. gunicorn
+    # workers, None to serve the metrics of the current process only. Fold
+    # stopped workers with `base.metrics.mark_process_dead` in gunicorn's
+    # `child_exit` hook
+    "METRICS_MULTIPROCESS_DIR": env.str("METRICS_MULTIPROCESS_DIR", None),
+    "METRICS_FLUSH_INTERVAL": env.float("METRICS_FLUSH_INTERVAL", 5),
+    # Bearer token of `/metrics` scrapers, metrics are only served with DEBUG
+    # when unset
+    "METRICS_TOKEN": env.str("METRICS_TOKEN", None),
+    # Let `ResponseCache` and `ObjectCache` run on a process-local, file or
+    # database cache, only right with a single process such as `runserver`
+    "CACHE_ALLOW_LOCAL": env.bool("CACHE_ALLOW_LOCAL", DEBUG),
+    # Object store of `LocalFileUploader` and the default `UploadView` limit
+    "UPLOAD_ROOT": BASE_DIR / env.str("UPLOAD_DIR", "uploads"),
+    "UPLOAD_MAX_SIZE": env.int("UPLOAD_MAX_SIZE", 100 * 2**20),
+    # Files of background exports, served to the job's owner only. Object
+    # keys of `UPLOAD_ROOT` never resolve into it
+    "EXPORT_ROOT": BASE_DIR / env.str("UPLOAD_DIR", "uploads") / "exports",
+    # "x-accel-redirect" or "x-sendfile" to let the web server send the files
+    # of `DownloadView`, with nginx `DOWNLOAD_ACCEL_PREFIX` is an `internal`
+    # location aliasing `UPLOAD_ROOT`
+    "DOWNLOAD_OFFLOAD": env.str("DOWNLOAD_OFFLOAD", None),
+    "DOWNLOAD_ACCEL_PREFIX": env.str("DOWNLOAD_ACCEL_PREFIX", "/protected/"),
+    # Keep-alive connections per host of the shared client of remote parsers
+    "HTTP_POOL_SIZE": env.int("HTTP_POOL_SIZE", 32),
+    # Hosts `OssFileParser` may fetch from, in `ALLOWED_HOSTS` syntax
+    "REMOTE_FETCH_ALLOWED_HOSTS": env.list("REMOTE_FETCH_ALLOWED_HOSTS", []),
+    # Bucket of `AWSUploader`, the endpoint of S3-compatible stores other
+    # than AWS, credentials are read by boto3 from its usual sources
+    "S3_BUCKET": env.str("S3_BUCKET", None),
+    "S3_ENDPOINT_URL": env.str("S3_ENDPOINT_URL", None),
 }
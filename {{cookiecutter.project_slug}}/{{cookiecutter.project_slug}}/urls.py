@@ -14,10 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+
 from django.contrib import admin
 from django.urls import include, path
 
+from base.views import JobDownloadView, JobResultView, JobStatusView, MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("jobs/<uuid:pk>", JobStatusView.as_view(), name="job-status"),
+    path("jobs/<uuid:pk>/result", JobResultView.as_view(), name="job-result"),
+    path("jobs/<uuid:pk>/download", JobDownloadView.as_view(), name="job-download"),
     path("example/", include("example_app.urls")),
 ]